@@ -1,18 +1,55 @@
-import pandas as pd
-from ortools.sat.python import cp_model
 import csv
+import json
 import os
 import re
 import datetime as dt
-from typing import List, Dict, Set, Tuple
+from typing import List, Dict, Set, Tuple, Iterator
 import argparse
+import shutil
+import time
+from functools import lru_cache
 from pathlib import Path
+from feasibility import (
+    screen_applicants, build_block_index, applicant_feasibility, windows_overlap, group_windows, team_match_matrix,
+    recruiters_mask
+)
+from capacity import capacity_bound
+from run_history import record_run
+from room_allocation import assign_rooms, print_shortages
+from presolve import prune_blocks, merge_equivalent_slots, RULE_MERGED
+from result_cache import cache_key, lookup, store, entry_info, summary_matches
+from columnar import write_artifact
+# pandas and OR-Tools are imported by the functions that use them, so --help and argument errors stay fast
 
 # Constants
 TEAMS = ['Astra', 'Juvo', 'Infinitum', 'Terra']
+# One bit per team, so team sets are ints and team matching is a bitwise AND
+TEAM_BITS = {team: 1 << i for i, team in enumerate(TEAMS)}
+ALL_TEAMS_MASK = sum(TEAM_BITS.values())
+
+# Reason recorded for viable applicants the solver did not place
+REASON_SOLVER_UNSCHEDULED = 'solver_unscheduled'
+
+# Round 1 scheduling policy; override any subset with --policy or sweep.py
+DEFAULT_POLICY = {
+    'max_slots_per_block': None,  # individual slots modeled per block (None = all; presolve prunes the rest)
+    'group_capacity': 8,        # applicants per group
+    'complete_weight': 100,     # reward per applicant with both an individual slot and a group
+    'partial_weight': 0,        # reward per individual slot or group held, complete or not
+    'slot_penalty': 1           # cost per individual slot used
+}
+
+# Column layout shared by applicants_schedule.csv and the relaxed/combined schedules
+APPLICANT_SCHEDULE_COLUMNS = [
+    'applicant_id', 'applicant_name', 'teams',
+    'individual_block_id', 'individual_slot_id', 'individual_start', 'individual_end',
+    'group_block_id', 'group_id', 'group_slot1_start', 'group_slot1_end', 'group_slot2_start', 'group_slot2_end'
+]
+RECRUITER_SCHEDULE_COLUMNS = ['block_id', 'recruiter_id', 'recruiter_name', 'team', 'room_id', 'group_id', 'start', 'end']
 
 def parse_team_preferences(team_str: str) -> Set[str]:
     """Extract team preferences from the teams string."""
+    import pandas as pd
     teams = set()
     if pd.isna(team_str) or not team_str:
         return teams
@@ -24,11 +61,23 @@ def parse_team_preferences(team_str: str) -> Set[str]:
     
     return teams
 
+def team_mask(teams) -> int:
+    """Bitmask of team names (see TEAM_BITS); teams outside TEAMS have no bit."""
+    mask = 0
+    for team in teams:
+        mask |= TEAM_BITS.get(team, 0)
+    return mask
+
 def parse_availability_slot(slot_str: str) -> List[str]:
     """Parse time slots like '7 PM - 8 PM, 8 PM - 9 PM' into list of time ranges."""
+    import pandas as pd
     if pd.isna(slot_str) or not slot_str:
         return []
-    
+    return list(_parse_time_ranges(slot_str))
+
+@lru_cache(maxsize=None)
+def _parse_time_ranges(slot_str: str) -> Tuple[str, ...]:
+    """Time ranges of one availability string, parsed once per distinct string."""
     # Find all time ranges in format "X PM/AM - Y PM/AM"
     time_pattern = r'(\d{1,2})\s*(AM|PM)\s*-\s*(\d{1,2})\s*(AM|PM)'
     matches = re.findall(time_pattern, slot_str)
@@ -40,7 +89,24 @@ def parse_availability_slot(slot_str: str) -> List[str]:
         end_24 = convert_to_24h(int(end_hour), end_period)
         time_ranges.append(f"{start_24:02d}:00-{end_24:02d}:00")
     
-    return time_ranges
+    return tuple(time_ranges)
+
+@lru_cache(maxsize=None)
+def parse_day_availability(date_str: str, slot_str: str) -> Tuple[Tuple[dt.datetime, dt.datetime], ...]:
+    """Spans of one day's availability string, parsed once per distinct (day, string)."""
+    return parse_ranges(';'.join(f"{date_str} {time_range}" for time_range in _parse_time_ranges(slot_str)))
+
+# One shared spans tuple per distinct availability pattern (see intern_spans)
+_SPAN_PATTERNS = {}
+
+def intern_spans(spans) -> Tuple[Tuple[dt.datetime, dt.datetime], ...]:
+    """The shared tuple for a pattern of availability spans.
+    
+    Applicants with identical availability get the very same tuple, so
+    feasibility can be computed once per pattern (see applicant_feasibility).
+    """
+    spans = tuple(spans)
+    return _SPAN_PATTERNS.setdefault(spans, spans)
 
 def convert_to_24h(hour: int, period: str) -> int:
     """Convert 12-hour format to 24-hour format."""
@@ -49,10 +115,14 @@ def convert_to_24h(hour: int, period: str) -> int:
     else:  # PM
         return hour if hour == 12 else hour + 12
 
+@lru_cache(maxsize=None)
 def parse_ranges(s):
-    """Parse availability ranges from format like '2025-09-10 09:00-17:00;2025-09-11 09:00-17:00'"""
+    """Parse availability ranges from format like '2025-09-10 09:00-17:00;2025-09-11 09:00-17:00'
+    
+    Memoized, so it returns a tuple that callers share and must not modify.
+    """
     if not s or str(s).strip() == '':
-        return []
+        return ()
     spans = []
     for part in str(s).split(';'):
         part = part.strip()
@@ -63,7 +133,7 @@ def parse_ranges(s):
         start_dt = dt.datetime.fromisoformat(f'{date_str} {start_t}')
         end_dt = dt.datetime.fromisoformat(f'{date_str} {end_t}')
         spans.append((start_dt, end_dt))
-    return spans
+    return tuple(spans)
 
 def interval_contains(interval, win):
     """Check if interval contains window."""
@@ -76,6 +146,7 @@ def any_interval_contains(intervals, win):
 
 def load_applicants(path: str) -> List[Dict]:
     """Load and process applicant data."""
+    import pandas as pd
     df = pd.read_csv(path)
     applicants = []
     
@@ -85,7 +156,7 @@ def load_applicants(path: str) -> List[Dict]:
         
         if pd.isna(email) or pd.isna(name):
             continue
-            
+        
         # Ensure email is a string
         email = str(email) if not pd.isna(email) else ""
         
@@ -100,6 +171,7 @@ def load_applicants(path: str) -> List[Dict]:
         
         # Parse availability from Wednesday through Sunday
         availability_parts = []
+        spans = []
         
         # Map columns to actual dates for September 11-14 schedule
         day_mapping = {
@@ -110,10 +182,11 @@ def load_applicants(path: str) -> List[Dict]:
         }
         
         for day_col, date_str in day_mapping.items():
-            if day_col in row:
-                time_ranges = parse_availability_slot(row[day_col])
-                for time_range in time_ranges:
+            if day_col in row and not pd.isna(row[day_col]) and row[day_col]:
+                # Each distinct (day, string) is parsed once across all applicants
+                for time_range in _parse_time_ranges(row[day_col]):
                     availability_parts.append(f"{date_str} {time_range}")
+                spans.extend(parse_day_availability(date_str, row[day_col]))
         
         # Join availability with semicolons
         availability_str = "; ".join(availability_parts) if availability_parts else ""
@@ -123,13 +196,15 @@ def load_applicants(path: str) -> List[Dict]:
             'name': name,
             'availability': availability_str,
             'teams': teams,
-            'parsed_availability': parse_ranges(availability_str)
+            'team_mask': team_mask(teams),
+            'parsed_availability': intern_spans(spans)
         })
     
     return applicants
 
 def load_recruiters(path: str) -> List[Dict]:
     """Load recruiter data."""
+    import pandas as pd
     df = pd.read_csv(path)
     recruiters = []
     
@@ -138,14 +213,20 @@ def load_recruiters(path: str) -> List[Dict]:
             'id': row['recruiter_id'],
             'name': row['recruiter_name'],
             'team': row['team'],
+            'team_mask': team_mask([row['team']]),
             'availability': row['availability'],
             'parsed_availability': parse_ranges(row['availability'])
         })
     
     return recruiters
 
-def load_blocks(path: str) -> List[Dict]:
-    """Load block data and create slot structure."""
+def load_blocks(path: str, rooms: List[Dict] = None, recruiters: List[Dict] = None) -> List[Dict]:
+    """Load block data and create slot structure.
+    
+    With rooms and recruiters, group blocks get as many parallel groups as
+    parallel_group_counts allows; otherwise every group block has one group.
+    """
+    import pandas as pd
     df = pd.read_csv(path)
     blocks = []
     
@@ -165,7 +246,7 @@ def load_blocks(path: str) -> List[Dict]:
         }
         
         if row['block_type'] == 'group':
-            # Create single group for the 40-minute block
+            # Create the first group for the 40-minute block (parallel groups are added below)
             block_data['groups'].append({
                 'group_id': f"{row['block_id']}_G1",
                 'slot1': {'start': start_dt, 'end': end_dt},
@@ -184,10 +265,62 @@ def load_blocks(path: str) -> List[Dict]:
         
         blocks.append(block_data)
     
+    if rooms is not None and recruiters is not None:
+        counts = parallel_group_counts(blocks, rooms, recruiters)
+        for block in blocks:
+            if block['type'] == 'group':
+                first = block['groups'][0]
+                block['groups'] = [dict(first, group_id=f"{block['block_id']}_G{k}") for k in range(1, counts[block['block_id']] + 1)]
+    
     return blocks
 
+def parallel_group_counts(blocks: List[Dict], rooms: List[Dict], recruiters: List[Dict]) -> Dict[str, int]:
+    """Groups each group block can run side by side (at least one).
+    
+    Group rooms are shared with every group block that overlaps it in time,
+    and each group needs its own recruiter available for the whole block.
+    """
+    group_rooms = sum(1 for room in rooms if room['room_type'] == 'group')
+    group_blocks = sorted((block for block in blocks if block['type'] == 'group'), key=lambda block: block['start'])
+    
+    counts = {}
+    for i, block in enumerate(group_blocks):
+        overlapping = 1
+        for other in group_blocks[i + 1:]:
+            if other['start'] >= block['end']:
+                break
+            overlapping += 1
+        for other in reversed(group_blocks[:i]):
+            if other['end'] > block['start']:
+                overlapping += 1
+            elif other['date'] != block['date']:
+                break
+        available = sum(1 for recruiter in recruiters
+                        if any_interval_contains(recruiter['parsed_availability'], (block['start'], block['end'])))
+        counts[block['block_id']] = max(1, min(group_rooms // overlapping, available))
+    return counts
+
+def split_into_groups(block: Dict, members: List[Dict], group_capacity: int = 8) -> Dict[str, Dict]:
+    """Split the applicants placed in a group block into its parallel groups.
+    
+    Opens as few groups as the count needs and balances their sizes; members
+    are ordered by team first so that applicants of a team tend to share a
+    group and need fewer recruiters. Returns the group of each applicant id.
+    """
+    ordered = sorted(members, key=lambda applicant: (sorted(applicant['teams']), applicant['id']))
+    opened = min(len(block['groups']), max(1, -(-len(ordered) // group_capacity)))
+    groups = {}
+    start = 0
+    for k in range(opened):
+        size = len(ordered) // opened + (1 if k < len(ordered) % opened else 0)
+        for applicant in ordered[start:start + size]:
+            groups[applicant['id']] = block['groups'][k]
+        start += size
+    return groups
+
 def load_rooms(path: str) -> List[Dict]:
     """Load room data."""
+    import pandas as pd
     df = pd.read_csv(path)
     rooms = []
     
@@ -199,8 +332,80 @@ def load_rooms(path: str) -> List[Dict]:
     
     return rooms
 
-def schedule_recruiters(recruiters: List[Dict], blocks: List[Dict], rooms: List[Dict]) -> Dict:
-    """Round 1: Schedule recruiters to blocks using OR-Tools."""
+def load_recruiter_assignments(path: str, recruiters: List[Dict], blocks: List[Dict], rooms: List[Dict]) -> Dict:
+    """Load recruiter assignments from a run's recruiters_schedule.csv."""
+    import pandas as pd
+    df = pd.read_csv(path)
+    recruiters_by_id = {recruiter['id']: recruiter for recruiter in recruiters}
+    blocks_by_id = {block['block_id']: block for block in blocks}
+    rooms_by_id = {room['room_id']: room for room in rooms}
+    
+    recruiter_assignments = {}
+    for _, row in df.iterrows():
+        block = blocks_by_id.get(row['block_id'])
+        if block is None:
+            # Block no longer exists in the current blocks file
+            continue
+        
+        recruiter = recruiters_by_id.get(row['recruiter_id'])
+        if recruiter is None:
+            recruiter = {
+                'id': row['recruiter_id'],
+                'name': row['recruiter_name'],
+                'team': row['team'],
+                'team_mask': team_mask([row['team']]),
+                'availability': '',
+                'parsed_availability': []
+            }
+        
+        room = rooms_by_id.get(row['room_id'], {'room_id': row['room_id']})
+        
+        if block['block_id'] not in recruiter_assignments:
+            recruiter_assignments[block['block_id']] = []
+        assignment_data = {
+            'recruiter': recruiter,
+            'room': room,
+            'block': block
+        }
+        # Runs from before parallel groups have no group_id column
+        if block['type'] == 'group' and isinstance(row.get('group_id'), str):
+            assignment_data['group_id'] = row['group_id']
+        recruiter_assignments[block['block_id']].append(assignment_data)
+    
+    return recruiter_assignments
+
+def load_applicant_assignments(path: str, applicants: List[Dict], blocks: List[Dict]) -> Dict:
+    """Load Round 1 applicant assignments from a run's applicants_schedule.csv."""
+    import pandas as pd
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    applicants_by_id = {applicant['id']: applicant for applicant in applicants}
+    slots = {slot['slot_id']: (block, slot) for block in blocks if block['type'] == 'individual' for slot in block['slots']}
+    groups = {group['group_id']: (block, group) for block in blocks if block['type'] == 'group' for group in block['groups']}
+    
+    applicant_assignments = {}
+    for _, row in df.iterrows():
+        applicant = applicants_by_id.get(row['applicant_id'])
+        if applicant is None:
+            # Applicant no longer in the current applicant file
+            continue
+        
+        # Slots and groups that no longer exist in the current blocks file are dropped
+        assignment_data = {'applicant': applicant}
+        if row['individual_slot_id'] in slots:
+            assignment_data.update(individual_fields(*slots[row['individual_slot_id']]))
+        if row['group_id'] in groups:
+            assignment_data.update(group_fields(*groups[row['group_id']]))
+        if len(assignment_data) > 1:
+            applicant_assignments[applicant['id']] = assignment_data
+    
+    return applicant_assignments
+
+def schedule_recruiters(recruiters: List[Dict], blocks: List[Dict], rooms: List[Dict], export_dir: str = None) -> Dict:
+    """Round 1: Schedule recruiters to blocks using OR-Tools.
+    
+    With export_dir, the model is also written there for replay.py.
+    """
+    from ortools.sat.python import cp_model
     model = cp_model.CpModel()
     
     # Decision variables: recruiter_block[r][b] = 1 if recruiter r is assigned to block b
@@ -264,6 +469,11 @@ def schedule_recruiters(recruiters: List[Dict], blocks: List[Dict], rooms: List[
     
     model.Maximize(sum(objective_terms))
     
+    if export_dir:
+        from model_export import export_model
+        export_model(model, export_dir, 'recruiters', {'recruiter_block': recruiter_block},
+                     {'recruiters': [recruiter['id'] for recruiter in recruiters], 'blocks': [block['block_id'] for block in blocks]})
+    
     # Solve
     solver = cp_model.CpSolver()
     status = solver.Solve(model)
@@ -281,25 +491,14 @@ def schedule_recruiters(recruiters: List[Dict], blocks: List[Dict], rooms: List[
                     if block['block_id'] not in recruiter_assignments:
                         recruiter_assignments[block['block_id']] = []
                     
-                    # Assign appropriate room based on block type
-                    room = None
-                    if block['type'] == 'individual':
-                        individual_rooms = [room for room in rooms if room['room_type'] == 'individual']
-                        if individual_rooms:
-                            room = individual_rooms[0]  # Simplified room assignment
-                    else:  # group
-                        group_rooms = [room for room in rooms if room['room_type'] == 'group']
-                        if group_rooms:
-                            room = group_rooms[0]  # Simplified room assignment
-                    
-                    if room:
-                        recruiter_assignments[block['block_id']].append({
-                            'recruiter': recruiter,
-                            'room': room,
-                            'block': block
-                        })
+                    recruiter_assignments[block['block_id']].append({
+                        'recruiter': recruiter,
+                        'room': None,  # Set by assign_rooms below
+                        'block': block
+                    })
         
         print(f"Total recruiter assignments made: {assignments_count}")
+        print_shortages(assign_rooms(recruiter_assignments, rooms))
     else:
         print("No feasible solution found for recruiter scheduling")
     
@@ -322,21 +521,186 @@ def schedule_recruiters(recruiters: List[Dict], blocks: List[Dict], rooms: List[
     
     return recruiter_assignments
 
-def schedule_applicants_first(applicants: List[Dict], blocks: List[Dict], recruiters: List[Dict]) -> Tuple[Dict, List[str]]:
-    """Schedule applicants to slots/groups first, without considering recruiter assignments."""
+def objective_target_callback(target: int):
+    """Solution callback that stops the search as soon as an incumbent reaches a known objective upper bound."""
+    from ortools.sat.python import cp_model
+    
+    class ObjectiveTargetCallback(cp_model.CpSolverSolutionCallback):
+        def __init__(self):
+            cp_model.CpSolverSolutionCallback.__init__(self)
+            self.target = target
+        
+        def on_solution_callback(self):
+            if self.ObjectiveValue() >= self.target:
+                self.StopSearch()
     
-    # Filter individual blocks to limit slots based on recruiter availability
+    return ObjectiveTargetCallback()
+
+def resolve_policy(policy: Dict = None) -> Dict:
+    """Fill a partial policy in from DEFAULT_POLICY, rejecting unknown knobs."""
+    policy = policy or {}
+    unknown = [key for key in policy if key not in DEFAULT_POLICY]
+    if unknown:
+        raise ValueError(f"Unknown policy key(s): {', '.join(unknown)} (choose from {', '.join(DEFAULT_POLICY)})")
+    return {**DEFAULT_POLICY, **policy}
+
+def parse_policy(policy_arg: str) -> Dict:
+    """Parse --policy as inline JSON or a path to a JSON file."""
+    if not policy_arg:
+        return resolve_policy()
+    if os.path.exists(policy_arg):
+        with open(policy_arg) as f:
+            return resolve_policy(json.load(f))
+    return resolve_policy(json.loads(policy_arg))
+
+def limit_individual_slots(blocks: List[Dict], max_slots_per_block: int = None) -> List[Dict]:
+    """Copy of blocks keeping at most max_slots_per_block slots in each individual block."""
     filtered_blocks = []
     for block in blocks:
         if block['type'] == 'individual':
-            # For individual blocks, limit slots to reasonable capacity (max 4 per slot)
+            # For individual blocks, limit slots to reasonable capacity (policy max per block)
             block_copy = block.copy()
-            block_copy['slots'] = block['slots'][:4]  # Limit to 4 individual slots per block
+            block_copy['slots'] = block['slots'][:max_slots_per_block]
             filtered_blocks.append(block_copy)
         else:
             filtered_blocks.append(block)
+    return filtered_blocks
+
+def individual_fields(block: Dict, slot: Dict) -> Dict:
+    """Assignment fields for an individual slot."""
+    return {
+        'individual_block_id': block['block_id'],
+        'individual_slot_id': slot['slot_id'],
+        'individual_start': slot['start'],
+        'individual_end': slot['end']
+    }
+
+def group_fields(block: Dict, group: Dict) -> Dict:
+    """Assignment fields for a group."""
+    return {
+        'group_block_id': block['block_id'],
+        'group_id': group['group_id'],
+        'group_slot1_start': group['slot1']['start'],
+        'group_slot1_end': group['slot1']['end'],
+        'group_slot2_start': group['slot2']['start'],
+        'group_slot2_end': group['slot2']['end']
+    }
+
+def objective_target(complete_bound: int, policy: Dict) -> int:
+    """Best Round 1 objective the capacity bound allows, or None if it gives no usable target.
+    
+    Each complete applicant scores complete_weight and uses at least one slot.
+    """
+    if complete_bound is None or policy['partial_weight'] or policy['complete_weight'] <= policy['slot_penalty']:
+        return None
+    return (policy['complete_weight'] - policy['slot_penalty']) * complete_bound
+
+def round1_objective(applicant_assignments: Dict, policy: Dict = None) -> int:
+    """Round 1 objective value of a schedule under the given policy."""
+    policy = resolve_policy(policy)
+    individual = sum(1 for a in applicant_assignments.values() if a.get('individual_slot_id'))
+    group = sum(1 for a in applicant_assignments.values() if a.get('group_id'))
+    complete = sum(1 for a in applicant_assignments.values() if a.get('individual_slot_id') and a.get('group_id'))
+    slots_used = len({a['individual_slot_id'] for a in applicant_assignments.values() if a.get('individual_slot_id')})
+    return (policy['complete_weight'] * complete + policy['partial_weight'] * (individual + group)
+            - policy['slot_penalty'] * slots_used)
+
+def greedy_applicants_first(applicants: List[Dict], blocks: List[Dict], recruiters: List[Dict],
+                            policy: Dict = None) -> Tuple[Dict, List[str]]:
+    """Fast constructive Round 1 schedule that CP-SAT can start from or fall back to.
+    
+    Applicants with the fewest non-overlapping slot+group pairs go first, each
+    taking the free pair whose group block is fullest (then the earliest slot),
+    so groups fill up before new ones are opened. Group blocks hold up to their
+    parallel groups times group_capacity and are split into groups at the end.
+    """
+    policy = resolve_policy(policy)
+    blocks = limit_individual_slots(blocks, policy['max_slots_per_block'])
+    block_index = build_block_index(blocks, recruiters)
+    
+    slots = {(block['block_id'], slot['slot_id']): (block, slot)
+             for block in blocks if block['type'] == 'individual' for slot in block['slots']}
+    group_blocks = {block['block_id']: block for block in blocks if block['type'] == 'group'}
+    
+    # Candidate (slot, group) pairs per applicant
+    applicant_pairs = []
+    for applicant in applicants:
+        feasibility = applicant_feasibility(applicant, block_index)
+        pairs = []
+        # Parallel groups of a block share its sessions, so one pair per block is enough
+        pair_blocks = sorted({block_id for block_id, _ in feasibility['pair_groups']})
+        for slot_key in sorted(feasibility['pair_slots']):
+            slot_block, slot = slots[slot_key]
+            for block_id in pair_blocks:
+                group_block = group_blocks[block_id]
+                if slot_block['date'] != group_block['date']:
+                    continue
+                if any(windows_overlap((slot['start'], slot['end']), win) for win in group_windows(group_block['groups'][0])):
+                    continue
+                pairs.append((slot_key, block_id))
+        applicant_pairs.append((applicant, pairs))
+    
+    used_slots = set()
+    group_load = {}
+    applicant_assignments = {}
+    for applicant, pairs in sorted(applicant_pairs, key=lambda item: len(item[1])):
+        free = [(slot_key, block_id) for slot_key, block_id in pairs
+                if slot_key not in used_slots
+                and len(group_load.get(block_id, [])) < len(group_blocks[block_id]['groups']) * policy['group_capacity']]
+        if not free:
+            continue
+        slot_key, block_id = min(free, key=lambda pair: (-len(group_load.get(pair[1], [])), slots[pair[0]][1]['start']))
+        used_slots.add(slot_key)
+        group_load.setdefault(block_id, []).append(applicant)
+        
+        assignment_data = {'applicant': applicant}
+        assignment_data.update(individual_fields(*slots[slot_key]))
+        applicant_assignments[applicant['id']] = assignment_data
     
-    blocks = filtered_blocks
+    for block_id, members in group_load.items():
+        block = group_blocks[block_id]
+        for app_id, group in split_into_groups(block, members, policy['group_capacity']).items():
+            applicant_assignments[app_id].update(group_fields(block, group))
+    
+    unscheduled = [applicant['id'] for applicant in applicants if applicant['id'] not in applicant_assignments]
+    return applicant_assignments, unscheduled
+
+def schedule_applicants_first(applicants: List[Dict], blocks: List[Dict], recruiters: List[Dict],
+                              complete_bound: int = None, policy: Dict = None,
+                              solver_options: Dict = None, hint: Dict = None,
+                              deadline: float = None, export_dir: str = None) -> Tuple[Dict, List[str]]:
+    """Schedule applicants to slots/groups first, without considering recruiter assignments.
+    
+    complete_bound is an upper bound on complete assignments (see capacity.py); the
+    solver stops as soon as it finds a schedule that reaches it. policy overrides
+    DEFAULT_POLICY and solver_options are set on the CP-SAT parameters.
+    
+    Group blocks are modeled per block: one variable per applicant and an
+    integer applicant count of at most the block's parallel groups times
+    group_capacity; each block's applicants are split into concrete groups
+    by split_into_groups after solving. Individual slots with the same times
+    are merged the same way (see presolve.merge_equivalent_slots).
+    
+    hint is a starting schedule (e.g. from greedy_applicants_first) that CP-SAT
+    is asked to improve on; it is returned unchanged if the solver finds nothing
+    better before the deadline (a time.time() value).
+    
+    With export_dir, the model is written there for replay.py, even when the
+    hint already reaches the bound and the solve itself is skipped.
+    """
+    from ortools.sat.python import cp_model
+    policy = resolve_policy(policy)
+    blocks = limit_individual_slots(blocks, policy['max_slots_per_block'])
+    blocks, slot_members = merge_equivalent_slots(blocks)
+    merged = sum(len(members) - 1 for members in slot_members.values())
+    if merged:
+        print(f"Presolve: {RULE_MERGED} removed {merged * len(applicants)} variables ({merged} slots)")
+    
+    target = objective_target(complete_bound, policy)
+    hint_reaches_bound = hint is not None and target is not None and round1_objective(hint, policy) >= target
+    if hint_reaches_bound and not export_dir:
+        print("Heuristic schedule reaches the capacity bound; skipping CP-SAT")
+        return dict(hint), [applicant['id'] for applicant in applicants if applicant['id'] not in hint]
     
     model = cp_model.CpModel()
     
@@ -350,9 +714,8 @@ def schedule_applicants_first(applicants: List[Dict], blocks: List[Dict], recrui
             if block['type'] == 'individual':
                 for slot in block['slots']:
                     applicant_slot[(a, block['block_id'], slot['slot_id'])] = model.NewBoolVar(f'app_{a}_slot_{slot["slot_id"]}')
-            else:  # group
-                for group in block['groups']:
-                    applicant_group[(a, block['block_id'], group['group_id'])] = model.NewBoolVar(f'app_{a}_group_{group["group_id"]}')
+            else:  # group: one variable per block, whatever its number of parallel groups
+                applicant_group[(a, block['block_id'])] = model.NewBoolVar(f'app_{a}_group_{block["block_id"]}')
     
     # Constraint 1: Each applicant gets at most one individual slot and at most one group (prefer both)
     for a, applicant in enumerate(applicants):
@@ -369,16 +732,14 @@ def schedule_applicants_first(applicants: List[Dict], blocks: List[Dict], recrui
         # At most one group
         group_assignments = []
         for b, block in enumerate(blocks):
-            if block['type'] == 'group':
-                for group in block['groups']:
-                    if (a, block['block_id'], group['group_id']) in applicant_group:
-                        group_assignments.append(applicant_group[(a, block['block_id'], group['group_id'])])
+            if block['type'] == 'group' and (a, block['block_id']) in applicant_group:
+                group_assignments.append(applicant_group[(a, block['block_id'])])
         if group_assignments:
             model.Add(sum(group_assignments) <= 1)
     
     # Constraint 2: Same-day requirement for individual and group
     for a, applicant in enumerate(applicants):
-        dates = set(block['date'] for block in blocks)
+        dates = sorted(set(block['date'] for block in blocks))
         
         for date in dates:
             individual_assignments_this_date = []
@@ -390,10 +751,8 @@ def schedule_applicants_first(applicants: List[Dict], blocks: List[Dict], recrui
             
             group_assignments_this_date = []
             for b, block in enumerate(blocks):
-                if block['type'] == 'group' and block['date'] == date:
-                    for group in block['groups']:
-                        if (a, block['block_id'], group['group_id']) in applicant_group:
-                            group_assignments_this_date.append(applicant_group[(a, block['block_id'], group['group_id'])])
+                if block['type'] == 'group' and block['date'] == date and (a, block['block_id']) in applicant_group:
+                    group_assignments_this_date.append(applicant_group[(a, block['block_id'])])
             
             if individual_assignments_this_date and group_assignments_this_date:
                 individual_sum = sum(individual_assignments_this_date)
@@ -409,15 +768,15 @@ def schedule_applicants_first(applicants: List[Dict], blocks: List[Dict], recrui
                         available = any_interval_contains(applicant['parsed_availability'], (slot['start'], slot['end']))
                         if not available:
                             model.Add(applicant_slot[(a, block['block_id'], slot['slot_id'])] == 0)
-            else:  # group
-                for group in block['groups']:
-                    if (a, block['block_id'], group['group_id']) in applicant_group:
-                        available1 = any_interval_contains(applicant['parsed_availability'], 
-                                                         (group['slot1']['start'], group['slot1']['end']))
-                        available2 = any_interval_contains(applicant['parsed_availability'], 
-                                                         (group['slot2']['start'], group['slot2']['end']))
-                        if not (available1 and available2):
-                            model.Add(applicant_group[(a, block['block_id'], group['group_id'])] == 0)
+            else:  # group (parallel groups share the block's sessions)
+                group = block['groups'][0]
+                if (a, block['block_id']) in applicant_group:
+                    available1 = any_interval_contains(applicant['parsed_availability'], 
+                                                     (group['slot1']['start'], group['slot1']['end']))
+                    available2 = any_interval_contains(applicant['parsed_availability'], 
+                                                     (group['slot2']['start'], group['slot2']['end']))
+                    if not (available1 and available2):
+                        model.Add(applicant_group[(a, block['block_id'])] == 0)
     
     # Constraint 4: Time overlap prevention
     for a, applicant in enumerate(applicants):
@@ -426,32 +785,32 @@ def schedule_applicants_first(applicants: List[Dict], blocks: List[Dict], recrui
                 for slot in block1['slots']:
                     if (a, block1['block_id'], slot['slot_id']) in applicant_slot:
                         for b2, block2 in enumerate(blocks):
-                            if block2['type'] == 'group':
-                                for group in block2['groups']:
-                                    if (a, block2['block_id'], group['group_id']) in applicant_group:
-                                        slot_start, slot_end = slot['start'], slot['end']
-                                        group_start1 = group['slot1']['start']
-                                        group_end1 = group['slot1']['end']
-                                        group_start2 = group['slot2']['start']
-                                        group_end2 = group['slot2']['end']
-                                        
-                                        if (slot_start < group_end1 and slot_end > group_start1) or \
-                                           (slot_start < group_end2 and slot_end > group_start2):
-                                            model.Add(applicant_slot[(a, block1['block_id'], slot['slot_id'])] + 
-                                                    applicant_group[(a, block2['block_id'], group['group_id'])] <= 1)
-    
-    # Constraint 5: Group capacity (up to 8 applicants per group)
+                            if block2['type'] == 'group' and (a, block2['block_id']) in applicant_group:
+                                group = block2['groups'][0]
+                                slot_start, slot_end = slot['start'], slot['end']
+                                group_start1 = group['slot1']['start']
+                                group_end1 = group['slot1']['end']
+                                group_start2 = group['slot2']['start']
+                                group_end2 = group['slot2']['end']
+                                
+                                if (slot_start < group_end1 and slot_end > group_start1) or \
+                                   (slot_start < group_end2 and slot_end > group_start2):
+                                    model.Add(applicant_slot[(a, block1['block_id'], slot['slot_id'])] + 
+                                            applicant_group[(a, block2['block_id'])] <= 1)
+    
+    # Constraint 5: Group capacity (policy group_capacity applicants per parallel group in the block)
     for b, block in enumerate(blocks):
         if block['type'] == 'group':
-            for group in block['groups']:
-                group_assignments = []
-                for a, applicant in enumerate(applicants):
-                    if (a, block['block_id'], group['group_id']) in applicant_group:
-                        group_assignments.append(applicant_group[(a, block['block_id'], group['group_id'])])
-                if group_assignments:
-                    model.Add(sum(group_assignments) <= 8)  # Max 8 per group
-
-    # Constraint 6: Individual slot capacity (exactly 1 applicant per slot)
+            group_assignments = []
+            for a, applicant in enumerate(applicants):
+                if (a, block['block_id']) in applicant_group:
+                    group_assignments.append(applicant_group[(a, block['block_id'])])
+            if group_assignments:
+                block_capacity = len(block['groups']) * policy['group_capacity']
+                group_count = model.NewIntVar(0, block_capacity, f'group_count_{block["block_id"]}')
+                model.Add(group_count == sum(group_assignments))
+    
+    # Constraint 6: Individual slot capacity (1 applicant per slot, merged slots hold one per member)
     for b, block in enumerate(blocks):
         if block['type'] == 'individual':
             for slot in block['slots']:
@@ -460,12 +819,13 @@ def schedule_applicants_first(applicants: List[Dict], blocks: List[Dict], recrui
                     if (a, block['block_id'], slot['slot_id']) in applicant_slot:
                         slot_assignments.append(applicant_slot[(a, block['block_id'], slot['slot_id'])])
                 if slot_assignments:
-                    model.Add(sum(slot_assignments) <= 1)  # Max 1 applicant per individual slot
-
+                    model.Add(sum(slot_assignments) <= slot['capacity'])
+    
     # Objective: Maximize complete assignments while minimizing individual slot usage
     objective_terms = []
     
     # Strongly prioritize complete assignments (both individual and group)
+    complete_vars = []
     for a, applicant in enumerate(applicants):
         individual_var = model.NewBoolVar(f'has_individual_{a}')
         individual_assignments = []
@@ -480,10 +840,8 @@ def schedule_applicants_first(applicants: List[Dict], blocks: List[Dict], recrui
         group_var = model.NewBoolVar(f'has_group_{a}')
         group_assignments = []
         for b, block in enumerate(blocks):
-            if block['type'] == 'group':
-                for group in block['groups']:
-                    if (a, block['block_id'], group['group_id']) in applicant_group:
-                        group_assignments.append(applicant_group[(a, block['block_id'], group['group_id'])])
+            if block['type'] == 'group' and (a, block['block_id']) in applicant_group:
+                group_assignments.append(applicant_group[(a, block['block_id'])])
         if group_assignments:
             model.Add(group_var == sum(group_assignments))
         
@@ -493,7 +851,15 @@ def schedule_applicants_first(applicants: List[Dict], blocks: List[Dict], recrui
             model.Add(complete_var <= individual_var)
             model.Add(complete_var <= group_var)
             model.Add(complete_var >= individual_var + group_var - 1)
-            objective_terms.append(100 * complete_var)  # High weight for complete assignments
+            objective_terms.append(policy['complete_weight'] * complete_var)  # High weight for complete assignments
+            complete_vars.append(complete_var)
+        
+        # Partial credit for each interview held (off by default in Round 1)
+        if policy['partial_weight']:
+            if individual_assignments:
+                objective_terms.append(policy['partial_weight'] * individual_var)
+            if group_assignments:
+                objective_terms.append(policy['partial_weight'] * group_var)
     
     # Minimize individual slot usage (prefer concentrating applicants)
     for b, block in enumerate(blocks):
@@ -505,16 +871,67 @@ def schedule_applicants_first(applicants: List[Dict], blocks: List[Dict], recrui
                     if (a, block['block_id'], slot['slot_id']) in applicant_slot:
                         slot_assignments.append(applicant_slot[(a, block['block_id'], slot['slot_id'])])
                 if slot_assignments:
+                    if slot['capacity'] > 1:
+                        # A merged slot uses one of its members per applicant
+                        objective_terms.append(-policy['slot_penalty'] * sum(slot_assignments))
+                        continue
                     # Slot is used if any assignment exists
                     for assignment in slot_assignments:
                         model.Add(slot_used >= assignment)
-                    objective_terms.append(-1 * slot_used)  # Small penalty for using slots
+                    objective_terms.append(-policy['slot_penalty'] * slot_used)  # Small penalty for using slots
     
     model.Maximize(sum(objective_terms))
     
+    # Start the search from the hint schedule
+    if hint is not None:
+        index = {applicant['id']: a for a, applicant in enumerate(applicants)}
+        merged_into = {(block['block_id'], slot['slot_id']): key
+                       for key, members in slot_members.items() for block, slot in members}
+        hinted_slots = {(index[app_id], *merged_into[(a['individual_block_id'], a['individual_slot_id'])])
+                        for app_id, a in hint.items() if a.get('individual_slot_id')}
+        hinted_groups = {(index[app_id], a['group_block_id'])
+                         for app_id, a in hint.items() if a.get('group_id')}
+        for key, var in applicant_slot.items():
+            model.AddHint(var, key in hinted_slots)
+        for key, var in applicant_group.items():
+            model.AddHint(var, key in hinted_groups)
+    
     # Solve
     solver = cp_model.CpSolver()
-    status = solver.Solve(model)
+    for name, value in (solver_options or {}).items():
+        setattr(solver.parameters, name, value)
+    if deadline is not None:
+        remaining = deadline - time.time()
+        if remaining <= 0 and hint is not None:
+            print("Round 1 time budget spent building the model; keeping the heuristic schedule")
+            return dict(hint), [applicant['id'] for applicant in applicants if applicant['id'] not in hint]
+        solver.parameters.max_time_in_seconds = max(remaining, 0.01)
+    if complete_bound is not None:
+        # Redundant cut from the capacity bound
+        model.Add(sum(complete_vars) <= complete_bound)
+    if export_dir:
+        from model_export import export_model
+        export_model(model, export_dir, 'round1',
+                     {'applicant_slot': applicant_slot, 'applicant_group': applicant_group},
+                     {'applicants': [applicant['id'] for applicant in applicants], 'objective_target': target,
+                      'merged_slots': {f'{block_id}/{slot_id}': [[block['block_id'], slot['slot_id']] for block, slot in members]
+                                       for (block_id, slot_id), members in slot_members.items() if len(members) > 1}})
+    if hint_reaches_bound:
+        print("Heuristic schedule reaches the capacity bound; skipping CP-SAT")
+        return dict(hint), [applicant['id'] for applicant in applicants if applicant['id'] not in hint]
+    if target is not None:
+        status = solver.Solve(model, objective_target_callback(target))
+    else:
+        status = solver.Solve(model)
+    print(f"Round 1 solver status: {solver.StatusName(status)} in {solver.WallTime():.2f}s")
+    
+    # Fall back to the hint if the solver did not improve on it
+    if hint is not None:
+        solved = status == cp_model.OPTIMAL or status == cp_model.FEASIBLE
+        hint_objective = round1_objective(hint, policy)
+        if not solved or solver.ObjectiveValue() < hint_objective:
+            print(f"Keeping the heuristic schedule (objective {hint_objective})")
+            return dict(hint), [applicant['id'] for applicant in applicants if applicant['id'] not in hint]
     
     # Extract solution
     applicant_assignments = {}
@@ -522,6 +939,8 @@ def schedule_applicants_first(applicants: List[Dict], blocks: List[Dict], recrui
     
     if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
         scheduled_applicants = set()
+        group_members = {}  # block_id -> applicants, split into groups below
+        slot_applicants = {}  # merged slot key -> applicant ids, given its member slots below
         
         # Extract individual and group assignments
         for a, applicant in enumerate(applicants):
@@ -534,29 +953,17 @@ def schedule_applicants_first(applicants: List[Dict], blocks: List[Dict], recrui
                     for slot in block['slots']:
                         if (a, block['block_id'], slot['slot_id']) in applicant_slot and \
                            solver.Value(applicant_slot[(a, block['block_id'], slot['slot_id'])]) == 1:
-                            individual_assignment = {
-                                'individual_block_id': block['block_id'],
-                                'individual_slot_id': slot['slot_id'],
-                                'individual_start': slot['start'],
-                                'individual_end': slot['end']
-                            }
+                            slot_applicants.setdefault((block['block_id'], slot['slot_id']), []).append(applicant['id'])
+                            individual_assignment = {'individual_block_id': block['block_id']}
                             break
             
-            # Find group assignment
+            # Find group block assignment
             for b, block in enumerate(blocks):
-                if block['type'] == 'group':
-                    for group in block['groups']:
-                        if (a, block['block_id'], group['group_id']) in applicant_group and \
-                           solver.Value(applicant_group[(a, block['block_id'], group['group_id'])]) == 1:
-                            group_assignment = {
-                                'group_block_id': block['block_id'],
-                                'group_id': group['group_id'],
-                                'group_slot1_start': group['slot1']['start'],
-                                'group_slot1_end': group['slot1']['end'],
-                                'group_slot2_start': group['slot2']['start'],
-                                'group_slot2_end': group['slot2']['end']
-                            }
-                            break
+                if block['type'] == 'group' and (a, block['block_id']) in applicant_group and \
+                   solver.Value(applicant_group[(a, block['block_id'])]) == 1:
+                    group_members.setdefault(block['block_id'], []).append(applicant)
+                    group_assignment = {'group_block_id': block['block_id']}
+                    break
             
             # Include applicants with either individual OR group assignments (or both)
             if individual_assignment or group_assignment:
@@ -569,6 +976,18 @@ def schedule_applicants_first(applicants: List[Dict], blocks: List[Dict], recrui
                 applicant_assignments[applicant['id']] = assignment_data
                 scheduled_applicants.add(applicant['id'])
         
+        # Give the applicants of each merged slot one of its member slots each
+        for key, app_ids in slot_applicants.items():
+            for app_id, (block, slot) in zip(app_ids, slot_members[key]):
+                applicant_assignments[app_id].update(individual_fields(block, slot))
+        
+        # Split each group block's applicants into its parallel groups
+        for block in blocks:
+            if block['block_id'] in group_members:
+                groups = split_into_groups(block, group_members[block['block_id']], policy['group_capacity'])
+                for app_id, group in groups.items():
+                    applicant_assignments[app_id].update(group_fields(block, group))
+        
         # Unscheduled applicants
         for applicant in applicants:
             if applicant['id'] not in scheduled_applicants:
@@ -581,10 +1000,26 @@ def schedule_applicants_first(applicants: List[Dict], blocks: List[Dict], recrui
 
 def schedule_recruiters_to_match(recruiters: List[Dict], applicant_assignments: Dict, blocks: List[Dict], rooms: List[Dict]) -> Dict:
     """Schedule recruiters to match the applicant assignments."""
+    recruiter_assignments, _ = staff_applicants(recruiters, applicant_assignments, blocks)
+    
+    # Rooms by type, so sessions running at the same time get different rooms
+    print_shortages(assign_rooms(recruiter_assignments, rooms))
+    
+    return recruiter_assignments
+
+def staff_applicants(recruiters: List[Dict], applicant_assignments: Dict, blocks: List[Dict]) -> Tuple[Dict, Set[str]]:
+    """Round 2 staffing without rooms: recruiter assignments per block and the applicants left unstaffed.
+    
+    Round 1 only looks at applicant availability, so an applicant is unstaffed
+    when no free recruiter of their teams (any team if they have none) takes
+    their individual slot or runs their group.
+    """
+    unstaffed = set()
     
     # Get blocks that have applicants assigned
     blocks_with_applicants = set()
     applicant_blocks = {}  # block_id -> list of applicants
+    applicant_groups = {}  # block_id -> group_id -> list of applicants
     
     for app_id, assignment in applicant_assignments.items():
         individual_block = assignment.get('individual_block_id')
@@ -601,19 +1036,18 @@ def schedule_recruiters_to_match(recruiters: List[Dict], applicant_assignments:
             if group_block not in applicant_blocks:
                 applicant_blocks[group_block] = []
             applicant_blocks[group_block].append(assignment['applicant'])
+            group_members = applicant_groups.setdefault(group_block, {})
+            group_members.setdefault(assignment['group_id'], []).append(assignment['applicant'])
     
     recruiter_assignments = {}
     
-    for block_id in blocks_with_applicants:
-        block = next(b for b in blocks if b['block_id'] == block_id)
+    # Blocks in file order, so the schedule does not depend on set ordering
+    for block in blocks:
+        if block['block_id'] not in blocks_with_applicants:
+            continue
+        block_id = block['block_id']
         applicants_in_block = applicant_blocks[block_id]
         
-        # Get teams needed for this block
-        teams_needed = set()
-        for app in applicants_in_block:
-            if app['teams']:
-                teams_needed.update(app['teams'])
-        
         recruiter_assignments[block_id] = []
         
         if block['type'] == 'individual':
@@ -644,43 +1078,62 @@ def schedule_recruiters_to_match(recruiters: List[Dict], applicant_assignments:
                 if best_recruiter:
                     recruiter_assignments[block_id].append({
                         'recruiter': best_recruiter,
-                        'room': rooms[0] if rooms else {'room_id': 'TBD'},  # Simple room assignment
+                        'room': None,  # Set by assign_rooms once every block is staffed
                         'block': block
                     })
+                else:
+                    unstaffed.add(app['id'])
         
         else:  # group block
-            # For group blocks: Try to get diverse team representation
-            assigned_teams = set()
-            for team in teams_needed:
-                # Find an available recruiter from this team
-                for recruiter in recruiters:
-                    if recruiter['team'] != team:
-                        continue
-                    if recruiter['team'] in assigned_teams:
-                        continue
-                    
-                    # Check availability for both group slots
-                    available1 = any_interval_contains(recruiter['parsed_availability'], 
-                                                     (block['groups'][0]['slot1']['start'], 
-                                                      block['groups'][0]['slot1']['end']))
-                    available2 = any_interval_contains(recruiter['parsed_availability'], 
-                                                     (block['groups'][0]['slot2']['start'], 
-                                                      block['groups'][0]['slot2']['end']))
-                    if not (available1 and available2):
-                        continue
-                    
-                    recruiter_assignments[block_id].append({
-                        'recruiter': recruiter,
-                        'room': rooms[0] if rooms else {'room_id': 'TBD'},  # Simple room assignment
-                        'block': block
-                    })
-                    assigned_teams.add(team)
-                    break
+            # For group blocks: Try to get diverse team representation in each parallel group
+            assigned_recruiters = set()
+            for group_id, group_applicants in sorted(applicant_groups[block_id].items()):
+                group_teams = set()
+                for app in group_applicants:
+                    group_teams.update(app['teams'])
+                
+                assigned_teams = set()
+                for team in sorted(group_teams):
+                    # Find an available recruiter from this team not already running another group
+                    for recruiter in recruiters:
+                        if recruiter['team'] != team:
+                            continue
+                        if recruiter['team'] in assigned_teams or recruiter['id'] in assigned_recruiters:
+                            continue
+                        
+                        # Check availability for both group slots
+                        available1 = any_interval_contains(recruiter['parsed_availability'], 
+                                                         (block['groups'][0]['slot1']['start'], 
+                                                          block['groups'][0]['slot1']['end']))
+                        available2 = any_interval_contains(recruiter['parsed_availability'], 
+                                                         (block['groups'][0]['slot2']['start'], 
+                                                          block['groups'][0]['slot2']['end']))
+                        if not (available1 and available2):
+                            continue
+                        
+                        recruiter_assignments[block_id].append({
+                            'recruiter': recruiter,
+                            'room': None,  # Set by assign_rooms once every block is staffed
+                            'block': block,
+                            'group_id': group_id
+                        })
+                        assigned_teams.add(team)
+                        assigned_recruiters.add(recruiter['id'])
+                        break
+                
+                for app in group_applicants:
+                    if not (assigned_teams & set(app['teams']) if app['teams'] else assigned_teams):
+                        unstaffed.add(app['id'])
     
-    return recruiter_assignments
+    return recruiter_assignments, unstaffed
 
-def schedule_applicants(applicants: List[Dict], recruiter_assignments: Dict, blocks: List[Dict]) -> Tuple[Dict, List[str]]:
-    """Round 2: Schedule applicants to slots/groups using OR-Tools."""
+def schedule_applicants(applicants: List[Dict], recruiter_assignments: Dict, blocks: List[Dict],
+                        export_dir: str = None) -> Tuple[Dict, List[str]]:
+    """Round 2: Schedule applicants to slots/groups using OR-Tools.
+    
+    With export_dir, the model is also written there for replay.py.
+    """
+    from ortools.sat.python import cp_model
     model = cp_model.CpModel()
     
     # Decision variables for individual slots and groups
@@ -766,7 +1219,7 @@ def schedule_applicants(applicants: List[Dict], recruiter_assignments: Dict, blo
     # Constraint 3.5: Individual and group assignments must be on the same day
     for a, applicant in enumerate(applicants):
         # For each date, collect individual and group assignments
-        dates = set(block['date'] for block in blocks)
+        dates = sorted(set(block['date'] for block in blocks))
         
         for date in dates:
             # Collect individual assignments for this date
@@ -791,22 +1244,20 @@ def schedule_applicants(applicants: List[Dict], recruiter_assignments: Dict, blo
                 group_sum = sum(group_assignments_this_date)
                 # If individual on this date, must also have group on this date
                 model.Add(individual_sum == group_sum)
-
+    
     # Constraint 4: Team matching - applicants can only be assigned to blocks with recruiters from their teams
+    # Team bitmask of the recruiters on each block; blocks without recruiters allow every team
+    block_masks = [
+        recruiters_mask(assignment['recruiter'] for assignment in recruiter_assignments[block['block_id']])
+        if block['block_id'] in recruiter_assignments else ALL_TEAMS_MASK
+        for block in blocks
+    ]
+    team_ok = team_match_matrix([applicant['team_mask'] for applicant in applicants], block_masks)
     for a, applicant in enumerate(applicants):
-        if not applicant['teams']:  # Skip if no team preferences
-            continue
-            
         for b, block in enumerate(blocks):
             block_id = block['block_id']
             if block_id in recruiter_assignments:
-                # Get teams of recruiters assigned to this block
-                recruiter_teams = {assignment['recruiter']['team'] for assignment in recruiter_assignments[block_id]}
-                
-                # Check if applicant has any matching team
-                has_matching_team = bool(applicant['teams'].intersection(recruiter_teams))
-                
-                if not has_matching_team:
+                if not team_ok[a, b]:
                     # Can't assign this applicant to this block
                     if block['type'] == 'individual':
                         for slot in block['slots']:
@@ -832,7 +1283,7 @@ def schedule_applicants(applicants: List[Dict], recruiter_assignments: Dict, blo
                 
                 if block_assignments:
                     model.Add(sum(block_assignments) <= recruiter_count)
-
+    
     # Objective: Strongly prioritize applicants who get BOTH individual AND group slots
     objective_terms = []
     
@@ -879,6 +1330,12 @@ def schedule_applicants(applicants: List[Dict], recruiter_assignments: Dict, blo
     
     model.Maximize(sum(objective_terms))
     
+    if export_dir:
+        from model_export import export_model
+        export_model(model, export_dir, 'round2_applicants',
+                     {'applicant_slot': applicant_slot, 'applicant_group': applicant_group},
+                     {'applicants': [applicant['id'] for applicant in applicants]})
+    
     # Solve
     solver = cp_model.CpSolver()
     status = solver.Solve(model)
@@ -929,56 +1386,32 @@ def schedule_applicants(applicants: List[Dict], recruiter_assignments: Dict, blo
     
     return applicant_assignments, unscheduled
 
-def write_output_files(recruiter_assignments: Dict, applicant_assignments: Dict, unscheduled: List[str], 
-                      applicants: List[Dict], recruiters: List[Dict], blocks: List[Dict], output_dir: str = "results"):
-    """Write output CSV files to organized directory structure."""
-    
-    # Create timestamped output directory
-    timestamp = dt.datetime.now().strftime("%Y%m%d_%H%M%S")
-    run_dir = Path(output_dir) / f"run_{timestamp}"
-    run_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Create subdirectories for better organization
-    schedules_dir = run_dir / "schedules"
-    summaries_dir = run_dir / "summaries"
-    schedules_dir.mkdir(exist_ok=True)
-    summaries_dir.mkdir(exist_ok=True)
-    
-    # File paths with organized structure
-    recruiter_file = schedules_dir / "recruiters_schedule.csv"
-    applicant_file = schedules_dir / "applicants_schedule.csv"
-    unscheduled_file = schedules_dir / "unscheduled_applicants.csv"
-    summary_file = summaries_dir / "run_summary.txt"
-    
-    # 1. Recruiter schedule
-    recruiter_rows = []
+def recruiter_schedule_rows(recruiter_assignments: Dict, blocks: List[Dict]) -> Iterator[Dict]:
+    """Yield recruiters_schedule.csv rows from recruiter assignments."""
+    blocks_by_id = {block['block_id']: block for block in blocks}
     for block_id, assignments in recruiter_assignments.items():
-        block = next(b for b in blocks if b['block_id'] == block_id)
+        block = blocks_by_id[block_id]
         for assignment in assignments:
-            recruiter_rows.append({
+            yield {
                 'block_id': block_id,
                 'recruiter_id': assignment['recruiter']['id'],
                 'recruiter_name': assignment['recruiter']['name'],
                 'team': assignment['recruiter']['team'],
                 'room_id': assignment['room']['room_id'],
+                'group_id': assignment.get('group_id') or '',
                 'start': block['start'].strftime('%Y-%m-%d %H:%M:%S'),
                 'end': block['end'].strftime('%Y-%m-%d %H:%M:%S')
-            })
-    
-    with open(recruiter_file, 'w', newline='') as f:
-        if recruiter_rows:
-            writer = csv.DictWriter(f, fieldnames=recruiter_rows[0].keys())
-            writer.writeheader()
-            writer.writerows(recruiter_rows)
-    
-    # 2. Applicant schedule
-    applicant_rows = []
+            }
+
+def applicant_schedule_rows(applicant_assignments: Dict, applicants: List[Dict]) -> Iterator[Dict]:
+    """Yield applicants_schedule.csv rows from Round 1 applicant assignments."""
+    applicants_by_id = {applicant['id']: applicant for applicant in applicants}
     for app_id, assignment in applicant_assignments.items():
-        applicant = next(a for a in applicants if a['id'] == app_id)
+        applicant = applicants_by_id[app_id]
         row = {
             'applicant_id': app_id,
             'applicant_name': applicant['name'],
-            'teams': ','.join(applicant['teams']) if applicant['teams'] else 'None'
+            'teams': ','.join(team for team in TEAMS if team in applicant['teams']) if applicant['teams'] else 'None'
         }
         
         # Individual slot info
@@ -1017,30 +1450,92 @@ def write_output_files(recruiter_assignments: Dict, applicant_assignments: Dict,
                 'group_slot2_end': ''
             })
         
-        applicant_rows.append(row)
+        yield row
+
+def create_run_dir(output_dir: str = "results") -> Path:
+    """Create a timestamped run directory with its schedules/ and summaries/ subdirectories."""
+    timestamp = dt.datetime.now().strftime("%Y%m%d_%H%M%S")
+    run_dir = Path(output_dir) / f"run_{timestamp}"
+    run_dir.mkdir(parents=True, exist_ok=True)
+    (run_dir / "schedules").mkdir(exist_ok=True)
+    (run_dir / "summaries").mkdir(exist_ok=True)
+    return run_dir
+
+def snapshot_inputs(run_dir, input_dir: str, blocks_file: str = 'blocks.csv') -> Path:
+    """Copy the input CSVs a run was produced from into <run_dir>/inputs/.
+    
+    The blocks file is always stored as inputs/blocks.csv, which is where the
+    report scripts look for it.
+    """
+    inputs_dir = Path(run_dir) / "inputs"
+    inputs_dir.mkdir(parents=True, exist_ok=True)
+    for name in ['applicant_info.csv', 'recruiters.csv', 'rooms.csv']:
+        shutil.copyfile(os.path.join(input_dir, name), inputs_dir / name)
+    shutil.copyfile(os.path.join(input_dir, blocks_file), inputs_dir / 'blocks.csv')
+    write_artifact(inputs_dir / 'blocks.csv')
+    return inputs_dir
+
+def write_output_files(recruiter_assignments: Dict, applicant_assignments: Dict, unscheduled: List[str], 
+                      applicants: List[Dict], recruiters: List[Dict], blocks: List[Dict], output_dir: str = "results",
+                      run_dir: Path = None, unscheduled_reasons: Dict[str, str] = None):
+    """Write output CSV files to organized directory structure."""
+    
+    # Create timestamped output directory unless the caller already made one
+    if run_dir is None:
+        run_dir = create_run_dir(output_dir)
+    run_dir = Path(run_dir)
+    
+    # Subdirectories for better organization
+    schedules_dir = run_dir / "schedules"
+    summaries_dir = run_dir / "summaries"
+    schedules_dir.mkdir(parents=True, exist_ok=True)
+    summaries_dir.mkdir(parents=True, exist_ok=True)
     
+    # File paths with organized structure
+    recruiter_file = schedules_dir / "recruiters_schedule.csv"
+    applicant_file = schedules_dir / "applicants_schedule.csv"
+    unscheduled_file = schedules_dir / "unscheduled_applicants.csv"
+    summary_file = summaries_dir / "run_summary.txt"
+    
+    # 1. Recruiter schedule, streamed row by row
+    with open(recruiter_file, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=RECRUITER_SCHEDULE_COLUMNS)
+        writer.writeheader()
+        for row in recruiter_schedule_rows(recruiter_assignments, blocks):
+            writer.writerow(row)
+    
+    # 2. Applicant schedule, streamed row by row
     with open(applicant_file, 'w', newline='') as f:
-        if applicant_rows:
-            writer = csv.DictWriter(f, fieldnames=applicant_rows[0].keys())
-            writer.writeheader()
-            writer.writerows(applicant_rows)
+        writer = csv.DictWriter(f, fieldnames=APPLICANT_SCHEDULE_COLUMNS)
+        writer.writeheader()
+        for row in applicant_schedule_rows(applicant_assignments, applicants):
+            writer.writerow(row)
     
-    # 3. Unscheduled applicants
+    # 3. Unscheduled applicants, with the reason code when known
+    unscheduled_reasons = unscheduled_reasons or {}
     with open(unscheduled_file, 'w', newline='') as f:
         writer = csv.writer(f)
-        writer.writerow(['applicant_id'])
+        writer.writerow(['applicant_id', 'reason'])
         for app_id in unscheduled:
-            writer.writerow([app_id])
-    
-    # 4. Generate run summary
-    thursday_count = sum(1 for assignment in applicant_assignments.values() 
-                        if 'individual_block_id' in assignment and assignment['individual_block_id'] and assignment['individual_block_id'].startswith('T11'))
-    friday_count = sum(1 for assignment in applicant_assignments.values() 
-                      if 'individual_block_id' in assignment and assignment['individual_block_id'] and assignment['individual_block_id'].startswith('F12'))
-    saturday_count = sum(1 for assignment in applicant_assignments.values() 
-                        if 'individual_block_id' in assignment and assignment['individual_block_id'] and assignment['individual_block_id'].startswith('S13'))
-    sunday_count = sum(1 for assignment in applicant_assignments.values() 
-                      if 'individual_block_id' in assignment and assignment['individual_block_id'] and assignment['individual_block_id'].startswith('U14'))
+            writer.writerow([app_id, unscheduled_reasons.get(app_id, '')])
+    
+    # 4. Generate run summary: blocks and appointments per event date, in one pass each
+    block_dates = {block['block_id']: block['date'] for block in blocks}
+    date_blocks = {}
+    for block in blocks:
+        day = date_blocks.setdefault(block['date'], {'blocks': 0, 'start': block['start'], 'end': block['end']})
+        day['blocks'] += 1
+        day['start'] = min(day['start'], block['start'])
+        day['end'] = max(day['end'], block['end'])
+    date_appointments = {}
+    for assignment in applicant_assignments.values():
+        block_id = assignment.get('individual_block_id') or assignment.get('group_block_id')
+        date = block_dates.get(block_id)
+        if date is None and block_id:
+            # Block not in the (filtered) blocks list; fall back to the session's own date
+            date = (assignment.get('individual_start') or assignment['group_slot1_start']).strftime('%Y-%m-%d')
+        if date is not None:
+            date_appointments[date] = date_appointments.get(date, 0) + 1
     
     with open(summary_file, 'w') as f:
         f.write(f"SCHEDULING RUN SUMMARY\n")
@@ -1048,53 +1543,88 @@ def write_output_files(recruiter_assignments: Dict, applicant_assignments: Dict,
         f.write(f"Run Date: {dt.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
         f.write(f"Output Directory: {run_dir}\n\n")
         f.write(f"SCHEDULE COVERAGE:\n")
-        f.write(f"Thursday Sep 11 (5-9 PM): {22} blocks\n")
-        f.write(f"Friday Sep 12 (5-9 PM): {22} blocks\n")
-        f.write(f"Saturday Sep 13 (10 AM-12 PM, 1-9 PM): {56} blocks\n")
-        f.write(f"Sunday Sep 14 (10 AM-12 PM, 1-9 PM): {56} blocks\n")
+        for date, day in sorted(date_blocks.items()):
+            f.write(f"{day['start'].strftime('%A %b %d')} ({day['start'].strftime('%H:%M')}-{day['end'].strftime('%H:%M')}): "
+                    f"{day['blocks']} blocks\n")
         f.write(f"Total Blocks: {len(blocks)}\n\n")
         f.write(f"RESULTS:\n")
         f.write(f"Total Applicants: {len(applicants)}\n")
         f.write(f"Successfully Scheduled: {len(applicant_assignments)} ({100*len(applicant_assignments)/len(applicants):.1f}%)\n")
         f.write(f"Unscheduled: {len(unscheduled)} ({100*len(unscheduled)/len(applicants):.1f}%)\n\n")
         f.write(f"DAY DISTRIBUTION:\n")
-        f.write(f"Thursday Appointments: {thursday_count}\n")
-        f.write(f"Friday Appointments: {friday_count}\n")
-        f.write(f"Saturday Appointments: {saturday_count}\n")
-        f.write(f"Sunday Appointments: {sunday_count}\n\n")
+        for date in sorted(set(date_blocks) | set(date_appointments)):
+            f.write(f"{dt.date.fromisoformat(date).strftime('%A %b %d')} Appointments: {date_appointments.get(date, 0)}\n")
+        f.write(f"\n")
         f.write(f"OUTPUT FILES:\n")
         f.write(f"- schedules/recruiters_schedule.csv\n")
         f.write(f"- schedules/applicants_schedule.csv\n")
         f.write(f"- schedules/unscheduled_applicants.csv\n")
         f.write(f"- summaries/run_summary.txt\n")
     
+    # 5. Columnar copies of the schedules for the analysis scripts (needs pyarrow)
+    artifacts = [write_artifact(path) for path in (recruiter_file, applicant_file, unscheduled_file)]
+    
     print(f"Output files written to: {run_dir}")
     print(f"  - schedules/recruiters_schedule.csv")
     print(f"  - schedules/applicants_schedule.csv") 
     print(f"  - schedules/unscheduled_applicants.csv")
     print(f"  - summaries/run_summary.txt")
+    if all(artifacts):
+        print(f"  - schedules/*.arrow (columnar copies)")
     
     return str(run_dir)
 
-def main():
-    parser = argparse.ArgumentParser(description='Autoscheduler for interview blocks')
-    parser.add_argument('--input-dir', default='.', help='Input directory containing CSV files')
-    parser.add_argument('--output-dir', default='results', help='Output directory for results')
-    
-    args = parser.parse_args()
-    
-    # Load input files
-    print("Loading input files...")
-    applicants = load_applicants(os.path.join(args.input_dir, 'applicant_info.csv'))
-    recruiters = load_recruiters(os.path.join(args.input_dir, 'recruiters.csv'))
-    blocks = load_blocks(os.path.join(args.input_dir, 'blocks.csv'))
-    rooms = load_rooms(os.path.join(args.input_dir, 'rooms.csv'))
-    
-    print(f"Loaded {len(applicants)} applicants, {len(recruiters)} recruiters, {len(blocks)} blocks, {len(rooms)} rooms")
+def run_round1(applicants: List[Dict], recruiters: List[Dict], blocks: List[Dict], policy: Dict = None,
+               deadline: float = None, export_dir: str = None,
+               solver_options: Dict = None) -> Tuple[Dict, Dict[str, str], List[Dict], Dict]:
+    """Presolve, screen, bound and solve Round 1, the way every Round 1 caller should.
+    
+    Round 1 always builds a greedy schedule first; CP-SAT then tries to improve
+    on it until the deadline (a time.time() value, None for no limit) and stops
+    early once it reaches the capacity bound. Returns the applicant assignments,
+    a reason code for every applicant left unscheduled, the blocks that
+    survived presolve and the capacity bound.
+    """
+    policy = resolve_policy(policy)
+    # Presolve: blocks nobody can staff, attend or pair never enter the model
+    print("\nPresolving blocks...")
+    blocks, _ = prune_blocks(applicants, blocks, recruiters, policy)
+    
+    # Screening: hopeless applicants never enter the model
+    print("\nScreening applicants...")
+    viable_applicants, unscheduled_reasons = screen_applicants(applicants, blocks, recruiters)
+    
+    # Capacity bound: the solver can stop once a schedule reaches it
+    bound = capacity_bound(viable_applicants, blocks, recruiters, policy['group_capacity'])
+    print(f"Capacity bound: at most {bound['bound']} complete assignments "
+          f"(individual {bound['individual_flow']}, group {bound['group_flow']})")
     
     # Round 1: Schedule applicants to slots/groups first
     print("\nRound 1: Scheduling applicants to slots/groups...")
-    applicant_assignments, unscheduled = schedule_applicants_first(applicants, blocks, recruiters)
+    greedy_assignments, _ = greedy_applicants_first(viable_applicants, blocks, recruiters, policy)
+    print(f"Heuristic schedule: {len(greedy_assignments)} complete assignments "
+          f"(objective {round1_objective(greedy_assignments, policy)})")
+    applicant_assignments, solver_unscheduled = schedule_applicants_first(viable_applicants, blocks, recruiters,
+                                                                          bound['bound'], policy, solver_options,
+                                                                          hint=greedy_assignments, deadline=deadline,
+                                                                          export_dir=export_dir)
+    for app_id in solver_unscheduled:
+        unscheduled_reasons[app_id] = REASON_SOLVER_UNSCHEDULED
+    return applicant_assignments, unscheduled_reasons, blocks, bound
+
+def run_strict_rounds(applicants: List[Dict], recruiters: List[Dict], blocks: List[Dict], rooms: List[Dict],
+                      policy: Dict = None, deadline: float = None, export_dir: str = None,
+                      seed: int = None) -> Tuple[Dict, List[str], Dict, List[Dict], Dict[str, str]]:
+    """Run Round 1 (see run_round1) and Round 2 and drop blocks that ended up without applicants.
+    
+    With a seed and no deadline the same inputs always give the same schedule.
+    Returns the unscheduled ids together with a reason code for each of them.
+    """
+    # Deterministic search: a fixed seed, with parallel workers interleaved in a fixed order
+    solver_options = {'random_seed': seed, 'interleave_search': True} if seed is not None else None
+    applicant_assignments, unscheduled_reasons, blocks, _ = run_round1(applicants, recruiters, blocks, policy, deadline,
+                                                                       export_dir, solver_options)
+    unscheduled = [applicant['id'] for applicant in applicants if applicant['id'] in unscheduled_reasons]
     print(f"Scheduled {len(applicant_assignments)} applicants, {len(unscheduled)} unscheduled")
     
     # Round 2: Schedule recruiters to match applicant assignments
@@ -1125,10 +1655,90 @@ def main():
     
     print(f"Keeping {len(filtered_blocks)} blocks with applicants (removed {len(blocks) - len(filtered_blocks)} empty blocks)")
     
+    return applicant_assignments, unscheduled, filtered_recruiter_assignments, filtered_blocks, unscheduled_reasons
+
+def load_cached_run(entry: Path, applicants: List[Dict], recruiters: List[Dict], blocks: List[Dict],
+                    rooms: List[Dict]) -> Tuple[Dict, List[str], Dict, List[Dict], Dict[str, str]]:
+    """Schedule stored in a result cache entry, in the shape run_strict_rounds returns."""
+    import pandas as pd
+    entry = Path(entry)
+    applicant_assignments = load_applicant_assignments(entry / 'applicants_schedule.csv', applicants, blocks)
+    recruiter_assignments = load_recruiter_assignments(entry / 'recruiters_schedule.csv', recruiters, blocks, rooms)
+    unscheduled_df = pd.read_csv(entry / 'unscheduled_applicants.csv', dtype=str, keep_default_na=False)
+    unscheduled = list(unscheduled_df['applicant_id'])
+    unscheduled_reasons = {row['applicant_id']: row['reason'] for _, row in unscheduled_df.iterrows() if row['reason']}
+    # Same blocks run_strict_rounds keeps: every block an applicant is placed in
+    blocks_with_applicants = set()
+    for assignment in applicant_assignments.values():
+        if assignment.get('individual_block_id'):
+            blocks_with_applicants.add(assignment['individual_block_id'])
+        if assignment.get('group_block_id'):
+            blocks_with_applicants.add(assignment['group_block_id'])
+    used_blocks = [block for block in blocks if block['block_id'] in blocks_with_applicants]
+    return applicant_assignments, unscheduled, recruiter_assignments, used_blocks, unscheduled_reasons
+
+def main():
+    parser = argparse.ArgumentParser(description='Autoscheduler for interview blocks')
+    parser.add_argument('--input-dir', default='.', help='Input directory containing CSV files')
+    parser.add_argument('--output-dir', default='results', help='Output directory for results')
+    parser.add_argument('--policy', default=None, help='Round 1 policy overrides as JSON or a JSON file (see DEFAULT_POLICY)')
+    parser.add_argument('--time-budget', type=float, default=None,
+                        help='Wall-clock seconds for the solver; the best schedule found so far is kept')
+    parser.add_argument('--export-model', default=None, metavar='DIR',
+                        help='Also write every CP-SAT model to this directory as a protobuf plus a mapping file (see replay.py)')
+    parser.add_argument('--seed', type=int, default=0, help='CP-SAT random seed; the same inputs and seed give the same schedule')
+    parser.add_argument('--cache-dir', default=None, help='Result cache directory (default: <output-dir>/cache)')
+    parser.add_argument('--no-cache', action='store_true', help='Always solve, without reading or writing the result cache')
+    parser.add_argument('--history-db', default=None, help='Run history database (default: <output-dir>/run_history.sqlite)')
+    parser.add_argument('--no-history', action='store_true', help='Do not record the run in the history database')
+    
+    args = parser.parse_args()
+    policy = parse_policy(args.policy)
+    deadline = time.time() + args.time_budget if args.time_budget else None
+    
+    # A wall-clock budget makes the result timing-dependent, and exporting models needs a solve
+    use_cache = not (args.no_cache or args.time_budget or args.export_model)
+    cache_dir = args.cache_dir or os.path.join(args.output_dir, 'cache')
+    cache_parts = cache_key(args.input_dir, {'command': 'autoscheduler', 'policy': resolve_policy(policy)},
+                            args.seed) if use_cache else None
+    cache_entry = lookup(cache_dir, cache_parts['key']) if use_cache else None
+    
+    # Load input files
+    print("Loading input files...")
+    applicants = load_applicants(os.path.join(args.input_dir, 'applicant_info.csv'))
+    recruiters = load_recruiters(os.path.join(args.input_dir, 'recruiters.csv'))
+    rooms = load_rooms(os.path.join(args.input_dir, 'rooms.csv'))
+    blocks = load_blocks(os.path.join(args.input_dir, 'blocks.csv'), rooms, recruiters)
+    
+    print(f"Loaded {len(applicants)} applicants, {len(recruiters)} recruiters, {len(blocks)} blocks, {len(rooms)} rooms")
+    
+    solve_start = time.time()
+    if cache_entry:
+        print(f"\nCache hit {cache_parts['key'][:12]} (solved in {entry_info(cache_entry)['source_run']}); skipping the solve")
+        applicant_assignments, unscheduled, filtered_recruiter_assignments, filtered_blocks, unscheduled_reasons = load_cached_run(
+            cache_entry, applicants, recruiters, blocks, rooms)
+    else:
+        applicant_assignments, unscheduled, filtered_recruiter_assignments, filtered_blocks, unscheduled_reasons = run_strict_rounds(
+            applicants, recruiters, blocks, rooms, policy, deadline, args.export_model, args.seed)
+    solve_seconds = time.time() - solve_start
+    
     # Write output files
     print("\nWriting output files...")
     output_dir = write_output_files(filtered_recruiter_assignments, applicant_assignments, unscheduled, 
-                                  applicants, recruiters, filtered_blocks, args.output_dir)
+                                  applicants, recruiters, filtered_blocks, args.output_dir,
+                                  unscheduled_reasons=unscheduled_reasons)
+    snapshot_inputs(output_dir, args.input_dir)
+    if cache_entry and not summary_matches(cache_entry, output_dir):
+        print(f"⚠️  Run summary differs from the one written by {entry_info(cache_entry)['source_run']}")
+    if use_cache and not cache_entry:
+        print(f"Result cached as {store(cache_dir, cache_parts, output_dir)}")
+    
+    if not args.no_history:
+        history_db = args.history_db or os.path.join(args.output_dir, 'run_history.sqlite')
+        record_run(history_db, output_dir, params={'command': 'autoscheduler', 'policy': policy, 'time_budget': args.time_budget,
+                                                   'seed': args.seed},
+                   metrics={'solve_seconds': round(solve_seconds, 3), 'cache_hit': bool(cache_entry)})
+        print(f"Run recorded in {history_db}")
     
     print(f"\nScheduling complete!")
     print(f"Success rate: {len(applicant_assignments)}/{len(applicants)} ({100*len(applicant_assignments)/len(applicants):.1f}%)")
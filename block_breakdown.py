@@ -1,167 +1,104 @@
-import pandas as pd
+import argparse
 import os
 from datetime import datetime
+from run_analysis import read_table, run_blocks_file, applicant_placements, block_summary, unit_members
 
-def create_block_breakdown():
-    """Create a comprehensive breakdown showing who is in each block for both regular and relaxed scheduling."""
-    
-    print("Loading scheduling data...")
-    
-    # Load the combined schedule
-    combined_schedule = pd.read_csv('schedule_final_combined.csv')
-    
-    # Load recruiter assignments
-    recruiter_schedule = pd.read_csv('schedule_recruiters.csv')
-    
-    # Load block information
-    blocks_df = pd.read_csv('blocks.csv')
-    
-    print(f"Loaded {len(combined_schedule)} applicant assignments")
-    print(f"Loaded {len(recruiter_schedule)} recruiter assignments")
-    
-    # Create block breakdown
-    block_breakdown = {}
+BASE_COLUMNS = ['block_id', 'block_type', 'start_time', 'end_time', 'recruiter_count', 'recruiters',
+                'regular_count', 'relaxed_count', 'total_count']
+UNIT_COLUMNS = ['slot_id', 'slot_applicants', 'slot_count', 'group_id', 'group_applicants', 'group_count']
+
+def build_block_breakdown(combined_schedule, recruiter_schedule, blocks_df):
+    """Aggregate recruiters and regular/relaxed applicants for every block.
     
-    # Process each block
-    for _, block_row in blocks_df.iterrows():
-        block_id = block_row['block_id']
-        block_type = block_row['block_type']
-        
-        block_breakdown[block_id] = {
-            'type': block_type,
-            'start_time': f"{block_row['date']} {block_row['start']}:00",
-            'end_time': f"{block_row['date']} {block_row['end']}:00",
-            'recruiters': [],
-            'regular_applicants': [],
-            'relaxed_applicants': [],
-            'individual_slots': {},
-            'groups': {}
-        }
+    Returns the per-block summary table together with the placement and
+    recruiter rows the text report lists under each block.
+    """
+    placements = applicant_placements(combined_schedule)
+    recruiter_schedule = recruiter_schedule.fillna('').astype(str)
+    return {
+        'blocks': block_summary(blocks_df, placements, recruiter_schedule),
+        'placements': placements,
+        'recruiters': recruiter_schedule
+    }
+
+def unit_rows(block_breakdown):
+    """One CSV row per individual slot or group, blocks without applicants keeping a single summary row."""
+    import pandas as pd
+    placements = block_breakdown['placements']
+    labels = placements['applicant_name'] + ' (' + placements['scheduling_mode'] + ')'
+    units = (placements.assign(label=labels)
+             .groupby(['block_id', 'kind', 'unit_id'], sort=False)['label']
+             .agg(applicants='; '.join, count='size').reset_index())
     
-    # Add recruiter information
-    for _, recruiter_row in recruiter_schedule.iterrows():
-        block_id = recruiter_row['block_id']
-        if block_id in block_breakdown:
-            block_breakdown[block_id]['recruiters'].append({
-                'id': recruiter_row['recruiter_id'],
-                'name': recruiter_row['recruiter_name'],
-                'team': recruiter_row['team'],
-                'room': recruiter_row['room_id']
-            })
+    slots = units[units['kind'] == 'individual'].rename(
+        columns={'unit_id': 'slot_id', 'applicants': 'slot_applicants', 'count': 'slot_count'})
+    groups = units[units['kind'] == 'group'].rename(
+        columns={'unit_id': 'group_id', 'applicants': 'group_applicants', 'count': 'group_count'})
     
-    # Process applicant assignments
-    for _, app_row in combined_schedule.iterrows():
-        app_id = app_row['applicant_id']
-        app_name = app_row['applicant_name']
-        teams = app_row['teams']
-        scheduling_mode = app_row['scheduling_mode']
-        
-        applicant_info = {
-            'id': app_id,
-            'name': app_name,
-            'teams': teams,
-            'mode': scheduling_mode
-        }
-        
-        # Individual slot assignment
-        if pd.notna(app_row['individual_block_id']) and app_row['individual_block_id'] != '':
-            ind_block_id = app_row['individual_block_id']
-            slot_id = app_row['individual_slot_id']
-            
-            if ind_block_id in block_breakdown:
-                if slot_id not in block_breakdown[ind_block_id]['individual_slots']:
-                    block_breakdown[ind_block_id]['individual_slots'][slot_id] = []
-                
-                block_breakdown[ind_block_id]['individual_slots'][slot_id].append(applicant_info)
-                
-                # Add to overall applicant list
-                if scheduling_mode == 'regular':
-                    block_breakdown[ind_block_id]['regular_applicants'].append(applicant_info)
-                else:
-                    block_breakdown[ind_block_id]['relaxed_applicants'].append(applicant_info)
-        
-        # Group assignment
-        if pd.notna(app_row['group_block_id']) and app_row['group_block_id'] != '':
-            group_block_id = app_row['group_block_id']
-            group_id = app_row['group_id']
-            
-            if group_block_id in block_breakdown:
-                if group_id not in block_breakdown[group_block_id]['groups']:
-                    block_breakdown[group_block_id]['groups'][group_id] = []
-                
-                block_breakdown[group_block_id]['groups'][group_id].append(applicant_info)
-                
-                # Add to overall applicant list if not already added from individual
-                found_in_regular = any(a['id'] == app_id for a in block_breakdown[group_block_id]['regular_applicants'])
-                found_in_relaxed = any(a['id'] == app_id for a in block_breakdown[group_block_id]['relaxed_applicants'])
-                
-                if not found_in_regular and not found_in_relaxed:
-                    if scheduling_mode == 'regular':
-                        block_breakdown[group_block_id]['regular_applicants'].append(applicant_info)
-                    else:
-                        block_breakdown[group_block_id]['relaxed_applicants'].append(applicant_info)
+    base = block_breakdown['blocks'][BASE_COLUMNS]
+    # Slots only belong to individual blocks and groups to group blocks
+    rows = pd.concat([
+        base[base['block_type'] == 'individual'].merge(slots.drop(columns='kind'), on='block_id', how='left'),
+        base[base['block_type'] != 'individual'].merge(groups.drop(columns='kind'), on='block_id', how='left')
+    ])
+    block_order = pd.Series(range(len(base)), index=base['block_id'])
+    rows = rows.iloc[block_order.loc[rows['block_id']].argsort(kind='stable')]
+    for column in ['slot_count', 'group_count']:
+        rows[column] = rows[column].astype('Int64')
+    return rows.reindex(columns=BASE_COLUMNS + UNIT_COLUMNS)
+
+def write_block_breakdown(block_breakdown, output_prefix='schedule_block_breakdown'):
+    """Write the text and CSV block breakdown reports."""
+    blocks = block_breakdown['blocks']
+    members_by_block = unit_members(block_breakdown['placements'])
+    recruiters_by_block = {block_id: rows for block_id, rows in block_breakdown['recruiters'].groupby('block_id', sort=False)}
+    no_rows = block_breakdown['placements'].iloc[0:0]
     
     # Write detailed breakdown to file
-    with open('schedule_block_breakdown.txt', 'w') as f:
+    with open(f'{output_prefix}.txt', 'w') as f:
         f.write("COMPREHENSIVE BLOCK BREAKDOWN - REGULAR AND RELAXED SCHEDULING\n")
         f.write("="*80 + "\n\n")
         f.write(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
         
         # Sort blocks by ID for consistent output
-        sorted_blocks = sorted(block_breakdown.items())
-        
-        for block_id, block_info in sorted_blocks:
-            f.write(f"BLOCK {block_id} ({block_info['type'].upper()})\n")
+        for block in blocks.sort_values('block_id').itertuples(index=False):
+            f.write(f"BLOCK {block.block_id} ({block.block_type.upper()})\n")
             f.write("-" * 50 + "\n")
-            f.write(f"Time: {block_info['start_time']} - {block_info['end_time']}\n")
+            f.write(f"Time: {block.start_time} - {block.end_time}\n")
             
             # Recruiters
-            f.write(f"\nRECRUITERS ({len(block_info['recruiters'])}):\n")
-            if block_info['recruiters']:
-                for recruiter in block_info['recruiters']:
-                    f.write(f"  • {recruiter['name']} ({recruiter['id']}) - {recruiter['team']} Team - Room {recruiter['room']}\n")
+            f.write(f"\nRECRUITERS ({block.recruiter_count}):\n")
+            if block.block_id in recruiters_by_block:
+                for recruiter in recruiters_by_block[block.block_id].itertuples(index=False):
+                    f.write(f"  • {recruiter.recruiter_name} ({recruiter.recruiter_id}) - {recruiter.team} Team - Room {recruiter.room_id}\n")
             else:
                 f.write("  No recruiters assigned\n")
             
             # Summary counts
-            regular_count = len(block_info['regular_applicants'])
-            relaxed_count = len(block_info['relaxed_applicants'])
-            total_count = regular_count + relaxed_count
-            
             f.write(f"\nAPPLICANT SUMMARY:\n")
-            f.write(f"  Regular scheduling: {regular_count} applicants\n")
-            f.write(f"  Relaxed scheduling: {relaxed_count} applicants\n")
-            f.write(f"  Total applicants: {total_count} applicants\n")
+            f.write(f"  Regular scheduling: {block.regular_count} applicants\n")
+            f.write(f"  Relaxed scheduling: {block.relaxed_count} applicants\n")
+            f.write(f"  Total applicants: {block.total_count} applicants\n")
             
-            # Individual slots breakdown
-            if block_info['type'] == 'individual' and block_info['individual_slots']:
-                f.write(f"\nINDIVIDUAL SLOTS:\n")
-                for slot_id in sorted(block_info['individual_slots'].keys()):
-                    slot_applicants = block_info['individual_slots'][slot_id]
-                    f.write(f"  {slot_id}:\n")
-                    for app in slot_applicants:
-                        mode_symbol = "✓" if app['mode'] == 'regular' else "⚠"
-                        f.write(f"    {mode_symbol} {app['name']} ({app['id']}) - Teams: {app['teams']}\n")
+            members = members_by_block.get(block.block_id, no_rows)
             
-            # Group breakdown
-            if block_info['type'] == 'group' and block_info['groups']:
-                f.write(f"\nGROUPS:\n")
-                for group_id in sorted(block_info['groups'].keys()):
-                    group_applicants = block_info['groups'][group_id]
-                    f.write(f"  {group_id}:\n")
-                    for app in group_applicants:
-                        mode_symbol = "✓" if app['mode'] == 'regular' else "⚠"
-                        f.write(f"    {mode_symbol} {app['name']} ({app['id']}) - Teams: {app['teams']}\n")
+            # Individual slots / groups breakdown
+            if len(members):
+                f.write("\nINDIVIDUAL SLOTS:\n" if block.block_type == 'individual' else "\nGROUPS:\n")
+                for unit_id, unit in members.groupby('unit_id', sort=False):
+                    f.write(f"  {unit_id}:\n")
+                    for app in unit.itertuples(index=False):
+                        mode_symbol = "✓" if app.scheduling_mode == 'regular' else "⚠"
+                        f.write(f"    {mode_symbol} {app.applicant_name} ({app.applicant_id}) - Teams: {app.teams}\n")
             
             # All applicants in block (sorted by scheduling mode)
+            in_block = members.drop_duplicates('applicant_id').sort_values('applicant_name', kind='stable')
             f.write(f"\nALL APPLICANTS IN BLOCK:\n")
-            f.write(f"  Regular Scheduling ({regular_count}):\n")
-            for app in sorted(block_info['regular_applicants'], key=lambda x: x['name']):
-                f.write(f"    ✓ {app['name']} ({app['id']}) - Teams: {app['teams']}\n")
-            
-            f.write(f"  Relaxed Scheduling ({relaxed_count}):\n")
-            for app in sorted(block_info['relaxed_applicants'], key=lambda x: x['name']):
-                f.write(f"    ⚠ {app['name']} ({app['id']}) - Teams: {app['teams']}\n")
+            for mode, label, symbol, count in [('regular', 'Regular', '✓', block.regular_count),
+                                               ('relaxed', 'Relaxed', '⚠', block.relaxed_count)]:
+                f.write(f"  {label} Scheduling ({count}):\n")
+                for app in in_block[in_block['scheduling_mode'] == mode].itertuples(index=False):
+                    f.write(f"    {symbol} {app.applicant_name} ({app.applicant_id}) - Teams: {app.teams}\n")
             
             f.write("\n" + "="*80 + "\n\n")
         
@@ -169,12 +106,14 @@ def create_block_breakdown():
         f.write("OVERALL STATISTICS\n")
         f.write("="*50 + "\n")
         
-        total_regular = sum(len(block['regular_applicants']) for block in block_breakdown.values())
-        total_relaxed = sum(len(block['relaxed_applicants']) for block in block_breakdown.values())
+        total_regular = int(blocks['regular_count'].sum())
+        total_relaxed = int(blocks['relaxed_count'].sum())
+        individual_blocks = int((blocks['block_type'] == 'individual').sum())
+        group_blocks = len(blocks) - individual_blocks
         
-        f.write(f"Total blocks: {len(block_breakdown)}\n")
-        f.write(f"Individual blocks: {sum(1 for b in block_breakdown.values() if b['type'] == 'individual')}\n")
-        f.write(f"Group blocks: {sum(1 for b in block_breakdown.values() if b['type'] == 'group')}\n")
+        f.write(f"Total blocks: {len(blocks)}\n")
+        f.write(f"Individual blocks: {individual_blocks}\n")
+        f.write(f"Group blocks: {group_blocks}\n")
         f.write(f"Total regular assignments: {total_regular}\n")
         f.write(f"Total relaxed assignments: {total_relaxed}\n")
         f.write(f"Grand total assignments: {total_regular + total_relaxed}\n")
@@ -185,65 +124,51 @@ def create_block_breakdown():
         f.write(f"⚠ = Relaxed scheduling (with constraint violations)\n")
     
     # Create a CSV version for easier analysis
-    csv_rows = []
-    for block_id, block_info in block_breakdown.items():
-        base_row = {
-            'block_id': block_id,
-            'block_type': block_info['type'],
-            'start_time': block_info['start_time'],
-            'end_time': block_info['end_time'],
-            'recruiter_count': len(block_info['recruiters']),
-            'recruiters': '; '.join([f"{r['name']} ({r['team']})" for r in block_info['recruiters']]),
-            'regular_count': len(block_info['regular_applicants']),
-            'relaxed_count': len(block_info['relaxed_applicants']),
-            'total_count': len(block_info['regular_applicants']) + len(block_info['relaxed_applicants'])
-        }
-        
-        # Add individual slot details
-        if block_info['type'] == 'individual':
-            for slot_id, slot_apps in block_info['individual_slots'].items():
-                row = base_row.copy()
-                row.update({
-                    'slot_id': slot_id,
-                    'slot_applicants': '; '.join([f"{a['name']} ({a['mode']})" for a in slot_apps]),
-                    'slot_count': len(slot_apps)
-                })
-                csv_rows.append(row)
-        else:
-            # Group blocks
-            for group_id, group_apps in block_info['groups'].items():
-                row = base_row.copy()
-                row.update({
-                    'group_id': group_id,
-                    'group_applicants': '; '.join([f"{a['name']} ({a['mode']})" for a in group_apps]),
-                    'group_count': len(group_apps)
-                })
-                csv_rows.append(row)
-        
-        # Also add a summary row if no slots/groups were added
-        if not csv_rows or csv_rows[-1]['block_id'] != block_id:
-            csv_rows.append(base_row)
-    
-    # Write CSV
-    if csv_rows:
-        df = pd.DataFrame(csv_rows)
-        df.to_csv('schedule_block_breakdown.csv', index=False)
+    unit_rows(block_breakdown).to_csv(f'{output_prefix}.csv', index=False)
     
     print(f"\nBlock breakdown files created:")
-    print(f"  📄 schedule_block_breakdown.txt - Detailed text breakdown")
-    print(f"  📄 schedule_block_breakdown.csv - Structured data breakdown")
+    print(f"  📄 {output_prefix}.txt - Detailed text breakdown")
+    print(f"  📄 {output_prefix}.csv - Structured data breakdown")
     
     # Print summary
     print(f"\nBreakdown Summary:")
-    individual_blocks = sum(1 for b in block_breakdown.values() if b['type'] == 'individual')
-    group_blocks = sum(1 for b in block_breakdown.values() if b['type'] == 'group')
-    total_regular = sum(len(block['regular_applicants']) for block in block_breakdown.values())
-    total_relaxed = sum(len(block['relaxed_applicants']) for block in block_breakdown.values())
-    
-    print(f"  📊 {len(block_breakdown)} total blocks ({individual_blocks} individual, {group_blocks} group)")
+    print(f"  📊 {len(blocks)} total blocks ({individual_blocks} individual, {group_blocks} group)")
     print(f"  ✅ {total_regular} regular scheduling assignments")
     print(f"  ⚠️  {total_relaxed} relaxed scheduling assignments")
     print(f"  🎯 {total_regular + total_relaxed} total assignments")
 
+def create_block_breakdown(run_path=None):
+    """Create a comprehensive breakdown showing who is in each block for both regular and relaxed scheduling.
+    
+    With run_path, reads a pipeline run directory and writes into its summaries/;
+    otherwise uses the legacy files in the current directory.
+    """
+    
+    print("Loading scheduling data...")
+    
+    if run_path:
+        combined_schedule = read_table(os.path.join(run_path, 'schedules', 'final_combined.csv'))
+        recruiter_schedule = read_table(os.path.join(run_path, 'schedules', 'recruiters_schedule.csv'))
+        blocks_df = read_table(run_blocks_file(run_path))
+        output_prefix = os.path.join(run_path, 'summaries', 'block_breakdown')
+    else:
+        combined_schedule = read_table('schedule_final_combined.csv')
+        recruiter_schedule = read_table('schedule_recruiters.csv')
+        blocks_df = read_table('blocks.csv')
+        output_prefix = 'schedule_block_breakdown'
+    
+    print(f"Loaded {len(combined_schedule)} applicant assignments")
+    print(f"Loaded {len(recruiter_schedule)} recruiter assignments")
+    
+    block_breakdown = build_block_breakdown(combined_schedule, recruiter_schedule, blocks_df)
+    write_block_breakdown(block_breakdown, output_prefix)
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-block breakdown of regular and relaxed scheduling')
+    parser.add_argument('--from-run', default=None, help='Pipeline run directory (default: legacy files in the current directory)')
+    
+    args = parser.parse_args()
+    create_block_breakdown(args.from_run)
+
 if __name__ == "__main__":
-    create_block_breakdown()
+    main()
@@ -0,0 +1,159 @@
+import argparse
+import csv
+import datetime as dt
+import os
+from typing import List, Dict, Tuple
+from autoscheduler import load_applicants, load_recruiters, parse_ranges
+from feasibility import covers, block_staffed_masks, team_matches
+
+BLOCK_COLUMNS = ['block_id', 'date', 'start', 'end', 'block_type']
+
+# Day letters of the hand-written block ids (T11 = Thursday the 11th, U14 = Sunday the 14th)
+DAY_LETTERS = 'MTWTFSU'
+
+def merge_windows(windows: List[Tuple]) -> List[Tuple]:
+    """Sorted windows with overlapping and touching ones merged."""
+    merged = []
+    for start, end in sorted(windows):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+def candidate_blocks(event_windows: List[Tuple], block_type: str, minutes: int, step: int) -> List[Dict]:
+    """Every block of the given length that starts on the step grid inside an event window."""
+    length = dt.timedelta(minutes=minutes)
+    candidates = []
+    for window_start, window_end in merge_windows(event_windows):
+        start = window_start
+        while start + length <= window_end:
+            candidates.append({
+                'date': start.strftime('%Y-%m-%d'),
+                'start': start,
+                'end': start + length,
+                'type': block_type
+            })
+            start += dt.timedelta(minutes=step)
+    for i, block in enumerate(candidates):
+        block['block_id'] = f"candidate_{block_type}_{i}"
+    return candidates
+
+def block_demand(applicants: List[Dict], blocks: List[Dict], staffed_masks: Dict[str, int]) -> Dict[str, int]:
+    """Applicants who can attend each block and have a team staffing it."""
+    demand = {}
+    for block in blocks:
+        window = (block['start'], block['end'])
+        mask = staffed_masks[block['block_id']]
+        demand[block['block_id']] = sum(1 for applicant in applicants
+                                        if covers(applicant['parsed_availability'], window) and team_matches(applicant, mask))
+    return demand
+
+def day_prefix(day: dt.datetime, taken: set) -> str:
+    """Block id prefix of a day, like the hand-written files' 'T11' (weekday letter and day of month).
+    
+    'T' is both Tuesday and Thursday and the month is not part of it, so a day
+    whose short prefix is already taken by another day in the window gets the
+    month too ('T0911'), or the full date if even that is taken.
+    """
+    letter = DAY_LETTERS[day.weekday()]
+    for prefix in (f"{letter}{day.day}", f"{letter}{day.strftime('%m%d')}"):
+        if prefix not in taken:
+            return prefix
+    return f"{letter}{day.strftime('%Y%m%d')}"
+
+def generate_blocks(applicants: List[Dict], recruiters: List[Dict], event_windows: List[Tuple],
+                    individual_minutes: int = 20, group_minutes: int = 40, group_step: int = 20,
+                    min_demand: int = 1) -> Tuple[List[Dict], Dict[str, int]]:
+    """Blocks worth modeling inside the event windows.
+    
+    Individual blocks run back to back and group blocks start every group_step
+    minutes. A candidate is kept only if some recruiter is available for all
+    of it and at least min_demand applicants can attend it with one of their
+    teams staffing it; a day keeps its blocks only if it has both block types,
+    since applicants need an individual and a group interview on the same day.
+    Returns the blocks in load_blocks' CSV shape and the number of candidates
+    dropped for each reason.
+    """
+    candidates = (candidate_blocks(event_windows, 'individual', individual_minutes, individual_minutes)
+                  + candidate_blocks(event_windows, 'group', group_minutes, group_step))
+    staffed_masks = block_staffed_masks(recruiters, candidates)
+    demand = block_demand(applicants, candidates, staffed_masks)
+    
+    dropped = {'no_recruiter': 0, 'low_demand': 0, 'unpaired_day': 0}
+    kept = []
+    for block in candidates:
+        if not staffed_masks[block['block_id']]:
+            dropped['no_recruiter'] += 1
+        elif demand[block['block_id']] < min_demand:
+            dropped['low_demand'] += 1
+        else:
+            kept.append(block)
+    
+    types_by_date = {}
+    for block in kept:
+        types_by_date.setdefault(block['date'], set()).add(block['type'])
+    paired = [block for block in kept if len(types_by_date[block['date']]) == 2]
+    dropped['unpaired_day'] = len(kept) - len(paired)
+    
+    # Number blocks per day and type like the hand-written files
+    rows = []
+    counters = {}
+    day_prefixes = {}
+    for block in sorted(paired, key=lambda block: (block['date'], block['type'] == 'group', block['start'])):
+        key = (block['date'], block['type'])
+        counters[key] = counters.get(key, 0) + 1
+        if block['date'] not in day_prefixes:
+            day_prefixes[block['date']] = day_prefix(block['start'], set(day_prefixes.values()))
+        rows.append({
+            'block_id': f"{day_prefixes[block['date']]}_{block['type'][0].upper()}{counters[key]}",
+            'date': block['date'],
+            'start': block['start'].strftime('%H:%M'),
+            'end': block['end'].strftime('%H:%M'),
+            'block_type': block['type']
+        })
+    return rows, dropped
+
+def write_blocks(rows: List[Dict], path: str):
+    """Write blocks in the blocks.csv format."""
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=BLOCK_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate blocks.csv from event windows, recruiter availability and applicant demand')
+    parser.add_argument('--input-dir', default='.', help='Input directory containing CSV files')
+    parser.add_argument('--events', default=None,
+                        help='Event windows like "2025-09-11 17:00-21:00;2025-09-13 10:00-17:00" '
+                             '(default: the union of recruiter availability)')
+    parser.add_argument('--individual-minutes', type=int, default=20, help='Length of an individual block')
+    parser.add_argument('--group-minutes', type=int, default=40, help='Length of a group block')
+    parser.add_argument('--group-step', type=int, default=20, help='Minutes between the starts of consecutive group blocks')
+    parser.add_argument('--min-demand', type=int, default=1, help='Applicants that must be able to attend a block to keep it')
+    parser.add_argument('--output', default=None, help='Output CSV (default: <input-dir>/blocks_generated.csv)')
+    
+    args = parser.parse_args()
+    
+    print("Loading input files...")
+    applicants = load_applicants(os.path.join(args.input_dir, 'applicant_info.csv'))
+    recruiters = load_recruiters(os.path.join(args.input_dir, 'recruiters.csv'))
+    if args.events:
+        event_windows = parse_ranges(args.events)
+    else:
+        event_windows = [window for recruiter in recruiters for window in recruiter['parsed_availability']]
+    
+    rows, dropped = generate_blocks(applicants, recruiters, event_windows, args.individual_minutes,
+                                    args.group_minutes, args.group_step, args.min_demand)
+    
+    output = args.output or os.path.join(args.input_dir, 'blocks_generated.csv')
+    write_blocks(rows, output)
+    individual = sum(1 for row in rows if row['block_type'] == 'individual')
+    print(f"Generated {len(rows)} blocks ({individual} individual, {len(rows) - individual} group)")
+    for reason, count in dropped.items():
+        if count:
+            print(f"  - dropped {count} candidates: {reason}")
+    print(f"Blocks written to: {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import argparse
+import os
+import time
+from typing import List, Dict, Set, Tuple
+from feasibility import build_feasibility_index
+
+def _max_assignments(applicant_options: List[Set[Tuple]], capacities: Dict[Tuple, int]) -> int:
+    """Max-flow of source -> applicant (1) -> option -> sink (option capacity)."""
+    from ortools.graph.python import max_flow
+    option_nodes = {key: i for i, key in enumerate(capacities)}
+    source = len(applicant_options) + len(option_nodes)
+    sink = source + 1
+    offset = len(applicant_options)
+    
+    flow = max_flow.SimpleMaxFlow()
+    for a, options in enumerate(applicant_options):
+        if not options:
+            continue
+        flow.add_arc_with_capacity(source, a, 1)
+        for key in options:
+            flow.add_arc_with_capacity(a, offset + option_nodes[key], 1)
+    for key, node in option_nodes.items():
+        flow.add_arc_with_capacity(offset + node, sink, capacities[key])
+    
+    if flow.num_arcs() == 0:
+        return 0
+    status = flow.solve(source, sink)
+    if status != flow.OPTIMAL:
+        raise RuntimeError(f"Max-flow failed with status {status}")
+    return flow.optimal_flow()
+
+def capacity_bound(applicants: List[Dict], blocks: List[Dict], recruiters: List[Dict],
+                   group_capacity: int = 8) -> Dict[str, int]:
+    """Upper bound on complete (individual + group) assignments.
+    
+    Every complete applicant needs an individual slot (capacity 1) and a seat
+    in a group block (group_capacity per parallel group) from a non-overlapping
+    same-day pair, so neither max-flow can be exceeded by any schedule the
+    strict model accepts.
+    """
+    feasibility_index = build_feasibility_index(applicants, blocks, recruiters)
+    
+    slot_capacities = {}
+    group_capacities = {}
+    for block in blocks:
+        if block['type'] == 'individual':
+            for slot in block['slots']:
+                slot_capacities[(block['block_id'], slot['slot_id'])] = 1
+        else:  # group: seats of all its parallel groups
+            group_capacities[block['block_id']] = len(block['groups']) * group_capacity
+    
+    applicant_slots = [feasibility_index[a['id']]['pair_slots'] & slot_capacities.keys() for a in applicants]
+    applicant_groups = [{block_id for block_id, _ in feasibility_index[a['id']]['pair_groups']} & group_capacities.keys()
+                        for a in applicants]
+    
+    individual_flow = _max_assignments(applicant_slots, slot_capacities)
+    group_flow = _max_assignments(applicant_groups, group_capacities)
+    
+    return {
+        'applicants': len(applicants),
+        'pairable': sum(1 for slots in applicant_slots if slots),
+        'individual_flow': individual_flow,
+        'group_flow': group_flow,
+        'bound': min(individual_flow, group_flow)
+    }
+
+def main():
+    # Imported here because autoscheduler imports this module
+    from autoscheduler import load_applicants, load_recruiters, load_blocks, load_rooms
+    
+    parser = argparse.ArgumentParser(description='Check how many applicants an intake can fit before solving')
+    parser.add_argument('--input-dir', default='.', help='Input directory containing CSV files')
+    parser.add_argument('--blocks-file', default='blocks.csv', help='Blocks CSV inside the input directory')
+    parser.add_argument('--group-capacity', type=int, default=8, help='Applicants per group')
+    
+    args = parser.parse_args()
+    
+    print("Loading input files...")
+    applicants = load_applicants(os.path.join(args.input_dir, 'applicant_info.csv'))
+    recruiters = load_recruiters(os.path.join(args.input_dir, 'recruiters.csv'))
+    rooms = load_rooms(os.path.join(args.input_dir, 'rooms.csv'))
+    blocks = load_blocks(os.path.join(args.input_dir, args.blocks_file), rooms, recruiters)
+    
+    start = time.time()
+    bound = capacity_bound(applicants, blocks, recruiters, args.group_capacity)
+    elapsed = time.time() - start
+    
+    print(f"\nCapacity bound ({elapsed:.3f}s):")
+    print(f"  Applicants: {bound['applicants']}")
+    print(f"  With an available slot+group pair: {bound['pairable']}")
+    print(f"  Max individual slots fillable: {bound['individual_flow']}")
+    print(f"  Max group seats fillable: {bound['group_flow']}")
+    print(f"  At most {bound['bound']} complete assignments")
+    
+    if bound['bound'] >= bound['applicants']:
+        print("✅ Capacity does not rule out scheduling every applicant")
+    else:
+        print(f"⚠️  At least {bound['applicants'] - bound['bound']} applicants cannot be fully scheduled")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import argparse
+import importlib
+import sys
+
+# Subcommand -> (script module, help). A script is imported only when its command runs,
+# so `cli.py --help` and the csv-only report start without pandas or OR-Tools.
+COMMANDS = {
+    'solve': ('autoscheduler', 'Schedule applicants and recruiters (Round 1 and Round 2)'),
+    'pipeline': ('pipeline', 'Run strict -> relaxed -> combine -> breakdown in one process'),
+    'relaxed': ('relaxed_scheduler', 'Place unscheduled applicants with relaxed constraints'),
+    'portfolio': ('portfolio', 'Race several Round 1 strategies and keep the best schedule'),
+    'lns': ('lns', 'Improve a Round 1 schedule with Large Neighborhood Search'),
+    'repair': ('repair', 'Repair a prior run after recruiter or applicant changes'),
+    'sweep': ('sweep', 'Compare Round 1 scheduling policies over a parameter grid'),
+    'whatif': ('whatif_server', 'Serve what-if queries against a schedule kept in memory'),
+    'capacity': ('capacity', 'Check how many applicants an intake can fit before solving'),
+    'explain': ('explain', 'Explain why applicants in a run were left unscheduled'),
+    'blocks': ('block_generator', 'Generate blocks.csv from event windows, availability and demand'),
+    'rooms': ('room_allocation', 'Reassign rooms for the recruiter schedule of an existing run'),
+    'replay': ('replay', 'Re-solve an exported CP-SAT model and report the timing distribution'),
+    'history': ('run_history', 'Record and query runs in the SQLite history store'),
+    'report': ('quick_report', 'Quick summary of a run directory (csv only, no pandas)'),
+    'analyze': ('analyze_run', 'Detailed block breakdown of a scheduling run'),
+    'breakdown': ('block_breakdown', 'Per-block breakdown of regular and relaxed scheduling'),
+    'day-breakdown': ('simple_block_breakdown', 'Day-by-day breakdown of who is in each block'),
+    'combine': ('combine_schedules', 'Combine legacy regular and relaxed schedule files')
+}
+
+def main(argv: list = None):
+    argv = sys.argv[1:] if argv is None else argv
+    commands = '\n'.join(f"  {name:<15} {help_text}" for name, (_, help_text) in COMMANDS.items())
+    parser = argparse.ArgumentParser(prog='cli.py', description='Interview scheduling tools',
+                                     epilog=f"commands:\n{commands}\n\nRun 'cli.py <command> --help' for a command's options.",
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=COMMANDS, metavar='command', help='One of the commands below')
+    parser.add_argument('args', nargs=argparse.REMAINDER, help='Arguments passed on to the command')
+    
+    args = parser.parse_args(argv)
+    module, _ = COMMANDS[args.command]
+    # The script's main() parses sys.argv itself and reports usage as 'cli.py <command>'
+    sys.argv = [f"{parser.prog} {args.command}"] + args.args
+    importlib.import_module(module).main()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+from __future__ import annotations
+import importlib.util
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pandas and pyarrow are imported by the functions that use them
+    import pandas as pd
+
+# Arrow IPC (Feather v2) file written next to a CSV, uncompressed so it can be memory-mapped
+ARTIFACT_SUFFIX = '.arrow'
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Columns stored as timestamps when every non-blank value is a full timestamp
+# (blocks.csv has 'start'/'end' as HH:MM, which stay text)
+TIMESTAMP_COLUMNS = ['individual_start', 'individual_end', 'group_slot1_start', 'group_slot1_end',
+                     'group_slot2_start', 'group_slot2_end', 'start', 'end']
+
+# Low-cardinality id and label columns stored dictionary-encoded
+DICTIONARY_COLUMNS = ['applicant_id', 'recruiter_id', 'block_id', 'individual_block_id', 'individual_slot_id',
+                      'group_block_id', 'group_id', 'room_id', 'team', 'teams', 'block_type', 'date',
+                      'scheduling_mode', 'reason']
+
+def available() -> bool:
+    """Whether pyarrow is installed, so columnar artifacts can be written and read."""
+    # optional: runs keep their CSVs, analysis reads those instead
+    return importlib.util.find_spec('pyarrow') is not None
+
+def artifact_path(csv_path) -> Path:
+    """Columnar artifact belonging to a CSV."""
+    return Path(csv_path).with_suffix(ARTIFACT_SUFFIX)
+
+def write_artifact(csv_path) -> Path:
+    """Write the columnar copy of a schedule or blocks CSV; returns its path, or None without pyarrow."""
+    if not available():
+        return None
+    import pandas as pd
+    import pyarrow as pa
+    from pyarrow import feather
+    df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+    for column in TIMESTAMP_COLUMNS:
+        if column not in df.columns:
+            continue
+        parsed = pd.to_datetime(df[column].where(df[column] != ''), format=TIMESTAMP_FORMAT, errors='coerce')
+        if parsed.isna().sum() == (df[column] == '').sum():
+            df[column] = parsed
+    
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for column in DICTIONARY_COLUMNS:
+        if column in table.column_names:
+            i = table.column_names.index(column)
+            table = table.set_column(i, column, table.column(i).dictionary_encode())
+    
+    path = artifact_path(csv_path)
+    feather.write_feather(table, path, compression='uncompressed')
+    return path
+
+def read_artifact(csv_path) -> pd.DataFrame:
+    """Memory-mapped read of a CSV's columnar artifact, or None if there is no current one.
+    
+    An artifact older than its CSV (e.g. after room_allocation rewrote the
+    CSV without pyarrow) is ignored. Timestamps stay typed; dictionary columns
+    come back as plain strings, like read_table gives for the CSV.
+    """
+    path = artifact_path(csv_path)
+    if not available() or not path.exists():
+        return None
+    if os.path.exists(csv_path) and os.path.getmtime(csv_path) > os.path.getmtime(path):
+        return None
+    import pyarrow as pa
+    from pyarrow import feather
+    table = feather.read_table(path, memory_map=True)
+    columns = [column.cast(column.type.value_type) if pa.types.is_dictionary(column.type) else column
+               for column in table.columns]
+    return pa.Table.from_arrays(columns, names=table.column_names).to_pandas()
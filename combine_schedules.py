@@ -1,56 +1,44 @@
-import pandas as pd
 import argparse
 import os
+from columnar import write_artifact
+from run_analysis import read_table
 
-def combine_schedules():
-    """Combine regular and relaxed scheduling results into final comprehensive schedule."""
-    
-    # Load regular scheduling results
-    print("Loading regular scheduling results...")
-    regular_applicants = pd.read_csv('schedule_applicants.csv')
-    print(f"Regular schedule: {len(regular_applicants)} applicants")
-    
-    # Load relaxed scheduling results
-    print("Loading relaxed scheduling results...")
-    relaxed_applicants = pd.read_csv('relaxed_schedule_new_applicants.csv')
-    print(f"Relaxed schedule: {len(relaxed_applicants)} applicants")
+def read_relaxed_violations(path):
+    """Read violation lines from a relaxed *_violations.txt report."""
+    relaxed_violations = []
+    with open(path, 'r') as f:
+        content = f.read()
+        # Skip the header lines
+        lines = content.strip().split('\n')
+        for line in lines:
+            if line.strip() and line.startswith('- '):
+                relaxed_violations.append(line[2:])  # Remove "- " prefix
+    return relaxed_violations
+
+def combine_applicant_frames(regular_applicants, relaxed_applicants):
+    """Stack regular and relaxed applicant schedules, tagging each row with its scheduling mode."""
+    import pandas as pd
+    regular_applicants = regular_applicants.assign(scheduling_mode='regular')
+    relaxed_applicants = relaxed_applicants.assign(scheduling_mode='relaxed')
     
     # Combine the two schedules
     combined_applicants = pd.concat([regular_applicants, relaxed_applicants], ignore_index=True)
     
     # Sort by applicant_id for easier reading
-    combined_applicants = combined_applicants.sort_values('applicant_id')
-    
-    # Add a column to indicate scheduling mode
-    combined_applicants['scheduling_mode'] = ['regular'] * len(regular_applicants) + ['relaxed'] * len(relaxed_applicants)
+    return combined_applicants.sort_values('applicant_id', kind='stable')
+
+def write_combined_outputs(combined_applicants, regular_violations, relaxed_violations,
+                           total_applicants=154, output_prefix='schedule_final'):
+    """Write the combined schedule, violations report and summary statistics."""
+    import pandas as pd
     
     # Save combined schedule
-    combined_applicants.to_csv('schedule_final_combined.csv', index=False)
+    combined_applicants.to_csv(f'{output_prefix}_combined.csv', index=False)
+    write_artifact(f'{output_prefix}_combined.csv')
     print(f"Combined schedule saved: {len(combined_applicants)} total applicants")
     
-    # Load constraint violations
-    print("\nProcessing constraint violations...")
-    
-    # Regular violations (if any)
-    regular_violations = []
-    if os.path.exists('schedule_violations.txt'):
-        with open('schedule_violations.txt', 'r') as f:
-            content = f.read()
-            if content.strip():
-                regular_violations = content.strip().split('\n')
-    
-    # Relaxed violations
-    relaxed_violations = []
-    with open('relaxed_schedule_new_violations.txt', 'r') as f:
-        content = f.read()
-        # Skip the header lines
-        lines = content.strip().split('\n')
-        for line in lines:
-            if line.strip() and line.startswith('- '):
-                relaxed_violations.append(line[2:])  # Remove "- " prefix
-    
     # Write combined violations report
-    with open('schedule_final_violations.txt', 'w') as f:
+    with open(f'{output_prefix}_violations.txt', 'w') as f:
         f.write("COMPREHENSIVE SCHEDULING VIOLATIONS REPORT\n")
         f.write("="*50 + "\n\n")
         
@@ -73,17 +61,16 @@ def combine_schedules():
     print("\nGenerating summary statistics...")
     
     # Count applicants by scheduling mode
-    regular_count = len(regular_applicants)
-    relaxed_count = len(relaxed_applicants)
+    regular_count = int((combined_applicants['scheduling_mode'] == 'regular').sum())
+    relaxed_count = int((combined_applicants['scheduling_mode'] == 'relaxed').sum())
     total_count = regular_count + relaxed_count
     
-    # Count individual vs group assignments
-    individual_assignments = len(combined_applicants[combined_applicants['individual_slot_id'] != ''])
-    group_assignments = len(combined_applicants[combined_applicants['group_id'] != ''])
-    both_assignments = len(combined_applicants[
-        (combined_applicants['individual_slot_id'] != '') & 
-        (combined_applicants['group_id'] != '')
-    ])
+    # Count individual vs group assignments (blank cells may be '' or NaN depending on the source)
+    has_individual = combined_applicants['individual_slot_id'].fillna('').astype(str) != ''
+    has_group = combined_applicants['group_id'].fillna('').astype(str) != ''
+    individual_assignments = int(has_individual.sum())
+    group_assignments = int(has_group.sum())
+    both_assignments = int((has_individual & has_group).sum())
     
     # Team distribution
     team_stats = {}
@@ -96,15 +83,16 @@ def combine_schedules():
             team_stats[team] += 1
     
     # Write summary report
-    with open('schedule_final_summary.txt', 'w') as f:
+    with open(f'{output_prefix}_summary.txt', 'w') as f:
         f.write("COMPREHENSIVE SCHEDULING SUMMARY\n")
         f.write("="*50 + "\n\n")
         
         f.write("OVERALL STATISTICS:\n")
         f.write(f"  Total applicants scheduled: {total_count}\n")
-        f.write(f"  Regular scheduling: {regular_count} ({regular_count/total_count*100:.1f}%)\n")
-        f.write(f"  Relaxed scheduling: {relaxed_count} ({relaxed_count/total_count*100:.1f}%)\n")
-        f.write(f"  Overall success rate: {total_count}/154 ({total_count/154*100:.1f}%)\n\n")
+        if total_count:
+            f.write(f"  Regular scheduling: {regular_count} ({regular_count/total_count*100:.1f}%)\n")
+            f.write(f"  Relaxed scheduling: {relaxed_count} ({relaxed_count/total_count*100:.1f}%)\n")
+        f.write(f"  Overall success rate: {total_count}/{total_applicants} ({total_count/total_applicants*100:.1f}%)\n\n")
         
         f.write("INTERVIEW TYPE DISTRIBUTION:\n")
         f.write(f"  Individual interviews: {individual_assignments}\n")
@@ -125,18 +113,53 @@ def combine_schedules():
             f.write(f"were deliberately relaxed to accommodate more applicants.\n")
     
     print(f"\nFinal Results Summary:")
-    print(f"  📊 Total scheduled: {total_count}/154 ({total_count/154*100:.1f}%)")
+    print(f"  📊 Total scheduled: {total_count}/{total_applicants} ({total_count/total_applicants*100:.1f}%)")
     print(f"  ✅ Regular: {regular_count} applicants")
     print(f"  🔄 Relaxed: {relaxed_count} applicants")
     print(f"  ⚠️  Total violations: {len(regular_violations) + len(relaxed_violations)}")
     
     print(f"\nOutput files generated:")
-    print(f"  📄 schedule_final_combined.csv - All applicant assignments")
-    print(f"  📄 schedule_final_violations.txt - Comprehensive violation report")
-    print(f"  📄 schedule_final_summary.txt - Summary statistics")
+    print(f"  📄 {output_prefix}_combined.csv - All applicant assignments")
+    print(f"  📄 {output_prefix}_violations.txt - Comprehensive violation report")
+    print(f"  📄 {output_prefix}_summary.txt - Summary statistics")
 
-if __name__ == "__main__":
+def combine_schedules(total_applicants=154):
+    """Combine regular and relaxed scheduling results into final comprehensive schedule."""
+    
+    # Load regular scheduling results
+    print("Loading regular scheduling results...")
+    regular_applicants = read_table('schedule_applicants.csv')
+    print(f"Regular schedule: {len(regular_applicants)} applicants")
+    
+    # Load relaxed scheduling results
+    print("Loading relaxed scheduling results...")
+    relaxed_applicants = read_table('relaxed_schedule_new_applicants.csv')
+    print(f"Relaxed schedule: {len(relaxed_applicants)} applicants")
+    
+    combined_applicants = combine_applicant_frames(regular_applicants, relaxed_applicants)
+    
+    # Load constraint violations
+    print("\nProcessing constraint violations...")
+    
+    # Regular violations (if any)
+    regular_violations = []
+    if os.path.exists('schedule_violations.txt'):
+        with open('schedule_violations.txt', 'r') as f:
+            content = f.read()
+            if content.strip():
+                regular_violations = content.strip().split('\n')
+    
+    # Relaxed violations
+    relaxed_violations = read_relaxed_violations('relaxed_schedule_new_violations.txt')
+    
+    write_combined_outputs(combined_applicants, regular_violations, relaxed_violations, total_applicants)
+
+def main():
     parser = argparse.ArgumentParser(description='Combine regular and relaxed scheduling results')
-    args = parser.parse_args()
+    parser.add_argument('--total-applicants', type=int, default=154, help='Applicant count used for the success rate')
     
-    combine_schedules()
+    args = parser.parse_args()
+    combine_schedules(args.total_applicants)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+from ortools.sat.python import cp_model
+import csv
+import os
+import argparse
+import time
+from typing import List, Dict, Tuple
+from autoscheduler import load_applicants, load_recruiters, load_blocks, load_rooms
+from feasibility import (
+    applicant_feasibility, build_block_index, screening_reason, group_windows, windows_overlap,
+    REASON_NO_OVERLAP, REASON_NO_TEAM
+)
+
+# Constraint families that get one assumption literal per applicant
+FAMILIES = ['availability', 'team', 'capacity']
+
+# Reason codes beyond the screening ones
+REASON_CAPACITY = 'capacity_exhausted'
+REASON_SCHEDULABLE = 'schedulable'
+
+def schedule_usage(schedule_rows) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """Count applicants already placed in each individual slot and group."""
+    slot_usage = {}
+    group_usage = {}
+    for row in schedule_rows:
+        if row.get('individual_slot_id'):
+            slot_usage[row['individual_slot_id']] = slot_usage.get(row['individual_slot_id'], 0) + 1
+        if row.get('group_id'):
+            group_usage[row['group_id']] = group_usage.get(row['group_id'], 0) + 1
+    return slot_usage, group_usage
+
+def build_explain_model(applicant: Dict, blocks: List[Dict], feasibility: Dict,
+                        slot_usage: Dict[str, int], group_usage: Dict[str, int], group_capacity: int = 8):
+    """Build the strict model for one applicant with one assumption literal per constraint family.
+    
+    Placements of already scheduled applicants are held fixed through slot and
+    group usage, so unscheduled applicants do not interact and each one gets
+    its own small model instead of a slice of a cohort-sized one.
+    """
+    model = cp_model.CpModel()
+    available_slots = set(feasibility['slots'])
+    available_groups = set(feasibility['groups'])
+    
+    literals = {'require': model.NewBoolVar('require')}
+    for family in FAMILIES:
+        literals[family] = model.NewBoolVar(family)
+    
+    applicant_slot = {}
+    applicant_group = {}
+    for block in blocks:
+        if block['type'] == 'individual':
+            for slot in block['slots']:
+                applicant_slot[(block['block_id'], slot['slot_id'])] = (model.NewBoolVar(f'slot_{slot["slot_id"]}'), block, slot)
+        else:  # group
+            for group in block['groups']:
+                applicant_group[(block['block_id'], group['group_id'])] = (model.NewBoolVar(f'group_{group["group_id"]}'), block, group)
+    
+    # Structure of the strict model: at most one of each, same day, no overlap
+    model.AddAtMostOne(var for var, _, _ in applicant_slot.values())
+    model.AddAtMostOne(var for var, _, _ in applicant_group.values())
+    
+    dates = set(block['date'] for block in blocks)
+    for date in dates:
+        slots_this_date = [var for var, block, _ in applicant_slot.values() if block['date'] == date]
+        groups_this_date = [var for var, block, _ in applicant_group.values() if block['date'] == date]
+        if slots_this_date and groups_this_date:
+            model.Add(sum(slots_this_date) == sum(groups_this_date))
+    
+    for slot_var, slot_block, slot in applicant_slot.values():
+        for group_var, group_block, group in applicant_group.values():
+            if slot_block['date'] != group_block['date']:
+                continue
+            if any(windows_overlap((slot['start'], slot['end']), win) for win in group_windows(group)):
+                model.AddBoolOr([slot_var.Not(), group_var.Not()])
+    
+    # The applicant must get a complete assignment
+    model.Add(sum(var for var, _, _ in applicant_slot.values()) == 1).OnlyEnforceIf(literals['require'])
+    model.Add(sum(var for var, _, _ in applicant_group.values()) == 1).OnlyEnforceIf(literals['require'])
+    
+    # Family: availability
+    unavailable = [var for key, (var, _, _) in applicant_slot.items() if key not in available_slots]
+    unavailable += [var for key, (var, _, _) in applicant_group.items() if key not in available_groups]
+    if unavailable:
+        model.AddBoolAnd([var.Not() for var in unavailable]).OnlyEnforceIf(literals['availability'])
+    
+    # Family: team-matched recruiter available for the block
+    unmatched = [var for key, (var, _, _) in applicant_slot.items() if key in available_slots and key not in feasibility['team_slots']]
+    unmatched += [var for key, (var, _, _) in applicant_group.items() if key in available_groups and key not in feasibility['team_groups']]
+    if unmatched:
+        model.AddBoolAnd([var.Not() for var in unmatched]).OnlyEnforceIf(literals['team'])
+    
+    # Family: capacity left over by the committed schedule
+    full = [var for (_, slot_id), (var, _, _) in applicant_slot.items() if slot_usage.get(slot_id, 0) >= 1]
+    full += [var for (_, group_id), (var, _, _) in applicant_group.items() if group_usage.get(group_id, 0) >= group_capacity]
+    if full:
+        model.AddBoolAnd([var.Not() for var in full]).OnlyEnforceIf(literals['capacity'])
+    
+    return model, literals
+
+def solve_with_assumptions(model, assumptions, time_limit: float):
+    """Solve under the given assumptions, returning the status and the indices of a failing subset."""
+    model.ClearAssumptions()
+    model.AddAssumptions(assumptions)
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = time_limit
+    solver.parameters.num_workers = 1
+    status = solver.Solve(model)
+    core = []
+    if status == cp_model.INFEASIBLE:
+        core = set(solver.SufficientAssumptionsForInfeasibility())
+    return status, core
+
+def minimal_core(model, literals: Dict, time_limit: float) -> List[str]:
+    """Shrink the solver's infeasible subset to a minimal set of constraint families."""
+    require = literals['require']
+    status, core = solve_with_assumptions(model, [require] + [literals[f] for f in FAMILIES], time_limit)
+    if status != cp_model.INFEASIBLE:
+        return []
+    
+    families = [f for f in FAMILIES if literals[f].Index() in core]
+    # Deletion pass: drop any family the conflict does not actually need
+    for family in list(families):
+        trial = [f for f in families if f != family]
+        status, _ = solve_with_assumptions(model, [require] + [literals[f] for f in trial], time_limit)
+        if status == cp_model.INFEASIBLE:
+            families = trial
+    return families
+
+def reason_from_families(families: List[str]) -> str:
+    """Map a minimal set of failing families to a reason code."""
+    if not families:
+        return REASON_SCHEDULABLE
+    if 'capacity' in families:
+        return REASON_CAPACITY
+    if 'team' in families:
+        return REASON_NO_TEAM
+    return REASON_NO_OVERLAP
+
+def explain_unscheduled(applicants: List[Dict], blocks: List[Dict], recruiters: List[Dict], schedule_rows,
+                        unscheduled_ids: List[str], group_capacity: int = 8, time_limit: float = 5.0) -> List[Dict]:
+    """Return a minimal reason for every unscheduled applicant."""
+    unscheduled_ids = set(unscheduled_ids)
+    unscheduled_applicants = [a for a in applicants if a['id'] in unscheduled_ids]
+    slot_usage, group_usage = schedule_usage(schedule_rows)
+    block_index = build_block_index(blocks, recruiters)
+    
+    explanations = []
+    needs_solver = []
+    feasibility_index = {}
+    for applicant in unscheduled_applicants:
+        feasibility = applicant_feasibility(applicant, block_index)
+        feasibility_index[applicant['id']] = feasibility
+        # Cheap pre-checks answer the trivial cases without a solver
+        reason = screening_reason(applicant, feasibility)
+        if reason:
+            explanations.append({'applicant_id': applicant['id'], 'reason': reason, 'families': '', 'method': 'precheck'})
+        else:
+            needs_solver.append(applicant)
+    
+    print(f"Pre-checks explained {len(explanations)} applicants, {len(needs_solver)} need the solver")
+    
+    for applicant in needs_solver:
+        model, literals = build_explain_model(applicant, blocks, feasibility_index[applicant['id']],
+                                              slot_usage, group_usage, group_capacity)
+        families = minimal_core(model, literals, time_limit)
+        explanations.append({
+            'applicant_id': applicant['id'],
+            'reason': reason_from_families(families),
+            'families': '+'.join(families),
+            'method': 'assumptions'
+        })
+    
+    return explanations
+
+def write_reasons(explanations: List[Dict], path: str):
+    """Write unscheduled applicant reasons to CSV."""
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['applicant_id', 'reason', 'families', 'method'])
+        writer.writeheader()
+        writer.writerows(explanations)
+
+def main():
+    parser = argparse.ArgumentParser(description='Explain why applicants in a run were left unscheduled')
+    parser.add_argument('--input-dir', default='.', help='Input directory containing CSV files')
+    parser.add_argument('--from-run', required=True, help='Run directory with schedules/ from autoscheduler.py')
+    parser.add_argument('--output', default=None, help='Output CSV (default: <run>/summaries/unscheduled_reasons.csv)')
+    parser.add_argument('--time-limit', type=float, default=5.0, help='Solver time limit per solve in seconds')
+    
+    args = parser.parse_args()
+    
+    print("Loading input files...")
+    applicants = load_applicants(os.path.join(args.input_dir, 'applicant_info.csv'))
+    recruiters = load_recruiters(os.path.join(args.input_dir, 'recruiters.csv'))
+    rooms = load_rooms(os.path.join(args.input_dir, 'rooms.csv'))
+    blocks = load_blocks(os.path.join(args.input_dir, 'blocks.csv'), rooms, recruiters)
+    
+    schedules_dir = os.path.join(args.from_run, 'schedules')
+    with open(os.path.join(schedules_dir, 'applicants_schedule.csv'), newline='') as f:
+        schedule_rows = list(csv.DictReader(f))
+    with open(os.path.join(schedules_dir, 'unscheduled_applicants.csv'), newline='') as f:
+        unscheduled_ids = [row['applicant_id'] for row in csv.DictReader(f)]
+    
+    print(f"Explaining {len(unscheduled_ids)} unscheduled applicants...")
+    start = time.time()
+    explanations = explain_unscheduled(applicants, blocks, recruiters, schedule_rows, unscheduled_ids,
+                                       time_limit=args.time_limit)
+    elapsed = time.time() - start
+    
+    output = args.output or os.path.join(args.from_run, 'summaries', 'unscheduled_reasons.csv')
+    write_reasons(explanations, output)
+    
+    reason_counts = {}
+    for explanation in explanations:
+        reason_counts[explanation['reason']] = reason_counts.get(explanation['reason'], 0) + 1
+    
+    print(f"\nExplained {len(explanations)} applicants in {elapsed:.2f}s:")
+    for reason, count in sorted(reason_counts.items()):
+        print(f"  - {reason}: {count}")
+    print(f"Reasons written to: {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+from __future__ import annotations
+import bisect
+import time
+from typing import List, Dict, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:  # numpy is imported by the function that uses it, so CLI startup stays fast
+    import numpy as np
+
+# Screening reason codes for applicants that cannot be fully scheduled
+REASON_NO_AVAILABILITY = 'no_availability'
+REASON_NO_OVERLAP = 'no_availability_overlap'
+REASON_NO_TEAM = 'no_team_recruiter'
+
+def covers(intervals, win) -> bool:
+    """Check if any availability interval contains the window."""
+    return any(a <= win[0] and win[1] <= b for a, b in intervals)
+
+def windows_overlap(win1, win2) -> bool:
+    """Check if two (start, end) windows overlap."""
+    return win1[0] < win2[1] and win1[1] > win2[0]
+
+def subtract_window(intervals, win) -> List[Tuple]:
+    """Availability intervals with the window cut out, splitting any interval it falls inside."""
+    remaining = []
+    for a, b in intervals:
+        if not windows_overlap((a, b), win):
+            remaining.append((a, b))
+            continue
+        if a < win[0]:
+            remaining.append((a, win[0]))
+        if win[1] < b:
+            remaining.append((win[1], b))
+    return remaining
+
+def group_windows(group) -> List[Tuple]:
+    """Both sessions of a group as (start, end) windows."""
+    return [(group['slot1']['start'], group['slot1']['end']), (group['slot2']['start'], group['slot2']['end'])]
+
+def block_staffed_masks(recruiters: List[Dict], blocks: List[Dict]) -> Dict[str, int]:
+    """Team bitmask (see autoscheduler.TEAM_BITS) of the recruiters available for the whole of each block."""
+    return {
+        block['block_id']: recruiters_mask(
+            recruiter for recruiter in recruiters if covers(recruiter['parsed_availability'], (block['start'], block['end'])))
+        for block in blocks
+    }
+
+def recruiters_mask(recruiters) -> int:
+    """Team bitmask of a set of recruiters."""
+    mask = 0
+    for recruiter in recruiters:
+        mask |= recruiter['team_mask']
+    return mask
+
+def team_matches(applicant: Dict, mask: int) -> bool:
+    """Applicants without team preferences can be seen by any team."""
+    return not applicant['team_mask'] or bool(applicant['team_mask'] & mask)
+
+def team_match_matrix(applicant_masks, block_masks) -> np.ndarray:
+    """Applicant x block team compatibility from team bitmasks, with one broadcast AND.
+    
+    Applicants without team preferences (mask 0) match every block.
+    """
+    import numpy as np
+    applicant_masks = np.asarray(applicant_masks, dtype=np.int64)
+    block_masks = np.asarray(block_masks, dtype=np.int64)
+    return ((applicant_masks[:, None] & block_masks[None, :]) != 0) | (applicant_masks == 0)[:, None]
+
+def build_block_index(blocks: List[Dict], recruiters: List[Dict]) -> Dict:
+    """Index individual slots and groups by date, sorted by start time.
+    
+    Entries are (start, end, key, block[, group]) with key = (block_id, slot_id/group_id),
+    so an availability interval only has to look at the entries of its own day.
+    """
+    slots_by_date = {}
+    groups_by_date = {}
+    for block in blocks:
+        if block['type'] == 'individual':
+            for slot in block['slots']:
+                slots_by_date.setdefault(block['date'], []).append(
+                    (slot['start'], slot['end'], (block['block_id'], slot['slot_id']), block))
+        else:  # group
+            for group in block['groups']:
+                groups_by_date.setdefault(block['date'], []).append(
+                    (group['slot1']['start'], group['slot1']['end'], (block['block_id'], group['group_id']), block, group))
+    
+    for entries in list(slots_by_date.values()) + list(groups_by_date.values()):
+        entries.sort(key=lambda entry: entry[0])
+    
+    return {
+        'slots_by_date': slots_by_date,
+        'slot_starts': {date: [entry[0] for entry in entries] for date, entries in slots_by_date.items()},
+        'groups_by_date': groups_by_date,
+        'group_starts': {date: [entry[0] for entry in entries] for date, entries in groups_by_date.items()},
+        'staffed_masks': block_staffed_masks(recruiters, blocks),
+        'patterns': {}  # (availability, teams) -> feasibility, filled by applicant_feasibility
+    }
+
+def _entries_within(entries, starts, interval):
+    """Entries of one day whose first window lies inside the interval."""
+    lo, hi = interval
+    i = bisect.bisect_left(starts, lo)
+    while i < len(entries) and entries[i][0] < hi:
+        if entries[i][1] <= hi:
+            yield entries[i]
+        i += 1
+
+def applicant_feasibility(applicant: Dict, block_index: Dict) -> Dict:
+    """Availability and team-coverage facts for one applicant.
+    
+    Slots and groups are keyed by (block_id, slot_id/group_id). 'dates' are the
+    days with a non-overlapping available slot+group pair, 'team_dates' the
+    days where that pair is also covered by a team-matched recruiter, and
+    'pair_slots'/'pair_groups' the slots and groups that belong to such a pair.
+    
+    Facts only depend on availability and teams, so they are computed once per
+    distinct pattern and shared (read-only) by applicants with the same one.
+    """
+    pattern = (tuple(applicant['parsed_availability']), applicant['team_mask'])
+    if pattern not in block_index['patterns']:
+        block_index['patterns'][pattern] = _pattern_feasibility(applicant, block_index)
+    return block_index['patterns'][pattern]
+
+def _pattern_feasibility(applicant: Dict, block_index: Dict) -> Dict:
+    """Feasibility facts of one availability and teams pattern (see applicant_feasibility)."""
+    staffed_masks = block_index['staffed_masks']
+    slots, groups = {}, {}
+    slots_by_date, groups_by_date = {}, {}
+    
+    for interval in applicant['parsed_availability']:
+        date = interval[0].date().isoformat()
+        
+        for start, end, key, block in _entries_within(block_index['slots_by_date'].get(date, []),
+                                                      block_index['slot_starts'].get(date, []), interval):
+            if key not in slots:
+                slots[key] = block
+                slots_by_date.setdefault(date, []).append(((start, end), key))
+        
+        for start, end, key, block, group in _entries_within(block_index['groups_by_date'].get(date, []),
+                                                             block_index['group_starts'].get(date, []), interval):
+            # The second session may fall in a different availability interval
+            windows = group_windows(group)
+            if key not in groups and covers(applicant['parsed_availability'], windows[1]):
+                groups[key] = block
+                groups_by_date.setdefault(date, []).append((windows, key))
+    
+    team_slots = {key for key, block in slots.items() if team_matches(applicant, staffed_masks.get(block['block_id'], 0))}
+    team_groups = {key for key, block in groups.items() if team_matches(applicant, staffed_masks.get(block['block_id'], 0))}
+    
+    # Days with at least one slot+group pair that do not overlap in time
+    dates, team_dates = set(), set()
+    pair_slots, pair_groups = set(), set()
+    for date, day_slots in slots_by_date.items():
+        for slot_win, slot_key in day_slots:
+            for windows, group_key in groups_by_date.get(date, []):
+                if any(windows_overlap(slot_win, win) for win in windows):
+                    continue
+                dates.add(date)
+                pair_slots.add(slot_key)
+                pair_groups.add(group_key)
+                if slot_key in team_slots and group_key in team_groups:
+                    team_dates.add(date)
+    
+    return {
+        'slots': list(slots),
+        'groups': list(groups),
+        'team_slots': team_slots,
+        'team_groups': team_groups,
+        'dates': dates,
+        'team_dates': team_dates,
+        'pair_slots': pair_slots,
+        'pair_groups': pair_groups
+    }
+
+def build_feasibility_index(applicants: List[Dict], blocks: List[Dict], recruiters: List[Dict]) -> Dict[str, Dict]:
+    """Per-applicant feasibility facts, keyed by applicant id."""
+    block_index = build_block_index(blocks, recruiters)
+    return {applicant['id']: applicant_feasibility(applicant, block_index) for applicant in applicants}
+
+def screening_reason(applicant: Dict, feasibility: Dict) -> str:
+    """Reason an applicant cannot get a complete assignment, or None if they might."""
+    if not applicant['parsed_availability']:
+        return REASON_NO_AVAILABILITY
+    if not feasibility['dates']:
+        return REASON_NO_OVERLAP
+    if not feasibility['team_dates']:
+        return REASON_NO_TEAM
+    return None
+
+def screen_applicants(applicants: List[Dict], blocks: List[Dict], recruiters: List[Dict]) -> Tuple[List[Dict], Dict[str, str]]:
+    """Split applicants into those worth modeling and hopeless ones with a reason code."""
+    start = time.time()
+    block_index = build_block_index(blocks, recruiters)
+    
+    viable = []
+    screened_out = {}
+    for applicant in applicants:
+        reason = screening_reason(applicant, applicant_feasibility(applicant, block_index))
+        if reason:
+            screened_out[applicant['id']] = reason
+        else:
+            viable.append(applicant)
+    
+    reason_counts = {}
+    for reason in screened_out.values():
+        reason_counts[reason] = reason_counts.get(reason, 0) + 1
+    counts = ', '.join(f"{count} {reason}" for reason, count in sorted(reason_counts.items()))
+    print(f"Screening: {len(viable)} viable, {len(screened_out)} screened out"
+          f"{f' ({counts})' if counts else ''} in {time.time() - start:.3f}s")
+    
+    return viable, screened_out
@@ -0,0 +1,290 @@
+import argparse
+import csv
+import datetime as dt
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict
+from autoscheduler import (
+    load_applicants, load_recruiters, load_blocks, load_rooms, load_applicant_assignments, parse_policy,
+    resolve_policy, greedy_applicants_first, round1_objective, objective_target, schedule_recruiters_to_match,
+    write_output_files, snapshot_inputs, REASON_SOLVER_UNSCHEDULED
+)
+from capacity import capacity_bound
+from feasibility import build_block_index, applicant_feasibility, screen_applicants
+from neighborhood import merge_neighborhood, solve_neighborhood
+from run_history import record_run
+
+NEIGHBORHOOD_KINDS = ['day', 'window', 'team', 'random']
+
+TRAJECTORY_COLUMNS = ['elapsed_seconds', 'iteration', 'neighborhood', 'size', 'objective', 'accepted']
+
+# Parsed inputs, set once per worker process by _init_worker
+_INPUTS = None
+
+def _init_worker(inputs: Dict):
+    """Keep the parent's inputs and feasibility index for every neighborhood this worker solves."""
+    global _INPUTS
+    _INPUTS = inputs
+
+def _solve_job(job: Dict, applicant_assignments: Dict, time_limit: float, solver_options: Dict) -> Dict:
+    """Re-solve one neighborhood against the schedule it was drawn from."""
+    applicants = [_INPUTS['applicants_by_id'][app_id] for app_id in job['applicant_ids']]
+    return solve_neighborhood(applicants, _INPUTS['blocks'], _INPUTS['feasibility'], applicant_assignments,
+                              _INPUTS['policy'], time_limit=time_limit, solver_options=solver_options,
+                              dates=job['dates'])
+
+def placement_date(assignment: Dict) -> str:
+    """Day an assignment is on, or None for an unscheduled applicant."""
+    start = assignment.get('individual_start') or assignment.get('group_slot1_start')
+    return start.date().isoformat() if start else None
+
+def placement_starts(assignment: Dict) -> List:
+    """Start times of the units an assignment holds."""
+    return [start for start in (assignment.get('individual_start'), assignment.get('group_slot1_start')) if start]
+
+class NeighborhoodPicker:
+    """Draws LNS neighborhoods over the viable applicants of a cohort.
+    
+    Day and window neighborhoods stay on one date, so neighborhoods on
+    different dates can be solved side by side; team and random ones can
+    move applicants anywhere and are solved on their own.
+    """
+    
+    def __init__(self, applicants: List[Dict], blocks: List[Dict], feasibility: Dict[str, Dict],
+                 window_minutes: int = 120, random_size: int = 30, seed: int = 0):
+        self.applicants = applicants
+        self.feasibility = feasibility
+        self.window_minutes = window_minutes
+        self.random_size = random_size
+        self.rng = random.Random(seed)
+        self.dates = sorted({block['date'] for block in blocks})
+        self.block_starts = {date: sorted({block['start'] for block in blocks if block['date'] == date}) for date in self.dates}
+        self.teams = sorted({team for applicant in applicants for team in applicant['teams']})
+        self.unit_start = {(block['block_id'], slot['slot_id']): slot['start']
+                           for block in blocks if block['type'] == 'individual' for slot in block['slots']}
+        self.unit_start.update({(block['block_id'], group['group_id']): group['slot1']['start']
+                                for block in blocks if block['type'] == 'group' for group in block['groups']})
+    
+    def unit_starts(self, app_id: str) -> List:
+        """Start times of the slots and groups of the pairs an applicant could take."""
+        keys = self.feasibility[app_id]['pair_slots'] | self.feasibility[app_id]['pair_groups']
+        return [self.unit_start[key] for key in keys if key in self.unit_start]
+    
+    def day(self, date: str, applicant_assignments: Dict) -> Dict:
+        """Everyone placed on the date plus the unscheduled applicants who could be."""
+        ids = [applicant['id'] for applicant in self.applicants
+               if placement_date(applicant_assignments.get(applicant['id'], {})) == date
+               or (applicant['id'] not in applicant_assignments and date in self.feasibility[applicant['id']]['dates'])]
+        return {'neighborhood': f'day:{date}', 'applicant_ids': ids, 'dates': {date}}
+    
+    def window(self, date: str, start, applicant_assignments: Dict) -> Dict:
+        """Applicants placed in, or unscheduled but available for, a time window of one day."""
+        end = start + dt.timedelta(minutes=self.window_minutes)
+        ids = []
+        for applicant in self.applicants:
+            app_id = applicant['id']
+            assignment = applicant_assignments.get(app_id)
+            if assignment is not None:
+                if placement_date(assignment) == date and any(start <= s < end for s in placement_starts(assignment)):
+                    ids.append(app_id)
+            elif date in self.feasibility[app_id]['dates'] and \
+                    any(start <= s < end for s in self.unit_starts(app_id)):
+                ids.append(app_id)
+        return {'neighborhood': f"window:{start.strftime('%Y-%m-%d %H:%M')}", 'applicant_ids': ids, 'dates': {date}}
+    
+    def team(self, team: str) -> Dict:
+        """Every applicant interested in a team, wherever they are placed."""
+        ids = [applicant['id'] for applicant in self.applicants if team in applicant['teams']]
+        return {'neighborhood': f'team:{team}', 'applicant_ids': ids, 'dates': None}
+    
+    def random_subset(self) -> Dict:
+        """A random sample of applicants."""
+        sample = self.rng.sample(self.applicants, min(self.random_size, len(self.applicants)))
+        return {'neighborhood': 'random', 'applicant_ids': [applicant['id'] for applicant in sample], 'dates': None}
+    
+    def batch(self, kind: str, applicant_assignments: Dict, workers: int) -> List[Dict]:
+        """Neighborhoods of one kind that can be solved at the same time without interacting.
+        
+        Day and window neighborhoods are drawn on up to `workers` distinct dates,
+        with an applicant who could go on several of them kept in the first only.
+        """
+        if kind == 'team':
+            return [self.team(self.rng.choice(self.teams))]
+        if kind == 'random':
+            return [self.random_subset()]
+        
+        jobs = []
+        taken = set()
+        for date in self.rng.sample(self.dates, min(workers, len(self.dates))):
+            if kind == 'day':
+                job = self.day(date, applicant_assignments)
+            else:
+                job = self.window(date, self.rng.choice(self.block_starts[date]), applicant_assignments)
+            job['applicant_ids'] = [app_id for app_id in job['applicant_ids'] if app_id not in taken]
+            taken.update(job['applicant_ids'])
+            if job['applicant_ids']:
+                jobs.append(job)
+        return jobs
+
+def lns_improve(applicants: List[Dict], blocks: List[Dict], recruiters: List[Dict], applicant_assignments: Dict,
+                policy: Dict = None, time_budget: float = 60.0, time_limit: float = 2.0, workers: int = None,
+                kinds: List[str] = None, target: int = None, seed: int = 0, **picker_options):
+    """Improve a feasible Round 1 schedule by repeatedly re-solving neighborhoods.
+    
+    Each iteration draws a batch of non-interacting neighborhoods, solves them
+    (in parallel when workers > 1) against the current schedule and keeps every
+    result that does not lower the objective. Stops at the time budget or once
+    the objective reaches target. Returns the schedule and the trajectory rows.
+    """
+    policy = resolve_policy(policy)
+    kinds = kinds or NEIGHBORHOOD_KINDS
+    workers = workers or os.cpu_count() or 1
+    block_index = build_block_index(blocks, recruiters)
+    feasibility = {applicant['id']: applicant_feasibility(applicant, block_index) for applicant in applicants}
+    picker = NeighborhoodPicker(applicants, blocks, feasibility, seed=seed, **picker_options)
+    
+    inputs = {
+        'applicants_by_id': {applicant['id']: applicant for applicant in applicants},
+        'blocks': blocks,
+        'feasibility': feasibility,
+        'policy': policy
+    }
+    # Split the cores between concurrent solves instead of oversubscribing them
+    solver_options = {'num_workers': max(1, (os.cpu_count() or 1) // workers)}
+    
+    start = time.time()
+    objective = round1_objective(applicant_assignments, policy)
+    trajectory = [{'elapsed_seconds': 0.0, 'iteration': 0, 'neighborhood': 'start', 'size': 0,
+                   'objective': objective, 'accepted': True}]
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(inputs,)) if workers > 1 else None
+    if pool is None:
+        _init_worker(inputs)
+    
+    iteration = 0
+    try:
+        while time.time() - start < time_budget and (target is None or objective < target):
+            iteration += 1
+            jobs = picker.batch(kinds[(iteration - 1) % len(kinds)], applicant_assignments, workers)
+            limit = min(time_limit, max(0.1, time_budget - (time.time() - start)))
+            if pool is not None:
+                futures = [pool.submit(_solve_job, job, applicant_assignments, limit, solver_options) for job in jobs]
+                results = [future.result() for future in futures]
+            else:
+                results = [_solve_job(job, applicant_assignments, limit, solver_options) for job in jobs]
+            
+            # Jobs of a batch never share applicants or days, so accepted results combine
+            base_objective = objective
+            for job, placements in zip(jobs, results):
+                accepted = False
+                if placements is not None:
+                    candidate = merge_neighborhood(applicant_assignments, set(job['applicant_ids']), placements)
+                    candidate_objective = round1_objective(candidate, policy)
+                    accepted = candidate_objective >= objective
+                    if accepted:
+                        applicant_assignments, objective = candidate, candidate_objective
+                trajectory.append({
+                    'elapsed_seconds': round(time.time() - start, 3),
+                    'iteration': iteration,
+                    'neighborhood': job['neighborhood'],
+                    'size': len(job['applicant_ids']),
+                    'objective': objective,
+                    'accepted': accepted
+                })
+            if objective > base_objective:
+                print(f"  [{time.time() - start:6.2f}s] iteration {iteration}: objective {objective}")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    
+    return applicant_assignments, trajectory
+
+def write_trajectory(trajectory: List[Dict], path):
+    """Write the objective-versus-time trajectory of an LNS run to CSV."""
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=TRAJECTORY_COLUMNS)
+        writer.writeheader()
+        writer.writerows(trajectory)
+
+def main():
+    parser = argparse.ArgumentParser(description='Improve a Round 1 schedule with Large Neighborhood Search')
+    parser.add_argument('--input-dir', default='.', help='Input directory containing CSV files')
+    parser.add_argument('--output-dir', default='results', help='Output directory for results')
+    parser.add_argument('--from-run', default=None, help='Start from the schedule of an existing run')
+    parser.add_argument('--start', choices=['greedy', 'empty'], default='greedy',
+                        help='Starting schedule when --from-run is not given')
+    parser.add_argument('--policy', default=None, help='Round 1 policy overrides as JSON or a JSON file (see DEFAULT_POLICY)')
+    parser.add_argument('--time-budget', type=float, default=60.0, help='Wall-clock seconds for the search')
+    parser.add_argument('--time-limit', type=float, default=2.0, help='Solver time limit per neighborhood in seconds')
+    parser.add_argument('--workers', type=int, default=None, help='Neighborhoods solved at once (default: one per core)')
+    parser.add_argument('--neighborhoods', default=','.join(NEIGHBORHOOD_KINDS),
+                        help=f'Comma-separated neighborhood kinds to cycle through ({", ".join(NEIGHBORHOOD_KINDS)})')
+    parser.add_argument('--window-minutes', type=int, default=120, help='Length of window neighborhoods')
+    parser.add_argument('--random-size', type=int, default=30, help='Applicants in a random neighborhood')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for drawing neighborhoods')
+    parser.add_argument('--history-db', default=None, help='Run history database (default: <output-dir>/run_history.sqlite)')
+    parser.add_argument('--no-history', action='store_true', help='Do not record the run in the history database')
+    
+    args = parser.parse_args()
+    policy = resolve_policy(parse_policy(args.policy))
+    kinds = [kind.strip() for kind in args.neighborhoods.split(',') if kind.strip()]
+    unknown = [kind for kind in kinds if kind not in NEIGHBORHOOD_KINDS]
+    if unknown:
+        parser.error(f"Unknown neighborhood kinds: {', '.join(unknown)}")
+    
+    print("Loading input files...")
+    applicants = load_applicants(os.path.join(args.input_dir, 'applicant_info.csv'))
+    recruiters = load_recruiters(os.path.join(args.input_dir, 'recruiters.csv'))
+    rooms = load_rooms(os.path.join(args.input_dir, 'rooms.csv'))
+    blocks = load_blocks(os.path.join(args.input_dir, 'blocks.csv'), rooms, recruiters)
+    
+    viable, unscheduled_reasons = screen_applicants(applicants, blocks, recruiters)
+    bound = capacity_bound(viable, blocks, recruiters, policy['group_capacity'])
+    target = objective_target(bound['bound'], policy)
+    
+    if args.from_run:
+        applicant_assignments = load_applicant_assignments(
+            os.path.join(args.from_run, 'schedules', 'applicants_schedule.csv'), applicants, blocks)
+    elif args.start == 'greedy':
+        applicant_assignments, _ = greedy_applicants_first(viable, blocks, recruiters, policy)
+    else:
+        applicant_assignments = {}
+    print(f"Starting schedule: {len(applicant_assignments)} assigned, objective {round1_objective(applicant_assignments, policy)}"
+          f"{f' (capacity bound allows {target})' if target is not None else ''}")
+    
+    print(f"\nRunning LNS for up to {args.time_budget:.0f}s...")
+    start = time.time()
+    applicant_assignments, trajectory = lns_improve(
+        viable, blocks, recruiters, applicant_assignments, policy, args.time_budget, args.time_limit,
+        args.workers, kinds, target, args.seed, window_minutes=args.window_minutes, random_size=args.random_size)
+    solve_seconds = time.time() - start
+    print(f"LNS finished after {trajectory[-1]['iteration']} iterations in {solve_seconds:.2f}s: "
+          f"objective {trajectory[0]['objective']} -> {trajectory[-1]['objective']}")
+    
+    unscheduled = [applicant['id'] for applicant in applicants if applicant['id'] not in applicant_assignments]
+    for app_id in unscheduled:
+        unscheduled_reasons.setdefault(app_id, REASON_SOLVER_UNSCHEDULED)
+    recruiter_assignments = schedule_recruiters_to_match(recruiters, applicant_assignments, blocks, rooms)
+    used_blocks = [block for block in blocks if block['block_id'] in recruiter_assignments]
+    
+    print("\nWriting output files...")
+    run_dir = write_output_files(recruiter_assignments, applicant_assignments, unscheduled, applicants, recruiters,
+                                 used_blocks, args.output_dir, unscheduled_reasons=unscheduled_reasons)
+    snapshot_inputs(run_dir, args.input_dir)
+    trajectory_file = os.path.join(run_dir, 'summaries', 'lns_trajectory.csv')
+    write_trajectory(trajectory, trajectory_file)
+    print(f"  - summaries/lns_trajectory.csv")
+    
+    if not args.no_history:
+        history_db = args.history_db or os.path.join(args.output_dir, 'run_history.sqlite')
+        record_run(history_db, run_dir, params={'command': 'lns', 'policy': policy, 'time_budget': args.time_budget,
+                                                'time_limit': args.time_limit, 'neighborhoods': kinds, 'seed': args.seed},
+                   metrics={'solve_seconds': round(solve_seconds, 3), 'objective': trajectory[-1]['objective']})
+        print(f"Run recorded in {history_db}")
+    
+    print(f"\nSuccess rate: {len(applicant_assignments)}/{len(applicants)} ({100*len(applicant_assignments)/len(applicants):.1f}%)")
+    print(f"Results saved to: {run_dir}")
+
+if __name__ == "__main__":
+    main()
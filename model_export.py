@@ -0,0 +1,46 @@
+import json
+import os
+from typing import Dict, Tuple
+from google.protobuf import text_format
+from ortools.sat import cp_model_pb2
+from ortools.sat.python import cp_model
+
+MODEL_SUFFIX = '.pb'
+MAPPING_SUFFIX = '.mapping.json'
+
+def export_model(model: cp_model.CpModel, export_dir: str, name: str,
+                 variables: Dict[str, Dict[Tuple, cp_model.IntVar]], context: Dict = None) -> str:
+    """Write a CP-SAT model as a binary protobuf plus a JSON mapping file for offline replay.
+    
+    variables maps a label (e.g. 'applicant_slot') to the solver's variable
+    dict; the mapping file records the proto index of every key so a replayed
+    solution can be read back in domain terms. context holds whatever the keys
+    refer to, such as the applicant ids behind applicant indices.
+    Returns the path of the model file.
+    """
+    os.makedirs(export_dir, exist_ok=True)
+    path = os.path.join(export_dir, name + MODEL_SUFFIX)
+    model.ExportToFile(path)
+    
+    mapping = {
+        'model': name,
+        'context': context or {},
+        'variables': {
+            label: [{'key': list(key), 'index': var.Index()} for key, var in label_variables.items()]
+            for label, label_variables in variables.items()
+        }
+    }
+    with open(os.path.join(export_dir, name + MAPPING_SUFFIX), 'w') as f:
+        json.dump(mapping, f, default=str)
+    print(f"Exported model to {path}")
+    return path
+
+def load_model(path: str) -> cp_model.CpModel:
+    """Read a model written by export_model back into a CpModel."""
+    proto = cp_model_pb2.CpModelProto()
+    with open(path, 'rb') as f:
+        proto.ParseFromString(f.read())
+    model = cp_model.CpModel()
+    # The solver's own proto type only reads text format
+    model.Proto().parse_text_format(text_format.MessageToString(proto))
+    return model
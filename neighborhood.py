@@ -0,0 +1,165 @@
+from ortools.sat.python import cp_model
+from typing import List, Dict, Set, Tuple
+from autoscheduler import resolve_policy, limit_individual_slots, individual_fields, group_fields
+from feasibility import windows_overlap, group_windows
+
+def placement_usage(applicant_assignments: Dict, exclude: Set[str] = frozenset()) -> Tuple[Dict[Tuple, int], Dict[Tuple, int]]:
+    """Applicants placed in each individual slot and group, keyed by (block_id, slot_id/group_id).
+    
+    Applicants in exclude are not counted, which is how a neighborhood frees its members.
+    """
+    slot_usage = {}
+    group_usage = {}
+    for app_id, assignment in applicant_assignments.items():
+        if app_id in exclude:
+            continue
+        if assignment.get('individual_slot_id'):
+            key = (assignment['individual_block_id'], assignment['individual_slot_id'])
+            slot_usage[key] = slot_usage.get(key, 0) + 1
+        if assignment.get('group_id'):
+            key = (assignment['group_block_id'], assignment['group_id'])
+            group_usage[key] = group_usage.get(key, 0) + 1
+    return slot_usage, group_usage
+
+def merge_neighborhood(applicant_assignments: Dict, free_ids: Set[str], placements: Dict) -> Dict:
+    """Schedule with the neighborhood's old placements replaced by its new ones."""
+    merged = {app_id: assignment for app_id, assignment in applicant_assignments.items() if app_id not in free_ids}
+    merged.update(placements)
+    return merged
+
+def solve_neighborhood(applicants: List[Dict], blocks: List[Dict], feasibility_index: Dict[str, Dict],
+                       applicant_assignments: Dict, policy: Dict = None, keep_weight: int = 0,
+                       time_limit: float = 5.0, solver_options: Dict = None, dates: Set[str] = None,
+                       team_covered: Set[str] = frozenset()) -> Dict:
+    """Re-place a neighborhood of applicants while everyone else stays where they are.
+    
+    applicants are the freed applicants; the rest of applicant_assignments is held
+    fixed through the slot and group capacity it uses, so the model only has
+    variables for the neighborhood. As in Round 1, candidates are the slots and
+    groups of each applicant's available pairs (pair_slots/pair_groups in
+    feasibility_index); staffing is left to Round 2, except for the applicants in
+    team_covered, who only get units a recruiter of their teams is available
+    for (team_slots/team_groups). keep_weight rewards leaving
+    a freed applicant where they already were, so edits move as few people as
+    possible.
+    dates, if given, keeps the neighborhood on blocks of those days, so
+    neighborhoods on different days never compete for the same capacity.
+    
+    Returns the new assignments of the neighborhood (applicants missing from it
+    are unscheduled), or None if the solver found no schedule within the limit.
+    """
+    policy = resolve_policy(policy)
+    blocks = limit_individual_slots(blocks, policy['max_slots_per_block'])
+    if dates is not None:
+        blocks = [block for block in blocks if block['date'] in dates]
+    free_ids = {applicant['id'] for applicant in applicants}
+    slot_usage, group_usage = placement_usage(applicant_assignments, free_ids)
+    
+    slots = {(block['block_id'], slot['slot_id']): (block, slot)
+             for block in blocks if block['type'] == 'individual' for slot in block['slots']}
+    groups = {(block['block_id'], group['group_id']): (block, group)
+              for block in blocks if block['type'] == 'group' for group in block['groups']}
+    paired_dates = {block['date'] for block, _ in slots.values()} & {block['date'] for block, _ in groups.values()}
+    
+    model = cp_model.CpModel()
+    applicant_slot = {}
+    applicant_group = {}
+    objective_terms = []
+    
+    for applicant in applicants:
+        app_id = applicant['id']
+        feasibility = feasibility_index[app_id]
+        current = applicant_assignments.get(app_id, {})
+        current_slot = (current.get('individual_block_id'), current.get('individual_slot_id'))
+        current_group = (current.get('group_block_id'), current.get('group_id'))
+        
+        # Only units of a pair the applicant can attend that the fixed schedule left room in
+        slot_keys, group_keys = feasibility['pair_slots'], feasibility['pair_groups']
+        if app_id in team_covered:
+            slot_keys, group_keys = slot_keys & feasibility['team_slots'], group_keys & feasibility['team_groups']
+        slot_vars = {key: model.NewBoolVar(f'{app_id}_slot_{key[1]}') for key in sorted(slot_keys)
+                     if key in slots and slot_usage.get(key, 0) < 1}
+        group_vars = {key: model.NewBoolVar(f'{app_id}_group_{key[1]}') for key in sorted(group_keys)
+                      if key in groups and group_usage.get(key, 0) < policy['group_capacity']}
+        applicant_slot[app_id] = slot_vars
+        applicant_group[app_id] = group_vars
+        # A placement that lost one of its units cannot be kept as it is
+        keep = current_slot in slot_vars and current_group in group_vars
+        
+        # Constraint 1: At most one individual slot and at most one group
+        model.AddAtMostOne(slot_vars.values())
+        model.AddAtMostOne(group_vars.values())
+        
+        # Constraint 2: Same-day requirement for individual and group
+        for date in paired_dates:
+            slots_this_date = [var for key, var in slot_vars.items() if slots[key][0]['date'] == date]
+            groups_this_date = [var for key, var in group_vars.items() if groups[key][0]['date'] == date]
+            if slots_this_date or groups_this_date:
+                model.Add(sum(slots_this_date) == sum(groups_this_date))
+        
+        # Constraint 3: Time overlap prevention
+        for slot_key, slot_var in slot_vars.items():
+            slot_block, slot = slots[slot_key]
+            for group_key, group_var in group_vars.items():
+                group_block, group = groups[group_key]
+                if slot_block['date'] != group_block['date']:
+                    continue
+                if any(windows_overlap((slot['start'], slot['end']), win) for win in group_windows(group)):
+                    model.AddBoolOr([slot_var.Not(), group_var.Not()])
+        
+        if slot_vars and group_vars:
+            complete_var = model.NewBoolVar(f'{app_id}_complete')
+            model.Add(complete_var <= sum(slot_vars.values()))
+            model.Add(complete_var <= sum(group_vars.values()))
+            objective_terms.append(policy['complete_weight'] * complete_var)
+            model.AddHint(complete_var, keep)
+        if policy['partial_weight']:
+            objective_terms.append(policy['partial_weight'] * (sum(slot_vars.values()) + sum(group_vars.values())))
+        # Slots hold one applicant, so each slot variable is also that slot's usage
+        objective_terms.append(-policy['slot_penalty'] * sum(slot_vars.values()))
+        
+        if keep_weight and keep:
+            objective_terms.append(keep_weight * slot_vars[current_slot])
+            objective_terms.append(keep_weight * group_vars[current_group])
+        
+        # Start from where the applicant is now
+        for key, var in slot_vars.items():
+            model.AddHint(var, keep and key == current_slot)
+        for key, var in group_vars.items():
+            model.AddHint(var, keep and key == current_group)
+    
+    # Constraint 4: Group capacity left over by the fixed applicants
+    for key in groups:
+        group_assignments = [applicant_group[app_id][key] for app_id in applicant_group if key in applicant_group[app_id]]
+        if group_assignments:
+            model.Add(sum(group_assignments) <= policy['group_capacity'] - group_usage.get(key, 0))
+    
+    # Constraint 5: Individual slot capacity (free slots only have room for one)
+    for key in slots:
+        slot_assignments = [applicant_slot[app_id][key] for app_id in applicant_slot if key in applicant_slot[app_id]]
+        if len(slot_assignments) > 1:
+            model.AddAtMostOne(slot_assignments)
+    
+    model.Maximize(sum(objective_terms))
+    
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = time_limit
+    for name, value in (solver_options or {}).items():
+        setattr(solver.parameters, name, value)
+    status = solver.Solve(model)
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return None
+    
+    placements = {}
+    for applicant in applicants:
+        app_id = applicant['id']
+        assignment_data = {'applicant': applicant}
+        for key, var in applicant_slot[app_id].items():
+            if solver.Value(var):
+                assignment_data.update(individual_fields(*slots[key]))
+        for key, var in applicant_group[app_id].items():
+            if solver.Value(var):
+                assignment_data.update(group_fields(*groups[key]))
+        if len(assignment_data) > 1:
+            placements[app_id] = assignment_data
+    return placements
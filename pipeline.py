@@ -0,0 +1,235 @@
+import pandas as pd
+import argparse
+import os
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from autoscheduler import (
+    load_applicants, load_recruiters, load_blocks, load_rooms, load_recruiter_assignments,
+    run_strict_rounds, write_output_files, create_run_dir, snapshot_inputs, parse_policy,
+    applicant_schedule_rows, recruiter_schedule_rows, APPLICANT_SCHEDULE_COLUMNS, RECRUITER_SCHEDULE_COLUMNS
+)
+from relaxed_scheduler import relaxed_schedule_applicants, relaxed_applicant_rows, write_relaxed_output
+from combine_schedules import combine_applicant_frames, write_combined_outputs, read_relaxed_violations
+from block_breakdown import build_block_breakdown, write_block_breakdown
+from run_history import record_run
+
+# Pipeline stages in execution order
+STAGES = ['strict', 'relaxed', 'combine', 'breakdown']
+
+# Relative shares of --time-budget for the stages that run a solver
+STAGE_BUDGET_WEIGHTS = {'strict': 3, 'relaxed': 1}
+
+def load_inputs(input_dir: str, blocks_file: str = 'blocks.csv', policy: Dict = None) -> Dict:
+    """Load all input CSVs once for the whole pipeline."""
+    inputs = {
+        'applicants': load_applicants(os.path.join(input_dir, 'applicant_info.csv')),
+        'recruiters': load_recruiters(os.path.join(input_dir, 'recruiters.csv')),
+        'rooms': load_rooms(os.path.join(input_dir, 'rooms.csv')),
+        'policy': policy
+    }
+    inputs['blocks'] = load_blocks(os.path.join(input_dir, blocks_file), inputs['rooms'], inputs['recruiters'])
+    print(f"Loaded {len(inputs['applicants'])} applicants, {len(inputs['recruiters'])} recruiters, "
+          f"{len(inputs['blocks'])} blocks, {len(inputs['rooms'])} rooms")
+    return inputs
+
+def blocks_frame(blocks: List[Dict]) -> pd.DataFrame:
+    """Build a blocks.csv-shaped DataFrame from loaded blocks."""
+    return pd.DataFrame([{
+        'block_id': block['block_id'],
+        'date': block['date'],
+        'start': block['start'].strftime('%H:%M'),
+        'end': block['end'].strftime('%H:%M'),
+        'block_type': block['type']
+    } for block in blocks])
+
+def read_schedule_csv(path) -> pd.DataFrame:
+    """Read a schedule CSV keeping blank cells as empty strings, like the in-memory rows."""
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+def run_strict(inputs: Dict, state: Dict):
+    """Strict stage: Round 1 applicants, Round 2 recruiters."""
+    applicant_assignments, unscheduled, recruiter_assignments, used_blocks, unscheduled_reasons = run_strict_rounds(
+        inputs['applicants'], inputs['recruiters'], inputs['blocks'], inputs['rooms'], inputs['policy'],
+        state.get('stage_deadline'), inputs.get('export_dir'))
+    
+    state.update({
+        'applicant_assignments': applicant_assignments,
+        'unscheduled': unscheduled,
+        'unscheduled_reasons': unscheduled_reasons,
+        'recruiter_assignments': recruiter_assignments,
+        'used_blocks': used_blocks,
+        'regular_schedule': pd.DataFrame(applicant_schedule_rows(applicant_assignments, inputs['applicants']),
+                                         columns=APPLICANT_SCHEDULE_COLUMNS),
+        'recruiter_schedule': pd.DataFrame(recruiter_schedule_rows(recruiter_assignments, inputs['blocks']),
+                                           columns=RECRUITER_SCHEDULE_COLUMNS)
+    })
+
+def run_relaxed(inputs: Dict, state: Dict):
+    """Relaxed stage: place the strict stage's unscheduled applicants with soft constraints."""
+    relaxed_assignments, violations, still_unscheduled = relaxed_schedule_applicants(
+        inputs['applicants'], state['recruiter_assignments'], inputs['blocks'], state['unscheduled'],
+        deadline=state.get('stage_deadline'), export_dir=inputs.get('export_dir'))
+    
+    print(f"Relaxed scheduling: {len(relaxed_assignments)} scheduled, {len(violations)} violations, "
+          f"{len(still_unscheduled)} still unscheduled")
+    
+    state.update({
+        'relaxed_assignments': relaxed_assignments,
+        'violations': violations,
+        'still_unscheduled': still_unscheduled,
+        'relaxed_schedule': pd.DataFrame(relaxed_applicant_rows(relaxed_assignments, inputs['applicants']),
+                                         columns=APPLICANT_SCHEDULE_COLUMNS)
+    })
+
+def run_combine(inputs: Dict, state: Dict):
+    """Combine stage: stack regular and relaxed schedules."""
+    state['combined_schedule'] = combine_applicant_frames(state['regular_schedule'], state['relaxed_schedule'])
+    print(f"Combined schedule: {len(state['combined_schedule'])} applicants")
+
+def run_breakdown(inputs: Dict, state: Dict):
+    """Breakdown stage: per-block view of the combined schedule."""
+    state['block_breakdown'] = build_block_breakdown(
+        state['combined_schedule'], state['recruiter_schedule'], blocks_frame(inputs['blocks']))
+    print(f"Built breakdown for {len(state['block_breakdown']['blocks'])} blocks")
+
+STAGE_RUNNERS = {
+    'strict': run_strict,
+    'relaxed': run_relaxed,
+    'combine': run_combine,
+    'breakdown': run_breakdown
+}
+
+def skipped_stages(stages: List[str]) -> List[str]:
+    """Stages whose outputs the selected stages depend on but that will not run."""
+    return [s for s in STAGES[:STAGES.index(stages[-1])] if s not in stages]
+
+def load_state(run_dir: Path, inputs: Dict, done: List[str]) -> Dict:
+    """Load the outputs of already completed stages from an existing run directory."""
+    state = {}
+    schedules_dir = run_dir / 'schedules'
+    
+    if 'strict' in done:
+        state['recruiter_assignments'] = load_recruiter_assignments(
+            schedules_dir / 'recruiters_schedule.csv', inputs['recruiters'], inputs['blocks'], inputs['rooms'])
+        state['unscheduled'] = read_schedule_csv(schedules_dir / 'unscheduled_applicants.csv')['applicant_id'].tolist()
+        state['regular_schedule'] = read_schedule_csv(schedules_dir / 'applicants_schedule.csv')
+        state['recruiter_schedule'] = read_schedule_csv(schedules_dir / 'recruiters_schedule.csv')
+    
+    if 'relaxed' in done:
+        state['relaxed_schedule'] = read_schedule_csv(schedules_dir / 'relaxed_schedule_applicants.csv')
+        state['violations'] = read_relaxed_violations(schedules_dir / 'relaxed_schedule_violations.txt')
+    
+    if 'combine' in done:
+        state['combined_schedule'] = read_schedule_csv(schedules_dir / 'final_combined.csv')
+        if 'violations' not in state:
+            state['violations'] = read_relaxed_violations(schedules_dir / 'relaxed_schedule_violations.txt')
+    
+    return state
+
+def write_artifacts(run_dir: Path, inputs: Dict, state: Dict, stages_run: List[str]):
+    """Write every artifact produced by the stages that ran in this process."""
+    schedules_dir = run_dir / 'schedules'
+    summaries_dir = run_dir / 'summaries'
+    
+    if 'strict' in stages_run:
+        write_output_files(state['recruiter_assignments'], state['applicant_assignments'], state['unscheduled'],
+                           inputs['applicants'], inputs['recruiters'], state['used_blocks'], run_dir=run_dir,
+                           unscheduled_reasons=state['unscheduled_reasons'])
+    
+    if 'relaxed' in stages_run:
+        write_relaxed_output(state['relaxed_assignments'], state['violations'], state['still_unscheduled'],
+                             inputs['applicants'], str(schedules_dir / 'relaxed_schedule'))
+    
+    if 'combine' in stages_run:
+        write_combined_outputs(state['combined_schedule'], [], state['violations'],
+                               len(inputs['applicants']), str(schedules_dir / 'final'))
+    
+    if 'breakdown' in stages_run:
+        write_block_breakdown(state['block_breakdown'], str(summaries_dir / 'block_breakdown'))
+
+def stage_deadline(deadline: float, stage: str, remaining_stages: List[str]) -> float:
+    """Deadline for a stage: its weighted share of the budget left for it and the solver stages after it."""
+    if deadline is None or stage not in STAGE_BUDGET_WEIGHTS:
+        return None
+    weights = [STAGE_BUDGET_WEIGHTS[s] for s in remaining_stages if s in STAGE_BUDGET_WEIGHTS]
+    now = time.time()
+    return now + max(0.0, deadline - now) * STAGE_BUDGET_WEIGHTS[stage] / sum(weights)
+
+def select_stages(stages_arg: str, resume_from: str) -> List[str]:
+    """Resolve --stages/--resume-from into the ordered list of stages to run."""
+    stages = STAGES if not stages_arg else [s.strip() for s in stages_arg.split(',') if s.strip()]
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        raise ValueError(f"Unknown stage(s): {', '.join(unknown)} (choose from {', '.join(STAGES)})")
+    if resume_from:
+        stages = [s for s in stages if STAGES.index(s) >= STAGES.index(resume_from)]
+    return [s for s in STAGES if s in stages]
+
+def main():
+    parser = argparse.ArgumentParser(description='Run strict -> relaxed -> combine -> breakdown in one process')
+    parser.add_argument('--input-dir', default='.', help='Input directory containing CSV files')
+    parser.add_argument('--blocks-file', default='blocks.csv', help='Blocks CSV inside the input directory')
+    parser.add_argument('--output-dir', default='results', help='Output directory for new runs')
+    parser.add_argument('--stages', default=None, help=f'Comma-separated stages to run (default: {",".join(STAGES)})')
+    parser.add_argument('--resume-from', choices=STAGES, default=None,
+                        help='Skip earlier stages, loading their outputs from --run-dir')
+    parser.add_argument('--run-dir', default=None, help='Existing run directory to resume from and write into')
+    parser.add_argument('--policy', default=None, help='Round 1 policy overrides as JSON or a JSON file (see DEFAULT_POLICY)')
+    parser.add_argument('--time-budget', type=float, default=None,
+                        help='Wall-clock seconds for the solver stages, split between them; each keeps its best schedule')
+    parser.add_argument('--export-model', default=None, metavar='DIR',
+                        help='Also write every CP-SAT model to this directory as a protobuf plus a mapping file (see replay.py)')
+    parser.add_argument('--history-db', default=None, help='Run history database (default: <output-dir>/run_history.sqlite)')
+    parser.add_argument('--no-history', action='store_true', help='Do not record the run in the history database')
+    
+    args = parser.parse_args()
+    
+    stages = select_stages(args.stages, args.resume_from)
+    if not stages:
+        parser.error("No stages selected")
+    
+    done = skipped_stages(stages)
+    if done and not args.run_dir:
+        parser.error(f"--run-dir is required to load the output of skipped stage(s): {', '.join(done)}")
+    
+    print("Loading input files...")
+    inputs = load_inputs(args.input_dir, args.blocks_file, parse_policy(args.policy))
+    inputs['export_dir'] = args.export_model
+    
+    run_dir = Path(args.run_dir) if args.run_dir else None
+    state = load_state(run_dir, inputs, done) if run_dir else {}
+    
+    deadline = time.time() + args.time_budget if args.time_budget else None
+    stage_seconds = {}
+    for i, stage in enumerate(stages):
+        print(f"\n=== Stage: {stage} ===")
+        stage_start = time.time()
+        state['stage_deadline'] = stage_deadline(deadline, stage, stages[i:])
+        STAGE_RUNNERS[stage](inputs, state)
+        stage_seconds[stage] = round(time.time() - stage_start, 3)
+        print(f"Stage {stage} finished in {stage_seconds[stage]:.2f}s")
+    
+    # Write all artifacts once, at the end
+    if run_dir is None:
+        run_dir = create_run_dir(args.output_dir)
+    print(f"\nWriting artifacts to {run_dir}...")
+    write_artifacts(run_dir, inputs, state, stages)
+    snapshot_inputs(run_dir, args.input_dir, args.blocks_file)
+    
+    if not args.no_history:
+        history_db = args.history_db or os.path.join(args.output_dir, 'run_history.sqlite')
+        solver_stages = [s for s in ['strict', 'relaxed'] if s in stage_seconds]
+        metrics = {'stage_seconds': stage_seconds}
+        if solver_stages:
+            metrics['solve_seconds'] = round(sum(stage_seconds[s] for s in solver_stages), 3)
+        params = {'command': 'pipeline', 'stages': stages, 'blocks_file': args.blocks_file, 'policy': inputs['policy'],
+                  'time_budget': args.time_budget}
+        record_run(history_db, run_dir, params=params, metrics=metrics)
+        print(f"Run recorded in {history_db}")
+    
+    print(f"\nPipeline complete! Results saved to: {run_dir}")
+
+if __name__ == "__main__":
+    main()
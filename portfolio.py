@@ -0,0 +1,300 @@
+import argparse
+import csv
+import multiprocessing
+import os
+import queue
+import time
+from typing import List, Dict, Tuple
+from ortools.linear_solver import pywraplp
+from autoscheduler import (
+    load_applicants, load_recruiters, load_blocks, load_rooms, parse_policy, resolve_policy,
+    limit_individual_slots, individual_fields, group_fields, split_into_groups, greedy_applicants_first,
+    schedule_applicants_first, round1_objective, objective_target, schedule_recruiters_to_match,
+    write_output_files, snapshot_inputs, REASON_SOLVER_UNSCHEDULED
+)
+from capacity import capacity_bound
+from feasibility import build_feasibility_index, screen_applicants, windows_overlap, group_windows
+from presolve import prune_blocks
+from run_history import record_run
+
+# Round 1 strategies the portfolio can race; 'kind' picks the solver, the rest are its options
+STRATEGIES = {
+    'greedy': {'kind': 'greedy'},
+    'cpsat': {'kind': 'cpsat', 'solver_options': {'num_workers': 1, 'random_seed': 0}},
+    'cpsat_seed1': {'kind': 'cpsat', 'solver_options': {'num_workers': 1, 'random_seed': 1}},
+    'cpsat_hinted': {'kind': 'cpsat', 'hint': True, 'solver_options': {'num_workers': 1, 'random_seed': 0}},
+    'cpsat_core': {'kind': 'cpsat', 'solver_options': {'num_workers': 1, 'optimize_with_core': True}},
+    'mip_scip': {'kind': 'mip', 'solver': 'SCIP'},
+    'mip_cbc': {'kind': 'mip', 'solver': 'CBC'}
+}
+DEFAULT_STRATEGIES = ['greedy', 'cpsat', 'cpsat_hinted', 'mip_scip']
+
+PORTFOLIO_COLUMNS = ['strategy', 'status', 'objective', 'seconds', 'winner']
+
+# Seconds a strategy may overrun the budget before it is stopped
+GRACE_SECONDS = 5.0
+
+def mip_applicants_first(applicants: List[Dict], blocks: List[Dict], recruiters: List[Dict], policy: Dict = None,
+                         solver_name: str = 'SCIP', time_limit: float = None) -> Tuple[Dict, List[str]]:
+    """Round 1 as a MIP for OR-Tools' bundled linear solvers (SCIP, CBC, ...).
+    
+    Same rules as schedule_applicants_first, over each applicant's slot and
+    group-block candidates from the feasibility index: at most one slot and one
+    group block, both on the same day and not overlapping, slot capacity 1 and
+    group blocks holding their parallel groups times group_capacity. Group
+    blocks are split into groups after solving, as in the CP-SAT model.
+    """
+    policy = resolve_policy(policy)
+    blocks = limit_individual_slots(blocks, policy['max_slots_per_block'])
+    feasibility_index = build_feasibility_index(applicants, blocks, recruiters)
+    slots = {(block['block_id'], slot['slot_id']): (block, slot)
+             for block in blocks if block['type'] == 'individual' for slot in block['slots']}
+    group_blocks = {block['block_id']: block for block in blocks if block['type'] == 'group'}
+    
+    solver = pywraplp.Solver.CreateSolver(solver_name)
+    if solver is None:
+        raise ValueError(f"Linear solver {solver_name} is not available in this OR-Tools build")
+    if time_limit is not None:
+        solver.SetTimeLimit(int(max(time_limit, 0.01) * 1000))
+    
+    applicant_slot = {}
+    applicant_group = {}
+    complete_vars = {}
+    objective = solver.Objective()
+    for a, applicant in enumerate(applicants):
+        feasibility = feasibility_index[applicant['id']]
+        slot_vars = {key: solver.BoolVar(f'app_{a}_slot_{key[1]}') for key in feasibility['pair_slots'] if key in slots}
+        group_vars = {block_id: solver.BoolVar(f'app_{a}_group_{block_id}')
+                      for block_id in {block_id for block_id, _ in feasibility['pair_groups']} if block_id in group_blocks}
+        if not slot_vars or not group_vars:
+            continue
+        applicant_slot[a] = slot_vars
+        applicant_group[a] = group_vars
+        
+        # Constraint 1: At most one individual slot and at most one group
+        solver.Add(solver.Sum(slot_vars.values()) <= 1)
+        solver.Add(solver.Sum(group_vars.values()) <= 1)
+        
+        # Constraint 2: Same-day requirement for individual and group
+        for date in feasibility['dates']:
+            solver.Add(solver.Sum([var for key, var in slot_vars.items() if slots[key][0]['date'] == date])
+                       == solver.Sum([var for block_id, var in group_vars.items() if group_blocks[block_id]['date'] == date]))
+        
+        # Constraint 3: Time overlap prevention
+        for slot_key, slot_var in slot_vars.items():
+            slot_block, slot = slots[slot_key]
+            for block_id, group_var in group_vars.items():
+                group_block = group_blocks[block_id]
+                if slot_block['date'] != group_block['date']:
+                    continue
+                if any(windows_overlap((slot['start'], slot['end']), win) for win in group_windows(group_block['groups'][0])):
+                    solver.Add(slot_var + group_var <= 1)
+        
+        complete_var = solver.BoolVar(f'complete_{a}')
+        solver.Add(complete_var <= solver.Sum(slot_vars.values()))
+        solver.Add(complete_var <= solver.Sum(group_vars.values()))
+        complete_vars[a] = complete_var
+        objective.SetCoefficient(complete_var, policy['complete_weight'])
+        for var in slot_vars.values():
+            objective.SetCoefficient(var, policy['partial_weight'] - policy['slot_penalty'])
+        for var in group_vars.values():
+            objective.SetCoefficient(var, policy['partial_weight'])
+    
+    # Constraint 4: Individual slot capacity (1 applicant per slot)
+    for key in slots:
+        slot_assignments = [applicant_slot[a][key] for a in applicant_slot if key in applicant_slot[a]]
+        if len(slot_assignments) > 1:
+            solver.Add(solver.Sum(slot_assignments) <= 1)
+    
+    # Constraint 5: Group capacity (group_capacity applicants per parallel group in the block)
+    for block_id, block in group_blocks.items():
+        group_assignments = [applicant_group[a][block_id] for a in applicant_group if block_id in applicant_group[a]]
+        if group_assignments:
+            solver.Add(solver.Sum(group_assignments) <= len(block['groups']) * policy['group_capacity'])
+    
+    objective.SetMaximization()
+    status = solver.Solve()
+    if status not in (pywraplp.Solver.OPTIMAL, pywraplp.Solver.FEASIBLE):
+        return {}, [applicant['id'] for applicant in applicants]
+    
+    applicant_assignments = {}
+    group_members = {}
+    for a, applicant in enumerate(applicants):
+        if a not in complete_vars:
+            continue
+        slot_keys = [key for key, var in applicant_slot[a].items() if var.solution_value() > 0.5]
+        block_ids = [block_id for block_id, var in applicant_group[a].items() if var.solution_value() > 0.5]
+        if not slot_keys and not block_ids:
+            continue
+        assignment_data = {'applicant': applicant}
+        if slot_keys:
+            assignment_data.update(individual_fields(*slots[slot_keys[0]]))
+        if block_ids:
+            group_members.setdefault(block_ids[0], []).append(applicant)
+            assignment_data['group_block_id'] = block_ids[0]
+        applicant_assignments[applicant['id']] = assignment_data
+    for block_id, members in group_members.items():
+        block = group_blocks[block_id]
+        for app_id, group in split_into_groups(block, members, policy['group_capacity']).items():
+            applicant_assignments[app_id].update(group_fields(block, group))
+    
+    unscheduled = [applicant['id'] for applicant in applicants if applicant['id'] not in applicant_assignments]
+    return applicant_assignments, unscheduled
+
+def run_strategy(name: str, applicants: List[Dict], blocks: List[Dict], recruiters: List[Dict], policy: Dict,
+                 complete_bound: int = None, deadline: float = None) -> Dict:
+    """Round 1 schedule of one portfolio strategy."""
+    spec = STRATEGIES[name]
+    if spec['kind'] == 'greedy':
+        assignments, _ = greedy_applicants_first(applicants, blocks, recruiters, policy)
+    elif spec['kind'] == 'cpsat':
+        hint = greedy_applicants_first(applicants, blocks, recruiters, policy)[0] if spec.get('hint') else None
+        assignments, _ = schedule_applicants_first(applicants, blocks, recruiters, complete_bound, policy,
+                                                   spec.get('solver_options'), hint=hint, deadline=deadline)
+    else:  # mip
+        time_limit = deadline - time.time() if deadline is not None else None
+        assignments, _ = mip_applicants_first(applicants, blocks, recruiters, policy, spec['solver'], time_limit)
+    return assignments
+
+def _strategy_process(name: str, inputs: Dict, deadline: float, results):
+    """Run one strategy in its own process and report its schedule on the results queue."""
+    start = time.time()
+    try:
+        assignments = run_strategy(name, inputs['applicants'], inputs['blocks'], inputs['recruiters'], inputs['policy'],
+                                   inputs['complete_bound'], deadline)
+        # An empty schedule means the strategy found no solution in time
+        results.put({'strategy': name, 'status': 'finished' if assignments else 'no_solution', 'assignments': assignments,
+                     'objective': round1_objective(assignments, inputs['policy']) if assignments else None,
+                     'seconds': round(time.time() - start, 3)})
+    except Exception as e:
+        results.put({'strategy': name, 'status': f'error: {e}', 'assignments': None, 'objective': None,
+                     'seconds': round(time.time() - start, 3)})
+
+def run_portfolio(applicants: List[Dict], blocks: List[Dict], recruiters: List[Dict], policy: Dict = None,
+                  strategies: List[str] = None, time_budget: float = 60.0,
+                  complete_bound: int = None) -> Tuple[Dict, List[Dict]]:
+    """Race Round 1 strategies in separate processes on the same input.
+    
+    The first schedule that reaches the objective target of complete_bound wins
+    and stops the others; otherwise the best objective by the end of the time
+    budget wins (the earliest on a tie). Strategies still running GRACE_SECONDS
+    after the budget are stopped. Returns the winning schedule and one report
+    row per strategy.
+    """
+    policy = resolve_policy(policy)
+    strategies = strategies or DEFAULT_STRATEGIES
+    target = objective_target(complete_bound, policy)
+    inputs = {'applicants': applicants, 'blocks': blocks, 'recruiters': recruiters, 'policy': policy,
+              'complete_bound': complete_bound}
+    
+    start = time.time()
+    deadline = start + time_budget
+    results = multiprocessing.Queue()
+    processes = {name: multiprocessing.Process(target=_strategy_process, args=(name, inputs, deadline, results), daemon=True)
+                 for name in strategies}
+    for process in processes.values():
+        process.start()
+    
+    reports = {}
+    best = None
+    while len(reports) < len(processes):
+        try:
+            result = results.get(timeout=max(0.1, deadline + GRACE_SECONDS - time.time()))
+        except queue.Empty:
+            break
+        reports[result['strategy']] = result
+        print(f"  [{time.time() - start:6.2f}s] {result['strategy']}: {result['status']}, objective {result['objective']}")
+        if result['objective'] is not None and (best is None or result['objective'] > best['objective']):
+            best = result
+        if best is not None and target is not None and best['objective'] >= target:
+            print(f"  {best['strategy']} reached the capacity bound; stopping the other strategies")
+            break
+    
+    for name, process in processes.items():
+        if process.is_alive():
+            process.terminate()
+        process.join()
+        if name not in reports:
+            reports[name] = {'strategy': name, 'status': 'stopped', 'objective': None, 'seconds': round(time.time() - start, 3)}
+    
+    rows = [{
+        'strategy': name,
+        'status': reports[name]['status'],
+        'objective': reports[name]['objective'],
+        'seconds': reports[name]['seconds'],
+        'winner': best is not None and name == best['strategy']
+    } for name in strategies]
+    return (best['assignments'] if best else {}), rows
+
+def write_portfolio_report(rows: List[Dict], path):
+    """Write the per-strategy results of a portfolio run to CSV."""
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=PORTFOLIO_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def main():
+    parser = argparse.ArgumentParser(description='Race several Round 1 strategies and keep the best schedule')
+    parser.add_argument('--input-dir', default='.', help='Input directory containing CSV files')
+    parser.add_argument('--output-dir', default='results', help='Output directory for results')
+    parser.add_argument('--strategies', default=','.join(DEFAULT_STRATEGIES),
+                        help=f'Comma-separated strategies to race ({", ".join(STRATEGIES)})')
+    parser.add_argument('--policy', default=None, help='Round 1 policy overrides as JSON or a JSON file (see DEFAULT_POLICY)')
+    parser.add_argument('--time-budget', type=float, default=60.0, help='Wall-clock seconds for the race')
+    parser.add_argument('--history-db', default=None, help='Run history database (default: <output-dir>/run_history.sqlite)')
+    parser.add_argument('--no-history', action='store_true', help='Do not record the run in the history database')
+    
+    args = parser.parse_args()
+    policy = resolve_policy(parse_policy(args.policy))
+    strategies = [name.strip() for name in args.strategies.split(',') if name.strip()]
+    unknown = [name for name in strategies if name not in STRATEGIES]
+    if unknown:
+        parser.error(f"Unknown strategies: {', '.join(unknown)}")
+    
+    print("Loading input files...")
+    applicants = load_applicants(os.path.join(args.input_dir, 'applicant_info.csv'))
+    recruiters = load_recruiters(os.path.join(args.input_dir, 'recruiters.csv'))
+    rooms = load_rooms(os.path.join(args.input_dir, 'rooms.csv'))
+    blocks = load_blocks(os.path.join(args.input_dir, 'blocks.csv'), rooms, recruiters)
+    
+    blocks, _ = prune_blocks(applicants, blocks, recruiters, policy)
+    viable, unscheduled_reasons = screen_applicants(applicants, blocks, recruiters)
+    bound = capacity_bound(viable, blocks, recruiters, policy['group_capacity'])
+    print(f"Capacity bound: at most {bound['bound']} complete assignments")
+    
+    print(f"\nRacing {', '.join(strategies)} for up to {args.time_budget:.0f}s...")
+    start = time.time()
+    applicant_assignments, report = run_portfolio(viable, blocks, recruiters, policy, strategies, args.time_budget,
+                                                  bound['bound'])
+    solve_seconds = time.time() - start
+    winner = next((row for row in report if row['winner']), None)
+    print(f"Winner: {winner['strategy'] if winner else 'none'} with objective "
+          f"{winner['objective'] if winner else None} after {solve_seconds:.2f}s")
+    
+    unscheduled = [applicant['id'] for applicant in applicants if applicant['id'] not in applicant_assignments]
+    for app_id in unscheduled:
+        unscheduled_reasons.setdefault(app_id, REASON_SOLVER_UNSCHEDULED)
+    recruiter_assignments = schedule_recruiters_to_match(recruiters, applicant_assignments, blocks, rooms)
+    used_blocks = [block for block in blocks if block['block_id'] in recruiter_assignments]
+    
+    print("\nWriting output files...")
+    run_dir = write_output_files(recruiter_assignments, applicant_assignments, unscheduled, applicants, recruiters,
+                                 used_blocks, args.output_dir, unscheduled_reasons=unscheduled_reasons)
+    snapshot_inputs(run_dir, args.input_dir)
+    write_portfolio_report(report, os.path.join(run_dir, 'summaries', 'portfolio.csv'))
+    print(f"  - summaries/portfolio.csv")
+    
+    if not args.no_history:
+        history_db = args.history_db or os.path.join(args.output_dir, 'run_history.sqlite')
+        record_run(history_db, run_dir, params={'command': 'portfolio', 'strategies': strategies, 'policy': policy,
+                                                'time_budget': args.time_budget},
+                   metrics={'solve_seconds': round(solve_seconds, 3),
+                            'portfolio_winner': winner['strategy'] if winner else None,
+                            'portfolio_objective': winner['objective'] if winner else None,
+                            'portfolio': {row['strategy']: row['objective'] for row in report}})
+        print(f"Run recorded in {history_db}")
+    
+    print(f"\nResults saved to: {run_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import time
+from typing import List, Dict, Tuple
+from feasibility import block_staffed_masks, build_feasibility_index
+
+# Presolve rules, in the order they are applied
+RULE_NO_RECRUITER = 'no_recruiter'
+RULE_NO_APPLICANT = 'no_applicant'
+RULE_UNPAIRED = 'unpaired'
+RULE_MERGED = 'merged_slots'
+
+def _model_variables(block: Dict, applicants: List[Dict]) -> int:
+    """Round 1 variables a block adds: one per applicant and slot, or per applicant for a group block."""
+    units = len(block['slots']) if block['type'] == 'individual' else 1
+    return units * len(applicants)
+
+def prune_blocks(applicants: List[Dict], blocks: List[Dict], recruiters: List[Dict],
+                 policy: Dict = None) -> Tuple[List[Dict], Dict[str, Dict[str, int]]]:
+    """Drop blocks no Round 1 schedule can use well, before any model is built.
+    
+    Rules, applied in order:
+    - no_recruiter: no recruiter is available for the whole block, so it could never be staffed
+    - no_applicant: no applicant can attend any of its slots or groups
+    - unpaired: nobody who can attend it can also attend a non-overlapping
+      block of the other type on the same day (kept when policy rewards partial
+      assignments, since a lone interview still scores then)
+    
+    Returns the kept blocks and, per rule, the blocks and model variables removed.
+    """
+    start = time.time()
+    stats = {rule: {'blocks': 0, 'variables': 0} for rule in (RULE_NO_RECRUITER, RULE_NO_APPLICANT, RULE_UNPAIRED)}
+    
+    def drop(block, rule):
+        stats[rule]['blocks'] += 1
+        stats[rule]['variables'] += _model_variables(block, applicants)
+    
+    staffed_masks = block_staffed_masks(recruiters, blocks)
+    kept = []
+    for block in blocks:
+        if staffed_masks[block['block_id']]:
+            kept.append(block)
+        else:
+            drop(block, RULE_NO_RECRUITER)
+    
+    feasibility_index = build_feasibility_index(applicants, kept, recruiters)
+    attended, paired = set(), set()
+    for feasibility in feasibility_index.values():
+        attended.update(block_id for block_id, _ in feasibility['slots'])
+        attended.update(block_id for block_id, _ in feasibility['groups'])
+        paired.update(block_id for block_id, _ in feasibility['pair_slots'])
+        paired.update(block_id for block_id, _ in feasibility['pair_groups'])
+    
+    remaining = []
+    for block in kept:
+        if block['block_id'] not in attended:
+            drop(block, RULE_NO_APPLICANT)
+        elif block['block_id'] not in paired and not (policy or {}).get('partial_weight'):
+            drop(block, RULE_UNPAIRED)
+        else:
+            remaining.append(block)
+    
+    removed = sum(rule['variables'] for rule in stats.values())
+    print(f"Presolve: kept {len(remaining)} of {len(blocks)} blocks, removed {removed} variables in {time.time() - start:.3f}s")
+    for rule, counts in stats.items():
+        if counts['blocks']:
+            print(f"  - {rule}: {counts['blocks']} blocks, {counts['variables']} variables")
+    return remaining, stats
+
+def merge_equivalent_slots(blocks: List[Dict]) -> Tuple[List[Dict], Dict[Tuple, List[Tuple]]]:
+    """Merge individual slots with the same date and times into one slot with a capacity.
+    
+    Round 1 does not see recruiters or rooms, so such slots are interchangeable
+    and one variable per applicant covers all of them. The merged slot keeps the
+    key of its first member and gets 'capacity'; the returned members map that
+    key to every (block, slot) it stands for, in order.
+    """
+    members = {}
+    representative = {}
+    merged_blocks = []
+    for block in blocks:
+        if block['type'] != 'individual':
+            merged_blocks.append(block)
+            continue
+        slots = []
+        for slot in block['slots']:
+            window = (block['date'], slot['start'], slot['end'])
+            if window in representative:
+                members[representative[window]].append((block, slot))
+                continue
+            representative[window] = (block['block_id'], slot['slot_id'])
+            members[representative[window]] = [(block, slot)]
+            slots.append(dict(slot))
+        if slots:
+            merged_blocks.append(dict(block, slots=slots))
+    
+    for block in merged_blocks:
+        if block['type'] == 'individual':
+            for slot in block['slots']:
+                slot['capacity'] = len(members[(block['block_id'], slot['slot_id'])])
+    return merged_blocks, members
@@ -0,0 +1,68 @@
+import argparse
+import csv
+import os
+from typing import List, Dict
+
+def read_rows(path) -> List[Dict]:
+    """Rows of a CSV as dicts, or an empty list if the file does not exist."""
+    if not os.path.exists(path):
+        return []
+    with open(path, newline='') as f:
+        return list(csv.DictReader(f))
+
+def summarize_run(run_path: str) -> Dict:
+    """Headline numbers of a run directory, read with the csv module only."""
+    schedules_dir = os.path.join(run_path, 'schedules')
+    regular = read_rows(os.path.join(schedules_dir, 'applicants_schedule.csv'))
+    relaxed = read_rows(os.path.join(schedules_dir, 'relaxed_schedule_applicants.csv'))
+    unscheduled = read_rows(os.path.join(schedules_dir, 'unscheduled_applicants.csv'))
+    recruiters = read_rows(os.path.join(schedules_dir, 'recruiters_schedule.csv'))
+    
+    dates = {}
+    complete = 0
+    for row in regular:
+        if row['individual_slot_id'] and row['group_id']:
+            complete += 1
+        start = row['individual_start'] or row['group_slot1_start']
+        if start:
+            dates[start[:10]] = dates.get(start[:10], 0) + 1
+    
+    reasons = {}
+    for row in unscheduled:
+        reason = row.get('reason') or 'unknown'
+        reasons[reason] = reasons.get(reason, 0) + 1
+    
+    return {
+        'scheduled': len(regular),
+        'complete': complete,
+        'relaxed': len(relaxed),
+        'unscheduled': len(unscheduled),
+        'reasons': reasons,
+        'dates': dates,
+        'recruiters': len({row['recruiter_id'] for row in recruiters}),
+        'staffed_blocks': len({row['block_id'] for row in recruiters})
+    }
+
+def print_summary(run_path: str, summary: Dict):
+    """Print a run summary from summarize_run."""
+    total = summary['scheduled'] + summary['unscheduled']
+    print(f"Run: {run_path}")
+    print(f"  ✅ Scheduled: {summary['scheduled']}/{total} ({summary['complete']} with both interviews)")
+    if summary['relaxed']:
+        print(f"  ⚠️  Relaxed placements: {summary['relaxed']}")
+    print(f"  ❌ Unscheduled: {summary['unscheduled']}")
+    for reason, count in sorted(summary['reasons'].items(), key=lambda item: -item[1]):
+        print(f"     - {reason}: {count}")
+    print(f"  👥 {summary['recruiters']} recruiters across {summary['staffed_blocks']} staffed blocks")
+    for date, count in sorted(summary['dates'].items()):
+        print(f"  📅 {date}: {count} applicants")
+
+def main():
+    parser = argparse.ArgumentParser(description='Quick summary of a run directory without loading pandas')
+    parser.add_argument('run_path', help='Run directory (results/run_YYYYMMDD_HHMMSS)')
+    
+    args = parser.parse_args()
+    print_summary(args.run_path, summarize_run(args.run_path))
+
+if __name__ == "__main__":
+    main()
@@ -1,258 +1,262 @@
-import pandas as pd
-from ortools.sat.python import cp_model
 import csv
 import os
 import argparse
+import time
+import datetime as dt
 from autoscheduler import (
     load_applicants, load_recruiters, load_blocks, load_rooms,
-    schedule_recruiters, any_interval_contains, TEAMS
+    load_recruiter_assignments, schedule_recruiters, TEAMS
 )
+from feasibility import team_match_matrix, recruiters_mask
 
-def relaxed_schedule_applicants(applicants, recruiter_assignments, blocks, unscheduled_ids):
-    """Relaxed scheduling for unscheduled applicants - finds best possible assignments."""
+def availability_distance(intervals, win):
+    """Minutes a window sticks out of the closest availability interval (0 if contained)."""
+    if not intervals:
+        return float('inf')
+    x, y = win
+    best = None
+    for a, b in intervals:
+        overhang = max(dt.timedelta(0), a - x) + max(dt.timedelta(0), y - b)
+        if best is None or overhang < best:
+            best = overhang
+    return best.total_seconds() / 60
+
+def relaxed_candidates(applicant, blocks, team_ok, k_nearest):
+    """Build the pruned candidate slots and groups for one applicant.
+    
+    Each candidate records whether assigning it violates availability or team
+    matching (team_ok is the applicant's row of the team-match matrix, one
+    entry per block), so the assignment literal itself can act as the violation
+    indicator. For each interview type only the k candidates the objective
+    values most are kept (see candidate_weight), nearest to the applicant's
+    stated windows first among equal weights. The model has no shared
+    capacity, so the best candidate of each type always survives the cut.
+    """
+    slot_candidates = []
+    group_candidates = []
+    
+    for b, block in enumerate(blocks):
+        # Team mismatch: no recruiter of the applicant's teams (of any team, if the block is unstaffed)
+        team_violation = not team_ok[b]
+        
+        if block['type'] == 'individual':
+            for slot in block['slots']:
+                distance = availability_distance(applicant['parsed_availability'], (slot['start'], slot['end']))
+                slot_candidates.append({
+                    'block': block,
+                    'slot': slot,
+                    'distance': distance,
+                    'availability_violation': distance > 0,
+                    'team_violation': team_violation
+                })
+        else:  # group
+            for group in block['groups']:
+                distance = max(
+                    availability_distance(applicant['parsed_availability'], (group['slot1']['start'], group['slot1']['end'])),
+                    availability_distance(applicant['parsed_availability'], (group['slot2']['start'], group['slot2']['end']))
+                )
+                group_candidates.append({
+                    'block': block,
+                    'group': group,
+                    'distance': distance,
+                    'availability_violation': distance > 0,
+                    'team_violation': team_violation
+                })
+    
+    # Keep the k best-weighted candidates, nearest first among equal weights
+    def rank(candidate, kind):
+        start = candidate['slot']['start'] if 'slot' in candidate else candidate['group']['slot1']['start']
+        return (-candidate_weight(candidate, kind), candidate['distance'], start)
+    
+    slot_candidates = sorted(slot_candidates, key=lambda candidate: rank(candidate, 'individual'))[:k_nearest]
+    group_candidates = sorted(group_candidates, key=lambda candidate: rank(candidate, 'group'))[:k_nearest]
+    
+    return slot_candidates, group_candidates
+
+def candidate_weight(candidate, kind):
+    """Objective weight of a relaxed slot or group candidate, net of its violation penalties."""
+    # High priority: schedule applicants (weight 100), prioritizing high-priority groups (G1, G3)
+    weight = 200 if kind == 'group' and candidate['group']['priority'] == 'high' else 100
+    # Medium penalty: availability violations (weight -10)
+    if candidate['availability_violation']:
+        weight -= 10
+    # Low penalty: team violations (weight -5)
+    if candidate['team_violation']:
+        weight -= 5
+    return weight
+
+def relaxed_schedule_applicants(applicants, recruiter_assignments, blocks, unscheduled_ids, k_nearest=10, deadline=None,
+                                export_dir=None):
+    """Relaxed scheduling for unscheduled applicants - finds best possible assignments.
+    
+    Violations are not modeled as separate variables: a candidate that breaks
+    availability or team matching carries the penalty on its own assignment
+    literal, which is exact because each literal covers a single slot or group.
+    
+    The best-weight candidate of each applicant is picked greedily first and
+    hinted to CP-SAT, which runs until the deadline (a time.time() value); the
+    greedy pick is kept if the solver returns nothing. With export_dir, the
+    model is also written there for replay.py.
+    """
+    from ortools.sat.python import cp_model
     model = cp_model.CpModel()
     
     # Filter to only unscheduled applicants
+    unscheduled_ids = set(unscheduled_ids)
     unscheduled_applicants = [a for a in applicants if a['id'] in unscheduled_ids]
     
     if not unscheduled_applicants:
         return {}, [], []
     
-    # Decision variables with relaxed constraints
+    # Team bitmask of the recruiters staffing each block; a block without recruiters (e.g. one a
+    # strict run left empty, with --from-run) matches no team
+    block_masks = [
+        recruiters_mask(assignment['recruiter'] for assignment in recruiter_assignments.get(block['block_id'], []))
+        for block in blocks
+    ]
+    team_ok = team_match_matrix([applicant['team_mask'] for applicant in unscheduled_applicants], block_masks)
+    # Applicants without team preferences match any team, but not a block nobody staffs
+    for b, block in enumerate(blocks):
+        if not recruiter_assignments.get(block['block_id']):
+            team_ok[:, b] = False
+    
+    # Decision variables only for the pruned candidates of each applicant
     applicant_slot = {}
     applicant_group = {}
     
-    # Violation variables for constraint relaxation
-    availability_violations = {}
-    team_violations = {}
-    
-    # Create variables for individual slots and groups
     for a, applicant in enumerate(unscheduled_applicants):
-        for b, block in enumerate(blocks):
-            if block['type'] == 'individual':
-                for slot in block['slots']:
-                    var_name = f'app_{a}_slot_{slot["slot_id"]}'
-                    applicant_slot[(a, block['block_id'], slot['slot_id'])] = model.NewBoolVar(var_name)
-                    
-                    # Availability violation variable
-                    avail_var_name = f'avail_viol_{a}_slot_{slot["slot_id"]}'
-                    availability_violations[(a, block['block_id'], slot['slot_id'], 'slot')] = model.NewBoolVar(avail_var_name)
-                    
-                    # Team violation variable
-                    team_var_name = f'team_viol_{a}_slot_{slot["slot_id"]}'
-                    team_violations[(a, block['block_id'], slot['slot_id'], 'slot')] = model.NewBoolVar(team_var_name)
-                    
-            else:  # group block
-                for group in block['groups']:
-                    var_name = f'app_{a}_group_{group["group_id"]}'
-                    applicant_group[(a, block['block_id'], group['group_id'])] = model.NewBoolVar(var_name)
-                    
-                    # Availability violation variable
-                    avail_var_name = f'avail_viol_{a}_group_{group["group_id"]}'
-                    availability_violations[(a, block['block_id'], group['group_id'], 'group')] = model.NewBoolVar(avail_var_name)
-                    
-                    # Team violation variable
-                    team_var_name = f'team_viol_{a}_group_{group["group_id"]}'
-                    team_violations[(a, block['block_id'], group['group_id'], 'group')] = model.NewBoolVar(team_var_name)
+        slot_candidates, group_candidates = relaxed_candidates(applicant, blocks, team_ok[a], k_nearest)
+        
+        applicant_slot[a] = []
+        for candidate in slot_candidates:
+            var = model.NewBoolVar(f'app_{a}_slot_{candidate["slot"]["slot_id"]}')
+            applicant_slot[a].append((var, candidate))
+        
+        applicant_group[a] = []
+        for candidate in group_candidates:
+            var = model.NewBoolVar(f'app_{a}_group_{candidate["group"]["group_id"]}')
+            applicant_group[a].append((var, candidate))
     
     # Constraint 1: Each applicant assigned to at most one individual slot and one group
-    for a, applicant in enumerate(unscheduled_applicants):
-        # At most one individual slot
-        individual_assignments = []
-        for b, block in enumerate(blocks):
-            if block['type'] == 'individual':
-                for slot in block['slots']:
-                    if (a, block['block_id'], slot['slot_id']) in applicant_slot:
-                        individual_assignments.append(applicant_slot[(a, block['block_id'], slot['slot_id'])])
-        if individual_assignments:
-            model.Add(sum(individual_assignments) <= 1)
-        
-        # At most one group
-        group_assignments = []
-        for b, block in enumerate(blocks):
-            if block['type'] == 'group':
-                for group in block['groups']:
-                    if (a, block['block_id'], group['group_id']) in applicant_group:
-                        group_assignments.append(applicant_group[(a, block['block_id'], group['group_id'])])
-        if group_assignments:
-            model.Add(sum(group_assignments) <= 1)
-    
-    # Relaxed availability constraints
-    for a, applicant in enumerate(unscheduled_applicants):
-        for b, block in enumerate(blocks):
-            if block['type'] == 'individual':
-                for slot in block['slots']:
-                    if (a, block['block_id'], slot['slot_id']) in applicant_slot:
-                        available = any_interval_contains(applicant['parsed_availability'], (slot['start'], slot['end']))
-                        assignment_var = applicant_slot[(a, block['block_id'], slot['slot_id'])]
-                        violation_var = availability_violations[(a, block['block_id'], slot['slot_id'], 'slot')]
-                        
-                        if not available:
-                            # If not available, assignment implies violation
-                            model.Add(assignment_var <= violation_var)
-                        else:
-                            # If available, no violation
-                            model.Add(violation_var == 0)
-            else:  # group
-                for group in block['groups']:
-                    if (a, block['block_id'], group['group_id']) in applicant_group:
-                        available1 = any_interval_contains(applicant['parsed_availability'], 
-                                                         (group['slot1']['start'], group['slot1']['end']))
-                        available2 = any_interval_contains(applicant['parsed_availability'], 
-                                                         (group['slot2']['start'], group['slot2']['end']))
-                        assignment_var = applicant_group[(a, block['block_id'], group['group_id'])]
-                        violation_var = availability_violations[(a, block['block_id'], group['group_id'], 'group')]
-                        
-                        if not (available1 and available2):
-                            # If not available for both slots, assignment implies violation
-                            model.Add(assignment_var <= violation_var)
-                        else:
-                            # If available for both, no violation
-                            model.Add(violation_var == 0)
-    
-    # Relaxed team matching constraints
-    for a, applicant in enumerate(unscheduled_applicants):
-        if not applicant['teams']:  # Skip if no team preferences
-            continue
-            
-        for b, block in enumerate(blocks):
-            block_id = block['block_id']
-            if block_id in recruiter_assignments:
-                # Get teams of recruiters assigned to this block
-                recruiter_teams = {assignment['recruiter']['team'] for assignment in recruiter_assignments[block_id]}
-                
-                # Check if applicant has any matching team
-                has_matching_team = bool(applicant['teams'].intersection(recruiter_teams))
-                
-                if not has_matching_team:
-                    # Team mismatch - assignment implies violation
-                    if block['type'] == 'individual':
-                        for slot in block['slots']:
-                            if (a, block_id, slot['slot_id']) in applicant_slot:
-                                assignment_var = applicant_slot[(a, block_id, slot['slot_id'])]
-                                violation_var = team_violations[(a, block_id, slot['slot_id'], 'slot')]
-                                model.Add(assignment_var <= violation_var)
-                    else:  # group
-                        for group in block['groups']:
-                            if (a, block_id, group['group_id']) in applicant_group:
-                                assignment_var = applicant_group[(a, block_id, group['group_id'])]
-                                violation_var = team_violations[(a, block_id, group['group_id'], 'group')]
-                                model.Add(assignment_var <= violation_var)
-                else:
-                    # Team match - no violation
-                    if block['type'] == 'individual':
-                        for slot in block['slots']:
-                            if (a, block_id, slot['slot_id']) in applicant_slot:
-                                violation_var = team_violations[(a, block_id, slot['slot_id'], 'slot')]
-                                model.Add(violation_var == 0)
-                    else:  # group
-                        for group in block['groups']:
-                            if (a, block_id, group['group_id']) in applicant_group:
-                                violation_var = team_violations[(a, block_id, group['group_id'], 'group')]
-                                model.Add(violation_var == 0)
+    for a in applicant_slot:
+        if applicant_slot[a]:
+            model.AddAtMostOne(var for var, _ in applicant_slot[a])
+        if applicant_group[a]:
+            model.AddAtMostOne(var for var, _ in applicant_group[a])
     
     # Objective: Maximize scheduled applicants, minimize violations
     objective_terms = []
     
-    # High priority: schedule applicants (weight 100)
-    for a, applicant in enumerate(unscheduled_applicants):
-        for b, block in enumerate(blocks):
-            if block['type'] == 'individual':
-                for slot in block['slots']:
-                    if (a, block['block_id'], slot['slot_id']) in applicant_slot:
-                        objective_terms.append(100 * applicant_slot[(a, block['block_id'], slot['slot_id'])])
-            else:  # group
-                for group in block['groups']:
-                    if (a, block['block_id'], group['group_id']) in applicant_group:
-                        # Prioritize high-priority groups (G1, G3)
-                        weight = 200 if group['priority'] == 'high' else 100
-                        objective_terms.append(weight * applicant_group[(a, block['block_id'], group['group_id'])])
-    
-    # Medium penalty: availability violations (weight -10)
-    for violation_var in availability_violations.values():
-        objective_terms.append(-10 * violation_var)
-    
-    # Low penalty: team violations (weight -5)
-    for violation_var in team_violations.values():
-        objective_terms.append(-5 * violation_var)
+    for a in applicant_slot:
+        for var, candidate in applicant_slot[a]:
+            objective_terms.append(candidate_weight(candidate, 'individual') * var)
+        for var, candidate in applicant_group[a]:
+            objective_terms.append(candidate_weight(candidate, 'group') * var)
     
     model.Maximize(sum(objective_terms))
     
+    candidate_count = sum(len(applicant_slot[a]) + len(applicant_group[a]) for a in applicant_slot)
+    print(f"Relaxed model: {candidate_count} assignment variables for {len(unscheduled_applicants)} applicants")
+    
+    # Greedy pick: with no shared capacity, each applicant's best slot and group are independent
+    greedy_vars = set()
+    for a in applicant_slot:
+        for kind, options in [('individual', applicant_slot[a]), ('group', applicant_group[a])]:
+            if options:
+                best_var, _ = max(options, key=lambda option: candidate_weight(option[1], kind))
+                greedy_vars.add(best_var.Index())
+    for a in applicant_slot:
+        for var, _ in applicant_slot[a] + applicant_group[a]:
+            model.AddHint(var, var.Index() in greedy_vars)
+    
+    if export_dir:
+        from model_export import export_model
+        export_model(model, export_dir, 'relaxed', {
+            'applicant_slot': {(a, candidate['block']['block_id'], candidate['slot']['slot_id']): var
+                               for a in applicant_slot for var, candidate in applicant_slot[a]},
+            'applicant_group': {(a, candidate['block']['block_id'], candidate['group']['group_id']): var
+                                for a in applicant_group for var, candidate in applicant_group[a]}
+        }, {'applicants': [applicant['id'] for applicant in unscheduled_applicants]})
+    
     # Solve
     solver = cp_model.CpSolver()
-    status = solver.Solve(model)
+    status = None
+    if deadline is None:
+        status = solver.Solve(model)
+    elif deadline > time.time():
+        solver.parameters.max_time_in_seconds = deadline - time.time()
+        status = solver.Solve(model)
+    
+    if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
+        chosen = {var.Index() for a in applicant_slot for var, _ in applicant_slot[a] + applicant_group[a]
+                  if solver.Value(var) == 1}
+    else:
+        print("Relaxed solver found no solution in time; keeping the greedy pick")
+        chosen = greedy_vars
     
     # Extract solution
     relaxed_assignments = {}
     violations = []
     still_unscheduled = []
     
-    if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
-        scheduled_in_relaxed = set()
-        
-        # Extract individual slot assignments
-        for a, applicant in enumerate(unscheduled_applicants):
-            for b, block in enumerate(blocks):
-                if block['type'] == 'individual':
-                    for slot in block['slots']:
-                        if (a, block['block_id'], slot['slot_id']) in applicant_slot and \
-                           solver.Value(applicant_slot[(a, block['block_id'], slot['slot_id'])]) == 1:
-                            relaxed_assignments[applicant['id']] = {
-                                'type': 'individual',
-                                'block_id': block['block_id'],
-                                'slot_id': slot['slot_id'],
-                                'slot': slot
-                            }
-                            scheduled_in_relaxed.add(applicant['id'])
-                            
-                            # Check for violations
-                            if solver.Value(availability_violations[(a, block['block_id'], slot['slot_id'], 'slot')]) == 1:
-                                violations.append(f"Availability violation: {applicant['id']} in slot {slot['slot_id']}")
-                            if solver.Value(team_violations[(a, block['block_id'], slot['slot_id'], 'slot')]) == 1:
-                                violations.append(f"Team mismatch: {applicant['id']} in slot {slot['slot_id']}")
-        
-        # Extract group assignments
-        for a, applicant in enumerate(unscheduled_applicants):
-            for b, block in enumerate(blocks):
-                if block['type'] == 'group':
-                    for group in block['groups']:
-                        if (a, block['block_id'], group['group_id']) in applicant_group and \
-                           solver.Value(applicant_group[(a, block['block_id'], group['group_id'])]) == 1:
-                            if applicant['id'] not in relaxed_assignments:
-                                relaxed_assignments[applicant['id']] = {}
-                            relaxed_assignments[applicant['id']].update({
-                                'group_type': 'group',
-                                'group_block_id': block['block_id'],
-                                'group_id': group['group_id'],
-                                'group': group
-                            })
-                            scheduled_in_relaxed.add(applicant['id'])
-                            
-                            # Check for violations
-                            if solver.Value(availability_violations[(a, block['block_id'], group['group_id'], 'group')]) == 1:
-                                violations.append(f"Availability violation: {applicant['id']} in group {group['group_id']}")
-                            if solver.Value(team_violations[(a, block['block_id'], group['group_id'], 'group')]) == 1:
-                                violations.append(f"Team mismatch: {applicant['id']} in group {group['group_id']}")
+    scheduled_in_relaxed = set()
+    
+    for a, applicant in enumerate(unscheduled_applicants):
+        # Extract individual slot assignment
+        for var, candidate in applicant_slot[a]:
+            if var.Index() in chosen:
+                slot = candidate['slot']
+                relaxed_assignments[applicant['id']] = {
+                    'type': 'individual',
+                    'block_id': candidate['block']['block_id'],
+                    'slot_id': slot['slot_id'],
+                    'slot': slot
+                }
+                scheduled_in_relaxed.add(applicant['id'])
+                
+                # Check for violations
+                if candidate['availability_violation']:
+                    violations.append(f"Availability violation: {applicant['id']} in slot {slot['slot_id']}")
+                if candidate['team_violation']:
+                    violations.append(f"Team mismatch: {applicant['id']} in slot {slot['slot_id']}")
         
-        # Find still unscheduled applicants
-        for applicant in unscheduled_applicants:
-            if applicant['id'] not in scheduled_in_relaxed:
-                still_unscheduled.append(applicant['id'])
+        # Extract group assignment
+        for var, candidate in applicant_group[a]:
+            if var.Index() in chosen:
+                group = candidate['group']
+                if applicant['id'] not in relaxed_assignments:
+                    relaxed_assignments[applicant['id']] = {}
+                relaxed_assignments[applicant['id']].update({
+                    'group_type': 'group',
+                    'group_block_id': candidate['block']['block_id'],
+                    'group_id': group['group_id'],
+                    'group': group
+                })
+                scheduled_in_relaxed.add(applicant['id'])
+                
+                # Check for violations
+                if candidate['availability_violation']:
+                    violations.append(f"Availability violation: {applicant['id']} in group {group['group_id']}")
+                if candidate['team_violation']:
+                    violations.append(f"Team mismatch: {applicant['id']} in group {group['group_id']}")
+    
+    # Find still unscheduled applicants
+    for applicant in unscheduled_applicants:
+        if applicant['id'] not in scheduled_in_relaxed:
+            still_unscheduled.append(applicant['id'])
     
     return relaxed_assignments, violations, still_unscheduled
 
-def write_relaxed_output(relaxed_assignments, violations, still_unscheduled, 
-                        all_applicants, output_prefix="relaxed_schedule"):
-    """Write relaxed scheduling output files."""
-    
-    # 1. Relaxed applicant schedule
+def relaxed_applicant_rows(relaxed_assignments, all_applicants):
+    """Build relaxed applicant schedule rows in the applicants_schedule.csv layout."""
+    applicants_by_id = {a['id']: a for a in all_applicants}
     applicant_rows = []
     for app_id, assignment in relaxed_assignments.items():
-        applicant = next(a for a in all_applicants if a['id'] == app_id)
+        applicant = applicants_by_id[app_id]
         row = {
             'applicant_id': app_id,
             'applicant_name': applicant['name'],
-            'teams': ','.join(applicant['teams']) if applicant['teams'] else 'None'
+            'teams': ','.join(team for team in TEAMS if team in applicant['teams']) if applicant['teams'] else 'None'
         }
         
         # Individual slot info
@@ -293,6 +297,15 @@ def write_relaxed_output(relaxed_assignments, violations, still_unscheduled,
         
         applicant_rows.append(row)
     
+    return applicant_rows
+
+def write_relaxed_output(relaxed_assignments, violations, still_unscheduled, 
+                        all_applicants, output_prefix="relaxed_schedule"):
+    """Write relaxed scheduling output files."""
+    
+    # 1. Relaxed applicant schedule
+    applicant_rows = relaxed_applicant_rows(relaxed_assignments, all_applicants)
+    
     with open(f'{output_prefix}_applicants.csv', 'w', newline='') as f:
         if applicant_rows:
             writer = csv.DictWriter(f, fieldnames=applicant_rows[0].keys())
@@ -324,20 +337,38 @@ def write_relaxed_output(relaxed_assignments, violations, still_unscheduled,
 def main():
     parser = argparse.ArgumentParser(description='Relaxed scheduler for unscheduled applicants')
     parser.add_argument('--input-dir', default='.', help='Input directory containing CSV files')
-    parser.add_argument('--unscheduled-file', default='schedule_unscheduled.csv', help='File with unscheduled applicants')
+    parser.add_argument('--unscheduled-file', default=None,
+                        help='File with unscheduled applicants (default: schedule_unscheduled.csv, or the run\'s unscheduled_applicants.csv with --from-run)')
+    parser.add_argument('--from-run', default=None,
+                        help='Run directory whose recruiters_schedule.csv is reused instead of re-solving recruiters')
     parser.add_argument('--output', default='relaxed_schedule', help='Output file prefix')
+    parser.add_argument('--k-nearest', type=int, default=10,
+                        help='Candidate slots/groups kept per applicant: highest objective weight first, nearest to their stated availability among equal weights')
+    parser.add_argument('--time-budget', type=float, default=None,
+                        help='Wall-clock seconds for the relaxed solve; the greedy pick is kept if it runs out')
+    parser.add_argument('--export-model', default=None, metavar='DIR',
+                        help='Also write every CP-SAT model to this directory as a protobuf plus a mapping file (see replay.py)')
     
     args = parser.parse_args()
+    deadline = time.time() + args.time_budget if args.time_budget else None
     
     # Load input files
     print("Loading input files...")
     applicants = load_applicants(os.path.join(args.input_dir, 'applicant_info.csv'))
     recruiters = load_recruiters(os.path.join(args.input_dir, 'recruiters.csv'))
-    blocks = load_blocks(os.path.join(args.input_dir, 'blocks.csv'))
     rooms = load_rooms(os.path.join(args.input_dir, 'rooms.csv'))
+    blocks = load_blocks(os.path.join(args.input_dir, 'blocks.csv'), rooms, recruiters)
     
     # Load unscheduled applicants
-    unscheduled_df = pd.read_csv(args.unscheduled_file)
+    unscheduled_file = args.unscheduled_file
+    if unscheduled_file is None:
+        if args.from_run:
+            unscheduled_file = os.path.join(args.from_run, 'schedules', 'unscheduled_applicants.csv')
+        else:
+            unscheduled_file = 'schedule_unscheduled.csv'
+    # Imported here so --help and argument errors do not wait for pandas
+    import pandas as pd
+    unscheduled_df = pd.read_csv(unscheduled_file)
     unscheduled_ids = unscheduled_df['applicant_id'].tolist()
     
     print(f"Loaded {len(applicants)} applicants, {len(unscheduled_ids)} unscheduled")
@@ -346,14 +377,21 @@ def main():
         print("No unscheduled applicants to process.")
         return
     
-    # Schedule recruiters (same as main scheduler)
-    print("Scheduling recruiters to blocks...")
-    recruiter_assignments = schedule_recruiters(recruiters, blocks, rooms)
+    if args.from_run:
+        # Reuse the strict run's recruiter plan so both passes agree
+        recruiter_file = os.path.join(args.from_run, 'schedules', 'recruiters_schedule.csv')
+        print(f"Loading recruiter assignments from {recruiter_file}...")
+        recruiter_assignments = load_recruiter_assignments(recruiter_file, recruiters, blocks, rooms)
+        print(f"Loaded recruiters for {len(recruiter_assignments)} blocks")
+    else:
+        # Schedule recruiters (same as main scheduler)
+        print("Scheduling recruiters to blocks...")
+        recruiter_assignments = schedule_recruiters(recruiters, blocks, rooms, args.export_model)
     
     # Relaxed scheduling for unscheduled applicants
     print("Running relaxed scheduling for unscheduled applicants...")
     relaxed_assignments, violations, still_unscheduled = relaxed_schedule_applicants(
-        applicants, recruiter_assignments, blocks, unscheduled_ids)
+        applicants, recruiter_assignments, blocks, unscheduled_ids, args.k_nearest, deadline, args.export_model)
     
     print(f"Relaxed scheduling results:")
     print(f"  - {len(relaxed_assignments)} applicants scheduled in relaxed mode")
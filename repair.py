@@ -0,0 +1,247 @@
+import argparse
+import csv
+import json
+import os
+import time
+from typing import List, Dict, Set, Tuple
+from autoscheduler import (
+    load_applicants, load_recruiters, load_blocks, load_rooms, load_applicant_assignments, parse_policy,
+    snapshot_inputs
+)
+from feasibility import screening_reason, windows_overlap, group_windows
+from neighborhood import placement_usage, merge_neighborhood, solve_neighborhood
+from run_history import record_run
+from whatif_server import ScheduleState, REASON_WITHDRAWN
+
+REPAIR_REPORT_COLUMNS = ['applicant_id', 'action', 'old_slot_id', 'old_group_id', 'new_slot_id', 'new_group_id']
+
+def load_changes(changes_arg: str) -> List[Dict]:
+    """Parse --changes as inline JSON or a path to a JSON file holding one change or a list of them."""
+    if os.path.exists(changes_arg):
+        with open(changes_arg) as f:
+            changes = json.load(f)
+    else:
+        changes = json.loads(changes_arg)
+    return changes if isinstance(changes, list) else [changes]
+
+def apply_changes(state: ScheduleState, changes: List[Dict]) -> Set[str]:
+    """Apply a change set to the state, returning the placed applicants it affects.
+    
+    Affected applicants are the ones Round 2 can no longer staff with a
+    recruiter of their teams; withdrawn applicants are simply dropped.
+    """
+    affected = set()
+    for change in changes:
+        result = state.apply_change(change)
+        affected.update(result.get('unstaffed', []))
+    return affected - state.withdrawn
+
+def repair_neighborhood(state: ScheduleState, affected: Set[str]) -> List[Dict]:
+    """Applicants a repair may move, sized by the change rather than the cohort.
+    
+    That is the affected applicants plus whoever holds a slot or a full group
+    one of them could move into, staffed by a recruiter of their teams.
+    """
+    slot_holders = {}
+    group_holders = {}
+    for app_id, assignment in state.applicant_assignments.items():
+        if assignment.get('individual_slot_id'):
+            slot_holders[(assignment['individual_block_id'], assignment['individual_slot_id'])] = app_id
+        if assignment.get('group_id'):
+            group_holders.setdefault((assignment['group_block_id'], assignment['group_id']), []).append(app_id)
+    
+    selected = set(affected)
+    for app_id in affected:
+        feasibility = state.feasibility[app_id]
+        for key in feasibility['pair_slots'] & feasibility['team_slots']:
+            if key in slot_holders:
+                selected.add(slot_holders[key])
+        for key in feasibility['pair_groups'] & feasibility['team_groups']:
+            if len(group_holders.get(key, [])) >= state.policy['group_capacity']:
+                selected.update(group_holders[key])
+    
+    return [applicant for applicant in state.applicants
+            if applicant['id'] in selected and not screening_reason(applicant, state.feasibility[applicant['id']])]
+
+def backfill(state: ScheduleState, freed_units: Set[Tuple]) -> List[str]:
+    """Greedily give capacity the repair freed up to unscheduled applicants who can use it.
+    
+    As in greedy_applicants_first, the most constrained applicants go first and
+    take the free pair whose group is fullest, then the earliest slot. Placed
+    applicants never move, so this is a cheap pass rather than a solve.
+    """
+    slot_usage, group_usage = placement_usage(state.applicant_assignments)
+    candidates = [
+        applicant for applicant in state.applicants
+        if applicant['id'] not in state.applicant_assignments and applicant['id'] not in state.withdrawn
+        and not screening_reason(applicant, state.feasibility[applicant['id']])
+        and freed_units & (state.feasibility[applicant['id']]['pair_slots'] | state.feasibility[applicant['id']]['pair_groups'])
+    ]
+    
+    placed = []
+    for applicant in sorted(candidates, key=lambda a: len(state.feasibility[a['id']]['pair_slots'])):
+        feasibility = state.feasibility[applicant['id']]
+        pairs = []
+        for slot_key in sorted(feasibility['pair_slots']):
+            if slot_usage.get(slot_key, 0) >= 1:
+                continue
+            slot_block, slot = state.slots[slot_key[1]]
+            for group_key in sorted(feasibility['pair_groups']):
+                if group_usage.get(group_key, 0) >= state.policy['group_capacity']:
+                    continue
+                group_block, group = state.groups[group_key[1]]
+                if slot_block['date'] != group_block['date']:
+                    continue
+                if any(windows_overlap((slot['start'], slot['end']), win) for win in group_windows(group)):
+                    continue
+                pairs.append((slot_key, group_key))
+        if not pairs:
+            continue
+        
+        slot_key, group_key = min(pairs, key=lambda pair: (-group_usage.get(pair[1], 0), state.slots[pair[0][1]][1]['start']))
+        state.applicant_assignments[applicant['id']] = state.proposed_assignment(applicant['id'], slot_key[1], group_key[1])
+        slot_usage[slot_key] = 1
+        group_usage[group_key] = group_usage.get(group_key, 0) + 1
+        placed.append(applicant['id'])
+    return placed
+
+def repair_schedule(state: ScheduleState, changes: List[Dict], move_penalty: int = 10,
+                    time_limit: float = 10.0) -> List[Dict]:
+    """Apply a change set and re-place only the neighborhood it disturbs.
+    
+    Everyone outside the neighborhood keeps their placement exactly; inside
+    it, move_penalty is paid for every slot or group an already placed
+    applicant is moved out of. Affected applicants only get units a recruiter
+    of their teams is still available for. Capacity left free afterwards is
+    backfilled. Returns one report row per applicant whose placement changed,
+    plus affected applicants Round 2 still cannot staff ('unstaffed').
+    """
+    before = dict(state.applicant_assignments)
+    slot_usage_before, group_usage_before = placement_usage(before)
+    affected = apply_changes(state, changes)
+    applicants = repair_neighborhood(state, affected)
+    free_ids = {applicant['id'] for applicant in applicants} | affected
+    print(f"Changes affect {len(affected)} placed applicants; re-solving a neighborhood of {len(applicants)}")
+    
+    # Affected applicants are not rewarded for staying where Round 2 could not staff them
+    unaffected_assignments = {app_id: assignment for app_id, assignment in state.applicant_assignments.items()
+                              if app_id not in affected}
+    placements = solve_neighborhood(applicants, state.blocks, state.feasibility, unaffected_assignments,
+                                    state.policy, keep_weight=move_penalty, time_limit=time_limit,
+                                    team_covered=affected)
+    if placements is None:
+        # No repair found in time: affected applicants lose their placement, nobody else moves
+        print("⚠️  No repair found within the time limit; unscheduling the affected applicants")
+        placements = {}
+        free_ids = affected
+    state.applicant_assignments = merge_neighborhood(state.applicant_assignments, free_ids, placements)
+    
+    slot_usage, group_usage = placement_usage(state.applicant_assignments)
+    freed_units = {key for key, count in slot_usage_before.items() if slot_usage.get(key, 0) < count}
+    freed_units |= {key for key, count in group_usage_before.items() if group_usage.get(key, 0) < count}
+    backfilled = backfill(state, freed_units)
+    print(f"Backfilled {len(backfilled)} unscheduled applicants into {len(freed_units)} freed slots and groups")
+    
+    # Team coverage of a unit does not mean Round 2 has a free recruiter left for it, so re-check
+    still_unstaffed = [app_id for app_id in state.unstaffed() if app_id in affected]
+    if still_unstaffed:
+        print(f"⚠️  {len(still_unstaffed)} affected applicants still have no recruiter of their teams: {', '.join(still_unstaffed)}")
+    
+    report = []
+    for applicant in state.applicants:
+        app_id = applicant['id']
+        old, new = before.get(app_id, {}), state.applicant_assignments.get(app_id, {})
+        old_units = (old.get('individual_slot_id'), old.get('group_id'))
+        new_units = (new.get('individual_slot_id'), new.get('group_id'))
+        if old_units == new_units and app_id not in still_unstaffed:
+            continue
+        if app_id in state.withdrawn:
+            action = REASON_WITHDRAWN
+        elif not new:
+            action = 'unscheduled'
+        elif not old:
+            action = 'scheduled'
+        elif app_id in still_unstaffed:
+            action = 'unstaffed'
+        elif app_id in affected:
+            action = 'rescheduled'
+        else:
+            action = 'moved'
+        report.append({
+            'applicant_id': app_id,
+            'action': action,
+            'old_slot_id': old_units[0] or '',
+            'old_group_id': old_units[1] or '',
+            'new_slot_id': new_units[0] or '',
+            'new_group_id': new_units[1] or ''
+        })
+    return report
+
+def write_repair_report(report: List[Dict], path: str):
+    """Write the per-applicant changes of a repair to CSV."""
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=REPAIR_REPORT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(report)
+
+def main():
+    parser = argparse.ArgumentParser(description='Repair a prior run after recruiter or applicant changes')
+    parser.add_argument('--from-run', required=True, help='Run directory with schedules/ to repair')
+    parser.add_argument('--changes', required=True,
+                        help='JSON change (or list, or file): {"change": "withdraw", "applicant_id": ...} or '
+                             '{"change": "recruiter_unavailable", "recruiter_id": ..., "start": ..., "end": ...}')
+    parser.add_argument('--input-dir', default=None, help='Input directory (default: the run\'s inputs/ snapshot)')
+    parser.add_argument('--output-dir', default='results', help='Output directory for the repaired run')
+    parser.add_argument('--policy', default=None, help='Round 1 policy overrides as JSON or a JSON file (see DEFAULT_POLICY)')
+    parser.add_argument('--move-penalty', type=int, default=10,
+                        help='Objective cost of moving an unaffected applicant out of a slot or group')
+    parser.add_argument('--time-limit', type=float, default=10.0, help='Solver time limit in seconds')
+    parser.add_argument('--history-db', default=None, help='Run history database (default: <output-dir>/run_history.sqlite)')
+    parser.add_argument('--no-history', action='store_true', help='Do not record the run in the history database')
+    
+    args = parser.parse_args()
+    policy = parse_policy(args.policy)
+    changes = load_changes(args.changes)
+    input_dir = args.input_dir or os.path.join(args.from_run, 'inputs')
+    
+    print(f"Loading input files from {input_dir}...")
+    applicants = load_applicants(os.path.join(input_dir, 'applicant_info.csv'))
+    recruiters = load_recruiters(os.path.join(input_dir, 'recruiters.csv'))
+    rooms = load_rooms(os.path.join(input_dir, 'rooms.csv'))
+    blocks = load_blocks(os.path.join(input_dir, 'blocks.csv'), rooms, recruiters)
+    applicant_assignments = load_applicant_assignments(
+        os.path.join(args.from_run, 'schedules', 'applicants_schedule.csv'), applicants, blocks)
+    print(f"Loaded {len(applicant_assignments)} assignments from {args.from_run}")
+    
+    state = ScheduleState(applicants, recruiters, blocks, rooms, applicant_assignments, policy)
+    
+    start = time.time()
+    report = repair_schedule(state, changes, args.move_penalty, args.time_limit)
+    repair_seconds = time.time() - start
+    
+    print("\nWriting output files...")
+    run_dir = state.save(args.output_dir)
+    snapshot_inputs(run_dir, input_dir)
+    with open(os.path.join(run_dir, 'inputs', 'changes.json'), 'w') as f:
+        json.dump(changes, f, indent=2)
+    write_repair_report(report, os.path.join(run_dir, 'summaries', 'repair_report.csv'))
+    
+    if not args.no_history:
+        history_db = args.history_db or os.path.join(args.output_dir, 'run_history.sqlite')
+        record_run(history_db, run_dir, params={'command': 'repair', 'from_run': args.from_run, 'changes': changes,
+                                                'policy': policy, 'move_penalty': args.move_penalty},
+                   metrics={'solve_seconds': round(repair_seconds, 3)})
+        print(f"Run recorded in {history_db}")
+    
+    action_counts = {}
+    for row in report:
+        action_counts[row['action']] = action_counts.get(row['action'], 0) + 1
+    print(f"\nRepair finished in {repair_seconds:.2f}s:")
+    for action, count in sorted(action_counts.items()):
+        print(f"  - {action}: {count}")
+    print(f"  - unchanged: {len(applicants) - len(report)}")
+    print(f"Repaired schedule: {json.dumps(state.summary())}")
+    print(f"Results saved to: {run_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import argparse
+import csv
+import json
+import os
+import statistics
+from typing import List, Dict
+from ortools.sat.python import cp_model
+from model_export import load_model, MODEL_SUFFIX, MAPPING_SUFFIX
+
+REPLAY_COLUMNS = ['run', 'random_seed', 'status', 'objective', 'best_bound', 'wall_seconds', 'branches', 'conflicts']
+
+def parse_params(params_arg: str) -> Dict:
+    """Parse --params as inline JSON or a path to a JSON file of CP-SAT parameters."""
+    if not params_arg:
+        return {}
+    if os.path.exists(params_arg):
+        with open(params_arg) as f:
+            return json.load(f)
+    return json.loads(params_arg)
+
+def replay_model(model: cp_model.CpModel, params: Dict = None, runs: int = 5, seed: int = 0,
+                 vary_seed: bool = True) -> List[Dict]:
+    """Solve an exported model runs times under the same parameters, one row per solve.
+    
+    Each run gets random_seed seed + run unless vary_seed is off, so the timing
+    spread reflects the solver's sensitivity to search randomness.
+    """
+    rows = []
+    for run in range(runs):
+        solver = cp_model.CpSolver()
+        for name, value in (params or {}).items():
+            setattr(solver.parameters, name, value)
+        solver.parameters.random_seed = seed + run if vary_seed else seed
+        status = solver.Solve(model)
+        solved = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+        rows.append({
+            'run': run,
+            'random_seed': solver.parameters.random_seed,
+            'status': solver.StatusName(status),
+            'objective': solver.ObjectiveValue() if solved else None,
+            'best_bound': solver.BestObjectiveBound() if solved else None,
+            'wall_seconds': round(solver.WallTime(), 4),
+            'branches': solver.NumBranches(),
+            'conflicts': solver.NumConflicts()
+        })
+        print(f"  run {run}: {rows[-1]['status']} objective {rows[-1]['objective']} in {rows[-1]['wall_seconds']:.3f}s")
+    return rows
+
+def timing_summary(rows: List[Dict]) -> Dict:
+    """Distribution of wall times over replay runs."""
+    times = sorted(row['wall_seconds'] for row in rows)
+    statuses = {}
+    for row in rows:
+        statuses[row['status']] = statuses.get(row['status'], 0) + 1
+    return {
+        'runs': len(times),
+        'min': times[0],
+        'median': statistics.median(times),
+        'mean': round(statistics.mean(times), 4),
+        'p90': times[min(len(times) - 1, int(0.9 * len(times)))],
+        'max': times[-1],
+        'stdev': round(statistics.stdev(times), 4) if len(times) > 1 else 0.0,
+        'statuses': statuses
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Re-solve an exported CP-SAT model N times and report the timing distribution')
+    parser.add_argument('model', help=f'Model file written by --export-model (*{MODEL_SUFFIX})')
+    parser.add_argument('--runs', type=int, default=5, help='Number of solves')
+    parser.add_argument('--params', default=None,
+                        help='CP-SAT parameters as JSON or a JSON file, e.g. \'{"num_workers": 1, "max_time_in_seconds": 30}\'')
+    parser.add_argument('--seed', type=int, default=0, help='random_seed of the first run')
+    parser.add_argument('--same-seed', action='store_true', help='Use the same random_seed for every run')
+    parser.add_argument('--output', default=None, help='Optional CSV with one row per run')
+    
+    args = parser.parse_args()
+    params = parse_params(args.params)
+    
+    model = load_model(args.model)
+    mapping_file = args.model[:-len(MODEL_SUFFIX)] + MAPPING_SUFFIX if args.model.endswith(MODEL_SUFFIX) else None
+    proto = model.Proto()
+    print(f"Loaded {args.model}: {len(proto.variables)} variables, {len(proto.constraints)} constraints"
+          f"{' (mapping: ' + mapping_file + ')' if mapping_file and os.path.exists(mapping_file) else ''}")
+    print(f"Replaying {args.runs} runs with parameters {json.dumps(params)}")
+    
+    rows = replay_model(model, params, args.runs, args.seed, not args.same_seed)
+    summary = timing_summary(rows)
+    print(f"\nWall time over {summary['runs']} runs: min {summary['min']:.3f}s, median {summary['median']:.3f}s, "
+          f"mean {summary['mean']:.3f}s, p90 {summary['p90']:.3f}s, max {summary['max']:.3f}s (stdev {summary['stdev']:.3f}s)")
+    print(f"Statuses: {json.dumps(summary['statuses'])}")
+    
+    if args.output:
+        with open(args.output, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=REPLAY_COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"Runs written to: {args.output}")
+
+if __name__ == "__main__":
+    main()
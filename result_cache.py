@@ -0,0 +1,100 @@
+import csv
+import datetime as dt
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+import ortools
+
+# Schedule files a cache entry stores; a run directory is rebuilt from them
+CACHED_FILES = ['recruiters_schedule.csv', 'applicants_schedule.csv', 'unscheduled_applicants.csv']
+ENTRY_FILE = 'entry.json'
+# Summary of the run that filled the entry; a cache hit must write the same one
+SUMMARY_FILE = 'run_summary.txt'
+# Summary lines that name the run rather than describe its schedule
+RUN_SPECIFIC_PREFIXES = ('Run Date:', 'Output Directory:')
+
+# Modules whose code decides the schedule; editing any of them invalidates every entry
+SOLVER_MODULES = ['autoscheduler.py', 'feasibility.py', 'capacity.py', 'presolve.py', 'room_allocation.py']
+
+def normalized_csv_hash(path) -> str:
+    """SHA-256 of a CSV's cells with surrounding whitespace, blank lines and line endings normalized away.
+    
+    Row order is kept, since it decides tie-breaking in the solver.
+    """
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        rows = [[cell.strip() for cell in row] for row in csv.reader(f)]
+    rows = [row for row in rows if any(row)]
+    return hashlib.sha256(json.dumps(rows, ensure_ascii=False).encode()).hexdigest()
+
+def code_version() -> str:
+    """Hash of the solver modules' source and the OR-Tools version."""
+    digest = hashlib.sha256(ortools.__version__.encode())
+    source_dir = Path(__file__).resolve().parent
+    for name in SOLVER_MODULES:
+        digest.update(name.encode())
+        digest.update((source_dir / name).read_bytes())
+    return digest.hexdigest()
+
+def cache_key(input_dir, config: Dict, seed: int, blocks_file: str = 'blocks.csv') -> Dict:
+    """Key parts of a run and the combined key: normalized inputs, solver configuration, code version and seed."""
+    names = {'applicants': 'applicant_info.csv', 'recruiters': 'recruiters.csv',
+             'blocks': blocks_file, 'rooms': 'rooms.csv'}
+    parts = {
+        'inputs': {key: normalized_csv_hash(os.path.join(input_dir, name)) for key, name in names.items()},
+        'config': config,
+        'code_version': code_version(),
+        'seed': seed
+    }
+    parts['key'] = hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+    return parts
+
+def lookup(cache_dir, key: str) -> Path:
+    """Directory of the cache entry for key, or None on a miss."""
+    entry = Path(cache_dir) / key
+    if all((entry / name).exists() for name in CACHED_FILES + [ENTRY_FILE]):
+        return entry
+    return None
+
+def store(cache_dir, parts: Dict, run_dir) -> Path:
+    """Store a run's schedule files under its key.
+    
+    The entry is written to a temporary directory and renamed into place, so
+    a crash never leaves a half-written entry behind.
+    """
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    entry = cache_dir / parts['key']
+    staging = Path(tempfile.mkdtemp(dir=cache_dir, prefix='.staging_'))
+    for name in CACHED_FILES:
+        shutil.copyfile(Path(run_dir) / 'schedules' / name, staging / name)
+    shutil.copyfile(Path(run_dir) / 'summaries' / SUMMARY_FILE, staging / SUMMARY_FILE)
+    with open(staging / ENTRY_FILE, 'w') as f:
+        json.dump(dict(parts, source_run=Path(run_dir).name, created_at=dt.datetime.now().isoformat(timespec='seconds')),
+                  f, indent=2, default=str)
+    if entry.exists():
+        shutil.rmtree(entry)
+    os.replace(staging, entry)
+    return entry
+
+def entry_info(entry) -> Dict:
+    """Key parts and source run recorded with a cache entry."""
+    with open(Path(entry) / ENTRY_FILE) as f:
+        return json.load(f)
+
+def _summary_lines(path) -> List[str]:
+    with open(path) as f:
+        return [line for line in f if not line.startswith(RUN_SPECIFIC_PREFIXES)]
+
+def summary_matches(entry, run_dir) -> bool:
+    """Whether a run rebuilt from a cache entry wrote the same summary as the run that filled it.
+    
+    Run date and output directory are ignored; entries stored without a summary always match.
+    """
+    stored = Path(entry) / SUMMARY_FILE
+    if not stored.exists():
+        return True
+    return _summary_lines(stored) == _summary_lines(Path(run_dir) / 'summaries' / SUMMARY_FILE)
@@ -0,0 +1,156 @@
+import heapq
+import argparse
+import csv
+import os
+import time
+from typing import List, Dict, Tuple
+from columnar import write_artifact
+
+UNASSIGNED_ROOM = {'room_id': 'TBD'}
+
+SHORTAGE_COLUMNS = ['room_type', 'start', 'end', 'demand', 'rooms', 'block_id']
+
+def room_sessions(recruiter_assignments: Dict) -> List[Dict]:
+    """Sessions that each need a room of their own.
+    
+    Every recruiter in an individual block interviews in a separate room;
+    the recruiters of a group share one group room.
+    """
+    sessions = {}
+    for block_id, assignments in recruiter_assignments.items():
+        for assignment in assignments:
+            block = assignment['block']
+            if block['type'] == 'individual':
+                key = (block_id, assignment['recruiter']['id'])
+            else:  # group
+                key = (block_id, assignment.get('group_id'))
+            if key not in sessions:
+                sessions[key] = {
+                    'key': key,
+                    'block_id': block_id,
+                    'room_type': block['type'],
+                    'start': block['start'],
+                    'end': block['end'],
+                    'assignments': []
+                }
+            sessions[key]['assignments'].append(assignment)
+    return list(sessions.values())
+
+def allocate_rooms(sessions: List[Dict], rooms: List[Dict]) -> Tuple[Dict[Tuple, Dict], List[Dict]]:
+    """Assign rooms of the matching type to sessions with a sweep over start times.
+    
+    Per room type, sessions are taken in start order; rooms whose session has
+    ended go back on a free heap, so the lowest free room id is reused first.
+    That is O(n log n) in the number of sessions and never double-books a
+    room. Sessions that find no free room are reported as shortages, each with
+    the demand at that moment against the number of rooms of the type.
+    """
+    rooms_by_type = {}
+    for room in sorted(rooms, key=lambda room: room['room_id']):
+        rooms_by_type.setdefault(room['room_type'], []).append(room)
+    
+    sessions_by_type = {}
+    for session in sessions:
+        sessions_by_type.setdefault(session['room_type'], []).append(session)
+    
+    allocation = {}
+    shortages = []
+    for room_type, type_sessions in sessions_by_type.items():
+        type_rooms = rooms_by_type.get(room_type, [])
+        free = list(range(len(type_rooms)))  # room indices, already a valid heap
+        busy = []  # (end, room index)
+        overflow = []  # end times of sessions that got no room
+        
+        for session in sorted(type_sessions, key=lambda session: (session['start'], session['end'])):
+            while busy and busy[0][0] <= session['start']:
+                heapq.heappush(free, heapq.heappop(busy)[1])
+            while overflow and overflow[0] <= session['start']:
+                heapq.heappop(overflow)
+            
+            if free:
+                index = heapq.heappop(free)
+                heapq.heappush(busy, (session['end'], index))
+                allocation[session['key']] = type_rooms[index]
+            else:
+                heapq.heappush(overflow, session['end'])
+                shortages.append({
+                    'room_type': room_type,
+                    'start': session['start'],
+                    'end': session['end'],
+                    'demand': len(busy) + len(overflow),
+                    'rooms': len(type_rooms),
+                    'block_id': session['block_id']
+                })
+    
+    return allocation, shortages
+
+def assign_rooms(recruiter_assignments: Dict, rooms: List[Dict]) -> List[Dict]:
+    """Set the room of every recruiter assignment in place and return any room shortages.
+    
+    Assignments whose session found no free room keep room 'TBD'.
+    """
+    sessions = room_sessions(recruiter_assignments)
+    allocation, shortages = allocate_rooms(sessions, rooms)
+    for session in sessions:
+        room = allocation.get(session['key'], UNASSIGNED_ROOM)
+        for assignment in session['assignments']:
+            assignment['room'] = room
+    return shortages
+
+def print_shortages(shortages: List[Dict], limit: int = 10):
+    """Print room shortages, one line per session that could not get a room."""
+    if not shortages:
+        return
+    print(f"⚠️  {len(shortages)} sessions could not get a room:")
+    for shortage in shortages[:limit]:
+        print(f"  - {shortage['start'].strftime('%Y-%m-%d %H:%M')}-{shortage['end'].strftime('%H:%M')} "
+              f"{shortage['block_id']}: {shortage['demand']} {shortage['room_type']} sessions for {shortage['rooms']} rooms")
+    if len(shortages) > limit:
+        print(f"  ... and {len(shortages) - limit} more")
+
+def write_shortages(shortages: List[Dict], path: str):
+    """Write room shortages to CSV."""
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=SHORTAGE_COLUMNS)
+        writer.writeheader()
+        for shortage in shortages:
+            writer.writerow({**shortage, 'start': shortage['start'].strftime('%Y-%m-%d %H:%M:%S'),
+                             'end': shortage['end'].strftime('%Y-%m-%d %H:%M:%S')})
+
+def main():
+    # Imported here because autoscheduler imports this module
+    from autoscheduler import (load_recruiters, load_blocks, load_rooms, load_recruiter_assignments,
+                               recruiter_schedule_rows, RECRUITER_SCHEDULE_COLUMNS)
+    
+    parser = argparse.ArgumentParser(description='Reassign rooms for the recruiter schedule of an existing run')
+    parser.add_argument('run_path', help='Run directory with schedules/recruiters_schedule.csv')
+    parser.add_argument('--input-dir', default=None, help='Input directory (default: the run\'s inputs/ snapshot)')
+    
+    args = parser.parse_args()
+    input_dir = args.input_dir or os.path.join(args.run_path, 'inputs')
+    
+    recruiters = load_recruiters(os.path.join(input_dir, 'recruiters.csv'))
+    rooms = load_rooms(os.path.join(input_dir, 'rooms.csv'))
+    blocks = load_blocks(os.path.join(input_dir, 'blocks.csv'), rooms, recruiters)
+    schedule_file = os.path.join(args.run_path, 'schedules', 'recruiters_schedule.csv')
+    recruiter_assignments = load_recruiter_assignments(schedule_file, recruiters, blocks, rooms)
+    
+    start = time.time()
+    shortages = assign_rooms(recruiter_assignments, rooms)
+    print(f"Assigned rooms to {sum(len(a) for a in recruiter_assignments.values())} recruiter assignments "
+          f"in {time.time() - start:.3f}s")
+    print_shortages(shortages)
+    
+    with open(schedule_file, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=RECRUITER_SCHEDULE_COLUMNS)
+        writer.writeheader()
+        for row in recruiter_schedule_rows(recruiter_assignments, blocks):
+            writer.writerow(row)
+    write_artifact(schedule_file)
+    shortage_file = os.path.join(args.run_path, 'summaries', 'room_shortages.csv')
+    write_shortages(shortages, shortage_file)
+    print(f"Updated {schedule_file}")
+    print(f"Shortages written to: {shortage_file}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+from __future__ import annotations
+import os
+from typing import Dict, TYPE_CHECKING
+from columnar import read_artifact
+
+if TYPE_CHECKING:  # pandas is imported by the functions that use it, so report --help stays fast
+    import pandas as pd
+
+# Blocks file snapshotted into each run directory by autoscheduler.py / pipeline.py
+RUN_BLOCKS_FILE = os.path.join('inputs', 'blocks.csv')
+RUN_APPLICANTS_FILE = os.path.join('inputs', 'applicant_info.csv')
+
+PLACEMENT_COLUMNS = ['block_id', 'kind', 'unit_id', 'applicant_id', 'applicant_name', 'teams', 'scheduling_mode']
+
+def read_table(path) -> pd.DataFrame:
+    """Read a schedule or blocks CSV with every cell as a string and blanks as ''.
+    
+    A current columnar artifact next to the CSV is memory-mapped instead; its
+    timestamp columns come back typed.
+    """
+    import pandas as pd
+    table = read_artifact(path)
+    if table is not None:
+        return table
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+def run_blocks_file(run_path: str) -> str:
+    """Blocks file used to produce a run, as snapshotted in its inputs/ directory."""
+    path = os.path.join(run_path, RUN_BLOCKS_FILE)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"{path} not found; pass the blocks file explicitly for runs without an inputs/ snapshot")
+    return path
+
+def applicant_total(applicants_file: str, combined_schedule: pd.DataFrame, still_unscheduled_file: str) -> int:
+    """Applicants a run was scheduled for: the rows of its applicant_info.csv, or, without
+    one, the combined schedule plus the applicants still unscheduled after the relaxed pass."""
+    if os.path.exists(applicants_file):
+        return len(read_table(applicants_file))
+    still_unscheduled = read_table(still_unscheduled_file) if os.path.exists(still_unscheduled_file) else []
+    return combined_schedule['applicant_id'].nunique() + len(still_unscheduled)
+
+def _filled(series: pd.Series) -> pd.Series:
+    """Mask of non-blank cells, whether blanks were read as '' or NaN."""
+    return series.fillna('').astype(str) != ''
+
+def applicant_placements(schedule: pd.DataFrame) -> pd.DataFrame:
+    """One row per applicant placement in a block, with kind 'individual' or 'group'.
+    
+    unit_id is the individual slot or the group the applicant was placed in.
+    Schedules without a scheduling_mode column count as regular.
+    """
+    import pandas as pd
+    if 'scheduling_mode' not in schedule.columns:
+        schedule = schedule.assign(scheduling_mode='regular')
+    
+    base = ['applicant_id', 'applicant_name', 'teams', 'scheduling_mode']
+    individual = schedule.loc[_filled(schedule['individual_block_id']), base + ['individual_block_id', 'individual_slot_id']]
+    individual = individual.rename(columns={'individual_block_id': 'block_id', 'individual_slot_id': 'unit_id'})
+    group = schedule.loc[_filled(schedule['group_block_id']), base + ['group_block_id', 'group_id']]
+    group = group.rename(columns={'group_block_id': 'block_id', 'group_id': 'unit_id'})
+    
+    placements = pd.concat([individual.assign(kind='individual'), group.assign(kind='group')], ignore_index=True)
+    placements = placements[PLACEMENT_COLUMNS].fillna('').astype(str)
+    placements['teams'] = placements['teams'].where(placements['teams'] != '', 'None')
+    return placements
+
+def recruiter_summary(recruiter_schedule: pd.DataFrame) -> pd.DataFrame:
+    """Recruiter count and 'Name (Team)' list per block."""
+    import pandas as pd
+    labels = recruiter_schedule['recruiter_name'].astype(str) + ' (' + recruiter_schedule['team'].astype(str) + ')'
+    grouped = labels.groupby(recruiter_schedule['block_id'].astype(str), sort=False)
+    return pd.DataFrame({
+        'recruiter_count': grouped.size(),
+        'recruiters': grouped.agg('; '.join)
+    }).rename_axis('block_id').reset_index()
+
+def block_summary(blocks_df: pd.DataFrame, placements: pd.DataFrame, recruiter_schedule: pd.DataFrame = None) -> pd.DataFrame:
+    """Per-block recruiter and applicant counts, one row per block in blocks_df order."""
+    import pandas as pd
+    if recruiter_schedule is None:
+        recruiter_schedule = pd.DataFrame(columns=['block_id', 'recruiter_id', 'recruiter_name', 'team'])
+    summary = blocks_df[['block_id', 'block_type', 'date', 'start', 'end']].astype(str).reset_index(drop=True)
+    summary['start_time'] = summary['date'] + ' ' + summary['start'] + ':00'
+    summary['end_time'] = summary['date'] + ' ' + summary['end'] + ':00'
+    
+    # An applicant counts once per block, however many units they hold there
+    in_block = placements.drop_duplicates(['block_id', 'applicant_id'])
+    mode_counts = (in_block.groupby(['block_id', 'scheduling_mode']).size().unstack(fill_value=0)
+                   .reindex(columns=['regular', 'relaxed'], fill_value=0).add_suffix('_count'))
+    kind_counts = (placements.groupby(['block_id', 'kind']).size().unstack(fill_value=0)
+                   .reindex(columns=['individual', 'group'], fill_value=0).add_suffix('_count'))
+    
+    summary = summary.merge(recruiter_summary(recruiter_schedule), on='block_id', how='left')
+    summary = summary.merge(mode_counts.reset_index(), on='block_id', how='left')
+    summary = summary.merge(kind_counts.reset_index(), on='block_id', how='left')
+    
+    count_columns = ['recruiter_count', 'regular_count', 'relaxed_count', 'individual_count', 'group_count']
+    summary[count_columns] = summary[count_columns].fillna(0).astype(int)
+    summary['recruiters'] = summary['recruiters'].fillna('')
+    summary['total_count'] = summary['regular_count'] + summary['relaxed_count']
+    return summary
+
+def day_summary(summary: pd.DataFrame, recruiter_schedule: pd.DataFrame) -> pd.DataFrame:
+    """Per-date block, assignment and active recruiter counts."""
+    is_individual = summary['block_type'] == 'individual'
+    days = summary.assign(
+        individual_blocks=is_individual.astype(int),
+        group_blocks=(~is_individual).astype(int),
+        individual_assignments=summary['individual_count'].where(is_individual, 0),
+        group_assignments=summary['group_count'].where(~is_individual, 0)
+    ).groupby('date')[['individual_blocks', 'group_blocks', 'individual_assignments', 'group_assignments']].sum()
+    
+    block_dates = summary[['block_id', 'date']]
+    staffed = recruiter_schedule[['block_id', 'recruiter_id']].astype(str).merge(block_dates, on='block_id')
+    days['recruiters'] = staffed.groupby('date')['recruiter_id'].nunique()
+    days['recruiters'] = days['recruiters'].fillna(0).astype(int)
+    return days.sort_index().reset_index()
+
+def unit_members(placements: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """Placements of each block sorted by slot/group, keyed by block id for rendering."""
+    ordered = placements.sort_values(['block_id', 'unit_id'], kind='stable')
+    return {block_id: members for block_id, members in ordered.groupby('block_id', sort=False)}
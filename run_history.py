@@ -0,0 +1,284 @@
+import sqlite3
+import hashlib
+import argparse
+import csv
+import json
+import os
+import time
+import uuid
+import datetime as dt
+from pathlib import Path
+from typing import List, Dict
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    run_dir TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    input_hash TEXT,
+    applicants_hash TEXT,
+    recruiters_hash TEXT,
+    blocks_hash TEXT,
+    rooms_hash TEXT,
+    params TEXT,
+    metrics TEXT,
+    solve_seconds REAL,
+    scheduled INTEGER,
+    unscheduled INTEGER
+);
+CREATE TABLE IF NOT EXISTS assignments (
+    run_id TEXT NOT NULL REFERENCES runs(run_id),
+    applicant_id TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    individual_block_id TEXT,
+    individual_slot_id TEXT,
+    individual_start TEXT,
+    group_block_id TEXT,
+    group_id TEXT,
+    group_slot1_start TEXT
+);
+CREATE TABLE IF NOT EXISTS unscheduled (
+    run_id TEXT NOT NULL REFERENCES runs(run_id),
+    applicant_id TEXT NOT NULL,
+    reason TEXT
+);
+CREATE TABLE IF NOT EXISTS block_usage (
+    run_id TEXT NOT NULL REFERENCES runs(run_id),
+    block_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    block_type TEXT NOT NULL,
+    applicants INTEGER NOT NULL,
+    recruiters INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_input_hash ON runs(input_hash, solve_seconds);
+CREATE INDEX IF NOT EXISTS idx_runs_dir ON runs(run_dir);
+CREATE INDEX IF NOT EXISTS idx_assignments_applicant ON assignments(applicant_id, run_id);
+CREATE INDEX IF NOT EXISTS idx_assignments_run ON assignments(run_id);
+CREATE INDEX IF NOT EXISTS idx_unscheduled_applicant ON unscheduled(applicant_id, run_id);
+CREATE INDEX IF NOT EXISTS idx_block_usage_date ON block_usage(date, run_id);
+CREATE INDEX IF NOT EXISTS idx_block_usage_run ON block_usage(run_id);
+"""
+
+def connect(db_path) -> sqlite3.Connection:
+    """Open the history database, creating tables and indexes on first use."""
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+def file_hash(path) -> str:
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def input_hashes(input_dir, blocks_file: str = 'blocks.csv') -> Dict[str, str]:
+    """Per-file hashes of a run's inputs plus one combined hash over all of them."""
+    names = {'applicants': 'applicant_info.csv', 'recruiters': 'recruiters.csv',
+             'blocks': blocks_file, 'rooms': 'rooms.csv'}
+    hashes = {f'{key}_hash': file_hash(os.path.join(input_dir, name)) for key, name in names.items()}
+    combined = hashlib.sha256('|'.join(hashes[f'{key}_hash'] for key in names).encode())
+    hashes['input_hash'] = combined.hexdigest()
+    return hashes
+
+def _read_rows(path) -> List[Dict]:
+    """Rows of a CSV as dicts, or an empty list if the file does not exist."""
+    if not os.path.exists(path):
+        return []
+    with open(path, newline='') as f:
+        return list(csv.DictReader(f))
+
+def _run_created_at(run_dir: Path) -> str:
+    """Timestamp from a run_YYYYMMDD_HHMMSS directory name, falling back to now."""
+    try:
+        return dt.datetime.strptime(run_dir.name, 'run_%Y%m%d_%H%M%S').isoformat()
+    except ValueError:
+        return dt.datetime.now().isoformat(timespec='seconds')
+
+def _assignment_tuple(run_id: str, row: Dict, mode: str) -> tuple:
+    """assignments table row for one applicant schedule row."""
+    return (run_id, row['applicant_id'], mode, row.get('individual_block_id') or None, row.get('individual_slot_id') or None,
+            row.get('individual_start') or None, row.get('group_block_id') or None, row.get('group_id') or None,
+            row.get('group_slot1_start') or None)
+
+def new_run_id(run_dir: Path) -> str:
+    """Unique id of a recorded run: the directory name plus a random suffix.
+    
+    Run directories are named to the second, so the name alone repeats across
+    output directories and for back-to-back runs.
+    """
+    return f"{run_dir.name}_{uuid.uuid4().hex[:8]}"
+
+def record_run(db_path, run_dir, params: Dict = None, metrics: Dict = None, input_dir=None,
+               replace: bool = False) -> str:
+    """Record a run directory's inputs, parameters, metrics and assignments in one transaction.
+    
+    Input hashes come from <run_dir>/inputs/ when present, otherwise from input_dir.
+    Every call records a new run under its own id; with replace, earlier
+    records of the same (resolved) directory are deleted first.
+    """
+    run_dir = Path(run_dir)
+    run_id = new_run_id(run_dir)
+    schedules_dir = run_dir / 'schedules'
+    metrics = dict(metrics or {})
+    
+    hashes_dir = run_dir / 'inputs' if (run_dir / 'inputs').is_dir() else input_dir
+    hashes = input_hashes(hashes_dir) if hashes_dir else {}
+    
+    regular = _read_rows(schedules_dir / 'applicants_schedule.csv')
+    relaxed = _read_rows(schedules_dir / 'relaxed_schedule_applicants.csv')
+    unscheduled = _read_rows(schedules_dir / 'unscheduled_applicants.csv')
+    recruiters = _read_rows(schedules_dir / 'recruiters_schedule.csv')
+    blocks = _read_rows(Path(hashes_dir) / 'blocks.csv') if hashes_dir else []
+    
+    assignments = [_assignment_tuple(run_id, row, 'regular') for row in regular]
+    assignments += [_assignment_tuple(run_id, row, 'relaxed') for row in relaxed]
+    
+    # Applicants and recruiters per block, counting an applicant once per block
+    block_applicants = {}
+    for row in regular + relaxed:
+        for block_id in {row.get('individual_block_id'), row.get('group_block_id')} - {None, ''}:
+            block_applicants[block_id] = block_applicants.get(block_id, 0) + 1
+    block_recruiters = {}
+    for row in recruiters:
+        block_recruiters[row['block_id']] = block_recruiters.get(row['block_id'], 0) + 1
+    block_usage = [(run_id, block['block_id'], block['date'], block['block_type'],
+                    block_applicants.get(block['block_id'], 0), block_recruiters.get(block['block_id'], 0))
+                   for block in blocks]
+    
+    # Relaxed placements take applicants out of the unscheduled list
+    relaxed_ids = {row['applicant_id'] for row in relaxed}
+    still_unscheduled = [(run_id, row['applicant_id'], row.get('reason') or None)
+                         for row in unscheduled if row['applicant_id'] not in relaxed_ids]
+    metrics.setdefault('regular_scheduled', len(regular))
+    metrics.setdefault('relaxed_scheduled', len(relaxed))
+    
+    run_row = {
+        'run_id': run_id,
+        'run_dir': str(run_dir.resolve()),
+        'created_at': _run_created_at(run_dir),
+        'input_hash': hashes.get('input_hash'),
+        'applicants_hash': hashes.get('applicants_hash'),
+        'recruiters_hash': hashes.get('recruiters_hash'),
+        'blocks_hash': hashes.get('blocks_hash'),
+        'rooms_hash': hashes.get('rooms_hash'),
+        'params': json.dumps(params or {}, sort_keys=True),
+        'metrics': json.dumps(metrics, sort_keys=True),
+        'solve_seconds': metrics.get('solve_seconds'),
+        'scheduled': len(regular) + len(relaxed),
+        'unscheduled': len(still_unscheduled)
+    }
+    
+    conn = connect(db_path)
+    try:
+        with conn:  # one transaction for the whole run
+            if replace:
+                replaced = [row['run_id'] for row in conn.execute("SELECT run_id FROM runs WHERE run_dir = ?",
+                                                                  (run_row['run_dir'],))]
+                for table in ['assignments', 'unscheduled', 'block_usage', 'runs']:
+                    conn.executemany(f"DELETE FROM {table} WHERE run_id = ?", [(old_id,) for old_id in replaced])
+            conn.execute(f"INSERT INTO runs ({', '.join(run_row)}) VALUES ({', '.join('?' * len(run_row))})",
+                         list(run_row.values()))
+            conn.executemany("INSERT INTO assignments VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", assignments)
+            conn.executemany("INSERT INTO unscheduled VALUES (?, ?, ?)", still_unscheduled)
+            conn.executemany("INSERT INTO block_usage VALUES (?, ?, ?, ?, ?, ?)", block_usage)
+    finally:
+        conn.close()
+    return run_id
+
+def applicant_history(conn, applicant_id: str) -> List[sqlite3.Row]:
+    """Where an applicant was placed (or why not) in every recorded run."""
+    return conn.execute("""
+        SELECT r.run_id, r.created_at, a.mode, a.individual_slot_id, a.individual_start,
+               a.group_id, a.group_slot1_start, u.reason
+        FROM runs r
+        LEFT JOIN assignments a ON a.run_id = r.run_id AND a.applicant_id = ?
+        LEFT JOIN unscheduled u ON u.run_id = r.run_id AND u.applicant_id = ?
+        ORDER BY r.created_at
+    """, (applicant_id, applicant_id)).fetchall()
+
+def block_utilization_by_day(conn, run_ids: List[str] = None) -> List[sqlite3.Row]:
+    """Blocks used and applicants seated per day and block type, across runs."""
+    where = f"WHERE b.run_id IN ({', '.join('?' * len(run_ids))})" if run_ids else ""
+    return conn.execute(f"""
+        SELECT b.date, b.run_id, b.block_type,
+               COUNT(*) AS blocks,
+               SUM(b.applicants > 0) AS used_blocks,
+               SUM(b.applicants) AS applicants,
+               ROUND(100.0 * SUM(b.applicants > 0) / COUNT(*), 1) AS used_pct
+        FROM block_usage b
+        {where}
+        GROUP BY b.date, b.run_id, b.block_type
+        ORDER BY b.date, b.run_id, b.block_type
+    """, run_ids or []).fetchall()
+
+def fastest_runs(conn, input_hash: str, limit: int = 5) -> List[sqlite3.Row]:
+    """Runs on the given inputs ordered by solve time."""
+    return conn.execute("""
+        SELECT run_id, created_at, solve_seconds, scheduled, unscheduled, params
+        FROM runs
+        WHERE input_hash = ? AND solve_seconds IS NOT NULL
+        ORDER BY solve_seconds
+        LIMIT ?
+    """, (input_hash, limit)).fetchall()
+
+def print_rows(rows: List[sqlite3.Row]):
+    """Print query rows as an aligned table."""
+    if not rows:
+        print("No matching rows")
+        return
+    columns = rows[0].keys()
+    values = [['' if row[c] is None else str(row[c]) for c in columns] for row in rows]
+    widths = [max(len(c), *(len(v[i]) for v in values)) for i, c in enumerate(columns)]
+    print('  '.join(c.ljust(w) for c, w in zip(columns, widths)))
+    for v in values:
+        print('  '.join(x.ljust(w) for x, w in zip(v, widths)))
+
+def main():
+    parser = argparse.ArgumentParser(description='Record and query scheduling runs in a SQLite history store')
+    parser.add_argument('--db', default=os.path.join('results', 'run_history.sqlite'), help='History database path')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    record_parser = subparsers.add_parser('record', help='Record existing run directories (replacing earlier records of them)')
+    record_parser.add_argument('run_dirs', nargs='+', help='Run directories to record')
+    record_parser.add_argument('--input-dir', default=None, help='Inputs for runs without an inputs/ snapshot')
+    
+    applicant_parser = subparsers.add_parser('applicant', help='Where was an applicant in every run')
+    applicant_parser.add_argument('applicant_id')
+    
+    utilization_parser = subparsers.add_parser('utilization', help='Block utilization by day across runs')
+    utilization_parser.add_argument('--runs', default=None, help='Comma-separated run ids (default: all)')
+    
+    fastest_parser = subparsers.add_parser('fastest', help='Fastest solves for an input hash')
+    fastest_parser.add_argument('--input-hash', default=None, help='Input hash (default: hash of --input-dir)')
+    fastest_parser.add_argument('--input-dir', default='.', help='Input directory to hash')
+    fastest_parser.add_argument('--blocks-file', default='blocks.csv', help='Blocks CSV inside the input directory')
+    fastest_parser.add_argument('--limit', type=int, default=5)
+    
+    args = parser.parse_args()
+    
+    if args.command == 'record':
+        for run_dir in args.run_dirs:
+            start = time.time()
+            run_id = record_run(args.db, run_dir, input_dir=args.input_dir, replace=True)
+            print(f"Recorded {run_id} in {time.time() - start:.3f}s")
+        return
+    
+    conn = connect(args.db)
+    try:
+        if args.command == 'applicant':
+            print_rows(applicant_history(conn, args.applicant_id))
+        elif args.command == 'utilization':
+            print_rows(block_utilization_by_day(conn, args.runs.split(',') if args.runs else None))
+        elif args.command == 'fastest':
+            input_hash = args.input_hash or input_hashes(args.input_dir, args.blocks_file)['input_hash']
+            print(f"Input hash: {input_hash}")
+            print_rows(fastest_runs(conn, input_hash, args.limit))
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -1,198 +1,135 @@
-import pandas as pd
+import argparse
 import os
 from datetime import datetime
+from run_analysis import read_table, run_blocks_file, applicant_placements, block_summary, applicant_total, RUN_APPLICANTS_FILE
 
-def create_simple_block_breakdown():
-    """Create a simple breakdown showing who is in each block for both regular and relaxed scheduling."""
+def write_simple_block_breakdown(summary, placements, total_applicants,
+                                 output_prefix='schedule_comprehensive_breakdown'):
+    """Render the day-by-day text breakdown and the per-block CSV from aggregated tables."""
     
-    print("Loading scheduling data...")
-    
-    # Load the combined schedule
-    combined_schedule = pd.read_csv('schedule_final_combined.csv')
-    
-    # Load block information
-    blocks_df = pd.read_csv('blocks.csv')
-    
-    print(f"Loaded {len(combined_schedule)} applicant assignments")
-    print(f"Loaded {len(blocks_df)} blocks")
-    
-    # Create block breakdown
-    block_breakdown = {}
-    
-    # Initialize all blocks
-    for _, block_row in blocks_df.iterrows():
-        block_id = block_row['block_id']
-        block_type = block_row['block_type']
-        
-        block_breakdown[block_id] = {
-            'type': block_type,
-            'date': block_row['date'],
-            'start_time': f"{block_row['date']} {block_row['start']}:00",
-            'end_time': f"{block_row['date']} {block_row['end']}:00",
-            'regular_applicants': [],
-            'relaxed_applicants': []
-        }
-    
-    # Process applicant assignments
-    for _, app_row in combined_schedule.iterrows():
-        app_id = app_row['applicant_id']
-        app_name = app_row['applicant_name']
-        teams = app_row['teams']
-        scheduling_mode = app_row['scheduling_mode']
-        
-        applicant_info = {
-            'id': app_id,
-            'name': app_name,
-            'teams': teams,
-            'mode': scheduling_mode
-        }
-        
-        # Individual slot assignment
-        if pd.notna(app_row['individual_block_id']) and app_row['individual_block_id'] != '':
-            ind_block_id = app_row['individual_block_id']
-            
-            if ind_block_id in block_breakdown:
-                if scheduling_mode == 'regular':
-                    block_breakdown[ind_block_id]['regular_applicants'].append(applicant_info)
-                else:
-                    block_breakdown[ind_block_id]['relaxed_applicants'].append(applicant_info)
-        
-        # Group assignment
-        if pd.notna(app_row['group_block_id']) and app_row['group_block_id'] != '':
-            group_block_id = app_row['group_block_id']
-            
-            if group_block_id in block_breakdown:
-                # Only add if not already added from individual
-                found_in_regular = any(a['id'] == app_id for a in block_breakdown[group_block_id]['regular_applicants'])
-                found_in_relaxed = any(a['id'] == app_id for a in block_breakdown[group_block_id]['relaxed_applicants'])
-                
-                if not found_in_regular and not found_in_relaxed:
-                    if scheduling_mode == 'regular':
-                        block_breakdown[group_block_id]['regular_applicants'].append(applicant_info)
-                    else:
-                        block_breakdown[group_block_id]['relaxed_applicants'].append(applicant_info)
+    used = summary[summary['total_count'] > 0]
+    in_block = placements.drop_duplicates(['block_id', 'applicant_id'])
+    # Regular applicants first; the text report also sorts each mode by name
+    in_block = in_block.assign(relaxed=in_block['scheduling_mode'] != 'regular').sort_values('relaxed', kind='stable')
+    by_name = in_block.sort_values(['relaxed', 'applicant_name'], kind='stable')
+    members_by_block = {block_id: members for block_id, members in by_name.groupby('block_id', sort=False)}
     
     # Write breakdown to file
-    with open('schedule_comprehensive_breakdown.txt', 'w') as f:
+    with open(f'{output_prefix}.txt', 'w') as f:
         f.write("COMPREHENSIVE SCHEDULING BREAKDOWN - ALL TIME SLOTS\n")
         f.write("="*80 + "\n\n")
         f.write(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
         
         # Group blocks by day
-        days = {}
-        for block_id, block_info in block_breakdown.items():
-            date = block_info['date']
-            if date not in days:
-                days[date] = {}
-            days[date][block_id] = block_info
-        
-        for date in sorted(days.keys()):
+        for date in sorted(summary['date'].unique()):
             day_name = datetime.strptime(date, '%Y-%m-%d').strftime('%A, %B %d, %Y')
             f.write(f"📅 {day_name}\n")
             f.write("-" * 60 + "\n\n")
             
-            # Group by individual and group blocks
-            individual_blocks = {k: v for k, v in days[date].items() if v['type'] == 'individual'}
-            group_blocks = {k: v for k, v in days[date].items() if v['type'] == 'group'}
-            
-            if individual_blocks:
-                f.write("👤 INDIVIDUAL INTERVIEWS:\n")
-                for block_id in sorted(individual_blocks.keys()):
-                    block_info = individual_blocks[block_id]
-                    regular_count = len(block_info['regular_applicants'])
-                    relaxed_count = len(block_info['relaxed_applicants'])
-                    total_count = regular_count + relaxed_count
-                    
-                    if total_count > 0:
-                        time_str = f"{block_info['start_time'][11:16]} - {block_info['end_time'][11:16]}"
-                        f.write(f"  {block_id} ({time_str}): {total_count} applicants ({regular_count} regular ✅, {relaxed_count} relaxed ⚠️)\n")
-                        
-                        for app in sorted(block_info['regular_applicants'], key=lambda x: x['name']):
-                            f.write(f"    ✅ {app['name']} ({app['id']}) - {app['teams']}\n")
-                        for app in sorted(block_info['relaxed_applicants'], key=lambda x: x['name']):
-                            f.write(f"    ⚠️ {app['name']} ({app['id']}) - {app['teams']}\n")
-                f.write("\n")
-            
-            if group_blocks:
-                f.write("🔄 GROUP INTERVIEWS:\n")
-                for block_id in sorted(group_blocks.keys()):
-                    block_info = group_blocks[block_id]
-                    regular_count = len(block_info['regular_applicants'])
-                    relaxed_count = len(block_info['relaxed_applicants'])
-                    total_count = regular_count + relaxed_count
-                    
-                    if total_count > 0:
-                        time_str = f"{block_info['start_time'][11:16]} - {block_info['end_time'][11:16]}"
-                        f.write(f"  {block_id} ({time_str}): {total_count} applicants ({regular_count} regular ✅, {relaxed_count} relaxed ⚠️)\n")
+            day_blocks = summary[summary['date'] == date]
+            for block_type, heading in [('individual', "👤 INDIVIDUAL INTERVIEWS:"), ('group', "🔄 GROUP INTERVIEWS:")]:
+                type_blocks = day_blocks[day_blocks['block_type'] == block_type]
+                if type_blocks.empty:
+                    continue
+                
+                f.write(f"{heading}\n")
+                for block in type_blocks.sort_values('block_id').itertuples(index=False):
+                    if block.total_count > 0:
+                        f.write(f"  {block.block_id} ({block.start} - {block.end}): {block.total_count} applicants "
+                                f"({block.regular_count} regular ✅, {block.relaxed_count} relaxed ⚠️)\n")
                         
-                        for app in sorted(block_info['regular_applicants'], key=lambda x: x['name']):
-                            f.write(f"    ✅ {app['name']} ({app['id']}) - {app['teams']}\n")
-                        for app in sorted(block_info['relaxed_applicants'], key=lambda x: x['name']):
-                            f.write(f"    ⚠️ {app['name']} ({app['id']}) - {app['teams']}\n")
+                        for app in members_by_block[block.block_id].itertuples(index=False):
+                            symbol = "⚠️" if app.relaxed else "✅"
+                            f.write(f"    {symbol} {app.applicant_name} ({app.applicant_id}) - {app.teams}\n")
                 f.write("\n")
             
             f.write("="*80 + "\n\n")
         
         # Summary statistics
-        total_blocks_used = sum(1 for block in block_breakdown.values() 
-                               if len(block['regular_applicants']) + len(block['relaxed_applicants']) > 0)
-        total_regular = sum(len(block['regular_applicants']) for block in block_breakdown.values())
-        total_relaxed = sum(len(block['relaxed_applicants']) for block in block_breakdown.values())
+        total_regular = int(summary['regular_count'].sum())
+        total_relaxed = int(summary['relaxed_count'].sum())
+        scheduled = placements['applicant_id'].nunique()
         
         f.write("📊 SUMMARY STATISTICS\n")
         f.write("="*50 + "\n")
-        f.write(f"Total blocks available: {len(block_breakdown)}\n")
-        f.write(f"Blocks with assignments: {total_blocks_used}\n")
-        f.write(f"Blocks unused: {len(block_breakdown) - total_blocks_used}\n")
+        f.write(f"Total blocks available: {len(summary)}\n")
+        f.write(f"Blocks with assignments: {len(used)}\n")
+        f.write(f"Blocks unused: {len(summary) - len(used)}\n")
         f.write(f"Total regular assignments: {total_regular}\n")
         f.write(f"Total relaxed assignments: {total_relaxed}\n")
         f.write(f"Grand total assignments: {total_regular + total_relaxed}\n")
-        f.write(f"Success rate: {total_regular + total_relaxed}/154 (100%)\n")
+        f.write(f"Success rate: {scheduled}/{total_applicants} ({scheduled/total_applicants*100:.0f}%)\n")
         
         f.write(f"\n✅ = Regular scheduling (strict constraints)\n")
         f.write(f"⚠️ = Relaxed scheduling (with violations)\n")
     
-    # Create CSV summary
-    summary_rows = []
-    for block_id, block_info in block_breakdown.items():
-        regular_count = len(block_info['regular_applicants'])
-        relaxed_count = len(block_info['relaxed_applicants'])
-        total_count = regular_count + relaxed_count
-        
-        if total_count > 0:  # Only include blocks with assignments
-            summary_rows.append({
-                'block_id': block_id,
-                'block_type': block_info['type'],
-                'date': block_info['date'],
-                'start_time': block_info['start_time'],
-                'end_time': block_info['end_time'],
-                'regular_count': regular_count,
-                'relaxed_count': relaxed_count,
-                'total_count': total_count,
-                'applicants': '; '.join([f"{a['name']} ({a['mode']})" for a in 
-                                       block_info['regular_applicants'] + block_info['relaxed_applicants']])
-            })
-    
-    if summary_rows:
-        df = pd.DataFrame(summary_rows)
-        df.to_csv('schedule_comprehensive_breakdown.csv', index=False)
+    # Create CSV summary (only blocks with assignments)
+    labels = in_block['applicant_name'] + ' (' + in_block['scheduling_mode'] + ')'
+    applicants = labels.groupby(in_block['block_id'], sort=False).agg('; '.join).rename('applicants')
+    csv_summary = used[['block_id', 'block_type', 'date', 'start_time', 'end_time',
+                        'regular_count', 'relaxed_count', 'total_count']].merge(
+        applicants.reset_index(), on='block_id', how='left')
+    if not csv_summary.empty:
+        csv_summary.to_csv(f'{output_prefix}.csv', index=False)
     
     print(f"\nComprehensive breakdown files created:")
-    print(f"  📄 schedule_comprehensive_breakdown.txt - Detailed breakdown by day/time")
-    print(f"  📄 schedule_comprehensive_breakdown.csv - Summary data")
+    print(f"  📄 {output_prefix}.txt - Detailed breakdown by day/time")
+    print(f"  📄 {output_prefix}.csv - Summary data")
     
     # Print key stats
-    total_blocks_used = len(summary_rows)
-    total_individual_used = len([r for r in summary_rows if r['block_type'] == 'individual'])
-    total_group_used = len([r for r in summary_rows if r['block_type'] == 'group'])
+    dates = sorted(summary['date'].unique())
+    total_individual_used = int((used['block_type'] == 'individual').sum())
+    total_group_used = int((used['block_type'] == 'group').sum())
     
     print(f"\n📊 Key Statistics:")
-    print(f"  📅 Days covered: 5 (Sept 11-15, 2025)")
-    print(f"  🕐 Time slots: 9 AM - 9 PM across all days")
-    print(f"  📦 Blocks used: {total_blocks_used}/{len(block_breakdown)} ({total_blocks_used/len(block_breakdown)*100:.1f}%)")
+    if dates:
+        print(f"  📅 Days covered: {len(dates)} ({dates[0]} to {dates[-1]})")
+        print(f"  🕐 Time slots: {summary['start'].min()} - {summary['end'].max()} across all days")
+    print(f"  📦 Blocks used: {len(used)}/{len(summary)} ({len(used)/len(summary)*100:.1f}%)")
     print(f"  👤 Individual blocks used: {total_individual_used}")
     print(f"  🔄 Group blocks used: {total_group_used}")
-    print(f"  🎯 Perfect coverage: 154/154 applicants scheduled")
+    print(f"  🎯 Coverage: {scheduled}/{total_applicants} applicants scheduled")
+
+def create_simple_block_breakdown(run_path=None, total_applicants=None):
+    """Create a simple breakdown showing who is in each block for both regular and relaxed scheduling.
+    
+    With run_path, reads a pipeline run directory and writes into its summaries/;
+    otherwise uses the legacy files in the current directory. total_applicants
+    defaults to the applicants the run was scheduled for (see applicant_total).
+    """
+    
+    print("Loading scheduling data...")
+    
+    if run_path:
+        combined_schedule = read_table(os.path.join(run_path, 'schedules', 'final_combined.csv'))
+        blocks_df = read_table(run_blocks_file(run_path))
+        output_prefix = os.path.join(run_path, 'summaries', 'comprehensive_breakdown')
+        applicants_file = os.path.join(run_path, RUN_APPLICANTS_FILE)
+        still_unscheduled_file = os.path.join(run_path, 'schedules', 'relaxed_schedule_still_unscheduled.csv')
+    else:
+        combined_schedule = read_table('schedule_final_combined.csv')
+        blocks_df = read_table('blocks.csv')
+        output_prefix = 'schedule_comprehensive_breakdown'
+        applicants_file = 'applicant_info.csv'
+        still_unscheduled_file = 'relaxed_schedule_new_still_unscheduled.csv'
+    if total_applicants is None:
+        total_applicants = applicant_total(applicants_file, combined_schedule, still_unscheduled_file)
+    
+    print(f"Loaded {len(combined_schedule)} applicant assignments")
+    print(f"Loaded {len(blocks_df)} blocks")
+    
+    placements = applicant_placements(combined_schedule)
+    summary = block_summary(blocks_df, placements)
+    write_simple_block_breakdown(summary, placements, total_applicants, output_prefix)
+
+def main():
+    parser = argparse.ArgumentParser(description='Day-by-day breakdown of who is in each block')
+    parser.add_argument('--from-run', default=None, help='Pipeline run directory (default: legacy files in the current directory)')
+    parser.add_argument('--total-applicants', type=int, default=None,
+                        help='Applicant count used for the success rate (default: rows of the run\'s applicant_info.csv)')
+    
+    args = parser.parse_args()
+    create_simple_block_breakdown(args.from_run, args.total_applicants)
 
 if __name__ == "__main__":
-    create_simple_block_breakdown()
+    main()
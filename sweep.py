@@ -0,0 +1,111 @@
+import pandas as pd
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import time
+import datetime as dt
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict
+from autoscheduler import (
+    load_applicants, load_recruiters, load_blocks, load_rooms, run_round1, resolve_policy, DEFAULT_POLICY
+)
+
+# Parsed inputs, set once per worker process by _init_worker
+_INPUTS = None
+
+def expand_grid(grid: Dict[str, List]) -> List[Dict]:
+    """Every combination of the grid's values as a full policy."""
+    grid = {key: values if isinstance(values, list) else [values] for key, values in grid.items()}
+    resolve_policy({key: values[0] for key, values in grid.items()})  # reject unknown knobs up front
+    keys = list(grid)
+    return [resolve_policy(dict(zip(keys, combo))) for combo in itertools.product(*(grid[key] for key in keys))]
+
+def _init_worker(inputs: Dict):
+    """Keep the parent's parsed inputs for every configuration this worker runs."""
+    global _INPUTS
+    _INPUTS = inputs
+
+def run_policy(policy: Dict, solver_options: Dict = None) -> Dict:
+    """Round 1 under one policy, the same path production runs take, returning the comparison metrics."""
+    applicants = _INPUTS['applicants']
+    blocks = _INPUTS['blocks']
+    recruiters = _INPUTS['recruiters']
+    
+    start = time.time()
+    # Keep per-configuration solver chatter out of the sweep output
+    with contextlib.redirect_stdout(io.StringIO()):
+        assignments, _, _, bound = run_round1(applicants, recruiters, blocks, policy, solver_options=solver_options)
+    solve_seconds = time.time() - start
+    
+    complete = [a for a in assignments.values() if a.get('individual_slot_id') and a.get('group_id')]
+    slots_used = {a['individual_slot_id'] for a in assignments.values() if a.get('individual_slot_id')}
+    return {
+        **policy,
+        'scheduled': len(assignments),
+        'complete': len(complete),
+        'slots_used': len(slots_used),
+        'capacity_bound': bound['bound'],
+        'solve_seconds': round(solve_seconds, 3)
+    }
+
+def run_sweep(inputs: Dict, policies: List[Dict], workers: int = None, solver_options: Dict = None) -> pd.DataFrame:
+    """Run every policy in a process pool that shares one parsed copy of the inputs."""
+    workers = workers or min(len(policies), os.cpu_count() or 1)
+    # Split the cores between concurrent solves instead of oversubscribing them
+    solver_options = {'num_workers': max(1, (os.cpu_count() or 1) // workers), **(solver_options or {})}
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(inputs,)) as pool:
+        futures = [pool.submit(run_policy, policy, solver_options) for policy in policies]
+        rows = []
+        for i, future in enumerate(futures, 1):
+            rows.append(future.result())
+            print(f"  [{i}/{len(policies)}] {json.dumps(policies[i - 1])}: "
+                  f"{rows[-1]['complete']} complete in {rows[-1]['solve_seconds']:.2f}s")
+    return pd.DataFrame(rows)
+
+def load_grid(grid_arg: str) -> Dict:
+    """Parse --grid as inline JSON or a path to a JSON file."""
+    if os.path.exists(grid_arg):
+        with open(grid_arg) as f:
+            return json.load(f)
+    return json.loads(grid_arg)
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare Round 1 scheduling policies over a parameter grid')
+    parser.add_argument('--input-dir', default='.', help='Input directory containing CSV files')
+    parser.add_argument('--blocks-file', default='blocks.csv', help='Blocks CSV inside the input directory')
+    parser.add_argument('--grid', required=True,
+                        help=f'JSON object (or file) mapping policy keys to lists of values; keys: {", ".join(DEFAULT_POLICY)}')
+    parser.add_argument('--workers', type=int, default=None, help='Parallel configurations (default: one per core)')
+    parser.add_argument('--output', default=None, help='Comparison CSV (default: results/sweep_TIMESTAMP.csv)')
+    
+    args = parser.parse_args()
+    
+    grid = load_grid(args.grid)
+    policies = expand_grid(grid)
+    
+    print("Loading input files...")
+    inputs = {
+        'applicants': load_applicants(os.path.join(args.input_dir, 'applicant_info.csv')),
+        'recruiters': load_recruiters(os.path.join(args.input_dir, 'recruiters.csv'))
+    }
+    rooms = load_rooms(os.path.join(args.input_dir, 'rooms.csv'))
+    inputs['blocks'] = load_blocks(os.path.join(args.input_dir, args.blocks_file), rooms, inputs['recruiters'])
+    
+    print(f"Sweeping {len(policies)} policies...")
+    start = time.time()
+    results = run_sweep(inputs, policies, args.workers)
+    
+    output = args.output or os.path.join('results', f"sweep_{dt.datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    results.to_csv(output, index=False)
+    
+    print(f"\nSweep finished in {time.time() - start:.2f}s")
+    print(results[list(grid) + ['scheduled', 'complete', 'slots_used', 'solve_seconds']].to_string(index=False))
+    print(f"Comparison table written to: {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+import argparse
+import datetime as dt
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Dict
+from autoscheduler import (
+    load_applicants, load_recruiters, load_blocks, load_rooms, load_applicant_assignments, parse_policy,
+    resolve_policy, run_strict_rounds, round1_objective, individual_fields, group_fields,
+    schedule_recruiters_to_match, staff_applicants, applicant_schedule_rows, write_output_files
+)
+from feasibility import (
+    build_block_index, applicant_feasibility, screening_reason, windows_overlap, group_windows, subtract_window
+)
+from neighborhood import placement_usage, merge_neighborhood, solve_neighborhood
+
+REASON_WITHDRAWN = 'withdrawn'
+
+class ScheduleState:
+    """Inputs, feasibility indexes and the current schedule, kept in memory between queries.
+    
+    Every query runs under one lock, so edits apply in the order they arrive.
+    """
+    
+    def __init__(self, applicants: List[Dict], recruiters: List[Dict], blocks: List[Dict], rooms: List[Dict],
+                 applicant_assignments: Dict, policy: Dict = None):
+        self.applicants = applicants
+        self.recruiters = recruiters
+        self.blocks = blocks
+        self.rooms = rooms
+        self.policy = resolve_policy(policy)
+        self.applicant_assignments = dict(applicant_assignments)
+        self.withdrawn = set()
+        self.lock = threading.Lock()
+        
+        self.applicants_by_id = {applicant['id']: applicant for applicant in applicants}
+        self.recruiters_by_id = {recruiter['id']: recruiter for recruiter in recruiters}
+        self.slots = {slot['slot_id']: (block, slot) for block in blocks if block['type'] == 'individual' for slot in block['slots']}
+        self.groups = {group['group_id']: (block, group) for block in blocks if block['type'] == 'group' for group in block['groups']}
+        self.refresh_feasibility()
+    
+    def refresh_feasibility(self):
+        """Rebuild the block index and per-applicant feasibility after recruiter availability changes."""
+        self.block_index = build_block_index(self.blocks, self.recruiters)
+        self.feasibility = {applicant['id']: applicant_feasibility(applicant, self.block_index)
+                            for applicant in self.applicants}
+    
+    def uncovered(self) -> List[str]:
+        """Scheduled applicants placed in a slot or group outside the pairs Round 1 could give them.
+        
+        Round 1 only looks at availability (pair_slots/pair_groups), so a fresh
+        schedule has none; forced moves are how placements end up here.
+        """
+        uncovered = []
+        for app_id, assignment in self.applicant_assignments.items():
+            feasibility = self.feasibility[app_id]
+            if assignment.get('individual_slot_id') and \
+                    (assignment['individual_block_id'], assignment['individual_slot_id']) not in feasibility['pair_slots']:
+                uncovered.append(app_id)
+            elif assignment.get('group_id') and \
+                    (assignment['group_block_id'], assignment['group_id']) not in feasibility['pair_groups']:
+                uncovered.append(app_id)
+        return uncovered
+    
+    def unstaffed(self, applicant_assignments: Dict = None) -> List[str]:
+        """Scheduled applicants Round 2 leaves without a recruiter of their teams."""
+        assignments = self.applicant_assignments if applicant_assignments is None else applicant_assignments
+        _, unstaffed = staff_applicants(self.recruiters, assignments, self.blocks)
+        return [applicant['id'] for applicant in self.applicants if applicant['id'] in unstaffed]
+    
+    def summary(self) -> Dict:
+        """Headline numbers of the current schedule."""
+        complete = sum(1 for a in self.applicant_assignments.values() if a.get('individual_slot_id') and a.get('group_id'))
+        return {
+            'applicants': len(self.applicants),
+            'scheduled': len(self.applicant_assignments),
+            'complete': complete,
+            'unscheduled': len(self.applicants) - len(self.applicant_assignments) - len(self.withdrawn),
+            'withdrawn': len(self.withdrawn),
+            'uncovered': len(self.uncovered()),
+            'unstaffed': len(self.unstaffed()),
+            'objective': round1_objective(self.applicant_assignments, self.policy)
+        }
+    
+    def proposed_assignment(self, app_id: str, slot_id: str = None, group_id: str = None) -> Dict:
+        """Assignment the applicant would have after a move; a unit that is not given stays as it is."""
+        applicant = self.applicants_by_id[app_id]
+        current = self.applicant_assignments.get(app_id, {})
+        slot_id = slot_id or current.get('individual_slot_id')
+        group_id = group_id or current.get('group_id')
+        
+        assignment_data = {'applicant': applicant}
+        if slot_id in self.slots:
+            assignment_data.update(individual_fields(*self.slots[slot_id]))
+        if group_id in self.groups:
+            assignment_data.update(group_fields(*self.groups[group_id]))
+        return assignment_data
+    
+    def check_move(self, app_id: str, slot_id: str = None, group_id: str = None) -> Dict:
+        """Whether moving an applicant to a slot and/or group keeps every Round 1 constraint.
+        
+        Only the applicant's own feasibility and the current usage of the two
+        units are looked at, so no solver is involved. Staffing is re-checked
+        through Round 2: applicants the move would leave without a recruiter of
+        their teams are listed under 'unstaffed' but do not make it fail.
+        """
+        if app_id not in self.applicants_by_id:
+            raise KeyError(f"Unknown applicant: {app_id}")
+        problems = []
+        for unit_id, units, kind in [(slot_id, self.slots, 'slot'), (group_id, self.groups, 'group')]:
+            if unit_id and unit_id not in units:
+                problems.append({'code': f'unknown_{kind}', 'detail': unit_id})
+        if problems:
+            return {'applicant_id': app_id, 'ok': False, 'problems': problems}
+        
+        proposed = self.proposed_assignment(app_id, slot_id, group_id)
+        feasibility = self.feasibility[app_id]
+        slot_usage, group_usage = placement_usage(self.applicant_assignments, {app_id})
+        
+        if app_id in self.withdrawn:
+            problems.append({'code': REASON_WITHDRAWN, 'detail': app_id})
+        if not proposed.get('individual_slot_id') or not proposed.get('group_id'):
+            problems.append({'code': 'incomplete', 'detail': 'needs both an individual slot and a group'})
+        
+        if proposed.get('individual_slot_id'):
+            key = (proposed['individual_block_id'], proposed['individual_slot_id'])
+            if key not in feasibility['slots']:
+                problems.append({'code': 'applicant_unavailable', 'detail': key[1]})
+            if slot_usage.get(key, 0) >= 1:
+                problems.append({'code': 'slot_taken', 'detail': key[1]})
+        
+        if proposed.get('group_id'):
+            key = (proposed['group_block_id'], proposed['group_id'])
+            if key not in feasibility['groups']:
+                problems.append({'code': 'applicant_unavailable', 'detail': key[1]})
+            if group_usage.get(key, 0) >= self.policy['group_capacity']:
+                problems.append({'code': 'group_full', 'detail': key[1]})
+        
+        if proposed.get('individual_slot_id') and proposed.get('group_id'):
+            slot_block, slot = self.slots[proposed['individual_slot_id']]
+            group_block, group = self.groups[proposed['group_id']]
+            if slot_block['date'] != group_block['date']:
+                problems.append({'code': 'different_days', 'detail': f"{slot_block['date']} / {group_block['date']}"})
+            elif any(windows_overlap((slot['start'], slot['end']), win) for win in group_windows(group)):
+                problems.append({'code': 'overlap', 'detail': f"{slot['slot_id']} / {group['group_id']}"})
+        
+        after = dict(self.applicant_assignments)
+        after[app_id] = proposed
+        unstaffed_before = set(self.unstaffed())
+        return {
+            'applicant_id': app_id,
+            'slot_id': proposed.get('individual_slot_id'),
+            'group_id': proposed.get('group_id'),
+            'ok': not problems,
+            'problems': problems,
+            'unstaffed': [other_id for other_id in self.unstaffed(after) if other_id not in unstaffed_before],
+            'objective_delta': round1_objective(after, self.policy) - round1_objective(self.applicant_assignments, self.policy)
+        }
+    
+    def apply_change(self, change: Dict) -> Dict:
+        """Apply one edit to the in-memory schedule.
+        
+        Supported changes: 'move' (applicant_id, slot_id, group_id; rejected if
+        check_move finds problems unless force is set), 'unschedule' and
+        'withdraw' (applicant_id), and 'recruiter_unavailable' (recruiter_id,
+        start, end as ISO datetimes), which reports the applicants Round 2 can
+        no longer staff with a recruiter of their teams.
+        """
+        kind = change.get('change')
+        if kind == 'move':
+            check = self.check_move(change['applicant_id'], change.get('slot_id'), change.get('group_id'))
+            if check['ok'] or change.get('force'):
+                self.applicant_assignments[change['applicant_id']] = self.proposed_assignment(
+                    change['applicant_id'], change.get('slot_id'), change.get('group_id'))
+            return {'applied': check['ok'] or bool(change.get('force')), **check}
+        
+        if kind in ('unschedule', 'withdraw'):
+            if change['applicant_id'] not in self.applicants_by_id:
+                raise KeyError(f"Unknown applicant: {change['applicant_id']}")
+            freed = self.applicant_assignments.pop(change['applicant_id'], None)
+            if kind == 'withdraw':
+                self.withdrawn.add(change['applicant_id'])
+            return {'applied': True, 'applicant_id': change['applicant_id'], 'was_scheduled': freed is not None}
+        
+        if kind == 'recruiter_unavailable':
+            recruiter = self.recruiters_by_id.get(change['recruiter_id'])
+            if recruiter is None:
+                raise KeyError(f"Unknown recruiter: {change['recruiter_id']}")
+            window = (dt.datetime.fromisoformat(change['start']), dt.datetime.fromisoformat(change['end']))
+            before = set(self.unstaffed())
+            recruiter['parsed_availability'] = subtract_window(recruiter['parsed_availability'], window)
+            self.refresh_feasibility()
+            newly_unstaffed = [app_id for app_id in self.unstaffed() if app_id not in before]
+            return {'applied': True, 'recruiter_id': recruiter['id'], 'unstaffed': newly_unstaffed}
+        
+        raise ValueError(f"Unknown change: {kind!r}")
+    
+    def neighborhood(self, query: Dict) -> List[Dict]:
+        """Applicants selected by a reoptimize query.
+        
+        applicant_ids names them directly; date and team add the applicants
+        placed on that day or interested in that team, together with the
+        unscheduled ones who could be. uncovered adds every placement outside
+        the pairs Round 1 could give (see uncovered). Withdrawn and hopeless applicants
+        are never included.
+        """
+        selected = set(query.get('applicant_ids', []))
+        if query.get('uncovered'):
+            selected.update(self.uncovered())
+        date, team = query.get('date'), query.get('team')
+        for applicant in self.applicants:
+            app_id = applicant['id']
+            if date:
+                assignment = self.applicant_assignments.get(app_id)
+                if assignment is not None:
+                    placed_on = assignment.get('individual_start') or assignment.get('group_slot1_start')
+                    if placed_on and placed_on.date().isoformat() == date:
+                        selected.add(app_id)
+                elif date in self.feasibility[app_id]['dates']:
+                    selected.add(app_id)
+            if team and team in applicant['teams']:
+                selected.add(app_id)
+        
+        return [applicant for applicant in self.applicants
+                if applicant['id'] in selected and applicant['id'] not in self.withdrawn
+                and not screening_reason(applicant, self.feasibility[applicant['id']])]
+    
+    def reoptimize(self, query: Dict) -> Dict:
+        """Re-solve a neighborhood around the rest of the schedule, keeping the result if it is no worse."""
+        start = time.time()
+        applicants = self.neighborhood(query)
+        free_ids = {applicant['id'] for applicant in applicants}
+        objective_before = round1_objective(self.applicant_assignments, self.policy)
+        
+        placements = solve_neighborhood(applicants, self.blocks, self.feasibility, self.applicant_assignments,
+                                        self.policy, keep_weight=query.get('keep_weight', 1),
+                                        time_limit=query.get('time_limit', 5.0))
+        result = {'freed': len(applicants), 'objective_before': objective_before}
+        if placements is None:
+            return {**result, 'applied': False, 'objective_after': objective_before, 'moved': [],
+                    'seconds': round(time.time() - start, 3)}
+        
+        candidate = merge_neighborhood(self.applicant_assignments, free_ids, placements)
+        objective_after = round1_objective(candidate, self.policy)
+        moved = [app_id for app_id in free_ids
+                 if self._placement(self.applicant_assignments.get(app_id)) != self._placement(placements.get(app_id))]
+        applied = objective_after >= objective_before
+        if applied:
+            self.applicant_assignments = candidate
+        return {**result, 'applied': applied, 'objective_after': objective_after, 'moved': sorted(moved),
+                'seconds': round(time.time() - start, 3)}
+    
+    @staticmethod
+    def _placement(assignment: Dict):
+        """Slot and group an assignment holds, for comparing schedules."""
+        assignment = assignment or {}
+        return assignment.get('individual_slot_id'), assignment.get('group_id')
+    
+    def schedule_rows(self) -> List[Dict]:
+        """Current schedule in applicants_schedule.csv form."""
+        return list(applicant_schedule_rows(self.applicant_assignments, self.applicants))
+    
+    def save(self, output_dir: str = 'results') -> str:
+        """Staff the current schedule with Round 2 and write it as a regular run directory."""
+        recruiter_assignments = schedule_recruiters_to_match(self.recruiters, self.applicant_assignments, self.blocks, self.rooms)
+        used_blocks = set(recruiter_assignments)
+        blocks = [block for block in self.blocks if block['block_id'] in used_blocks]
+        unscheduled = [applicant['id'] for applicant in self.applicants if applicant['id'] not in self.applicant_assignments]
+        reasons = {app_id: REASON_WITHDRAWN for app_id in self.withdrawn}
+        return write_output_files(recruiter_assignments, self.applicant_assignments, unscheduled, self.applicants,
+                                  self.recruiters, blocks, output_dir, unscheduled_reasons=reasons)
+
+class WhatIfHandler(BaseHTTPRequestHandler):
+    """JSON endpoints over a shared ScheduleState.
+    
+    GET  /summary, /schedule
+    POST /check_move, /apply, /reoptimize, /save
+    """
+    state: ScheduleState = None
+    
+    def do_GET(self):
+        routes = {
+            '/summary': lambda: self.state.summary(),
+            '/schedule': lambda: self.state.schedule_rows()
+        }
+        self._dispatch(routes, None)
+    
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except json.JSONDecodeError as e:
+            self._send_json(400, {'error': f"Invalid JSON: {e}"})
+            return
+        routes = {
+            '/check_move': lambda: self.state.check_move(body.get('applicant_id'), body.get('slot_id'), body.get('group_id')),
+            '/apply': lambda: self.state.apply_change(body),
+            '/reoptimize': lambda: self.state.reoptimize(body),
+            '/save': lambda: {'run_dir': self.state.save(body.get('output_dir', 'results'))}
+        }
+        self._dispatch(routes, body)
+    
+    def _dispatch(self, routes: Dict, body: Dict):
+        route = routes.get(self.path.split('?')[0])
+        if route is None:
+            self._send_json(404, {'error': f"Unknown endpoint: {self.path}"})
+            return
+        try:
+            with self.state.lock:
+                payload = route()
+        except (KeyError, ValueError) as e:
+            self._send_json(400, {'error': str(e).strip("'\"")})
+            return
+        self._send_json(200, payload)
+    
+    def _send_json(self, status: int, payload):
+        data = json.dumps(payload, default=str).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def log_message(self, format, *args):
+        print(f"{self.command} {self.path} -> {args[1] if len(args) > 1 else ''}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve what-if queries against a schedule kept in memory')
+    parser.add_argument('--input-dir', default='.', help='Input directory containing CSV files')
+    parser.add_argument('--from-run', default=None, help='Start from the schedule of an existing run (default: solve one)')
+    parser.add_argument('--policy', default=None, help='Round 1 policy overrides as JSON or a JSON file (see DEFAULT_POLICY)')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on')
+    parser.add_argument('--port', type=int, default=8765, help='Port to listen on')
+    
+    args = parser.parse_args()
+    policy = parse_policy(args.policy)
+    
+    print("Loading input files...")
+    applicants = load_applicants(os.path.join(args.input_dir, 'applicant_info.csv'))
+    recruiters = load_recruiters(os.path.join(args.input_dir, 'recruiters.csv'))
+    rooms = load_rooms(os.path.join(args.input_dir, 'rooms.csv'))
+    blocks = load_blocks(os.path.join(args.input_dir, 'blocks.csv'), rooms, recruiters)
+    
+    if args.from_run:
+        applicant_assignments = load_applicant_assignments(
+            os.path.join(args.from_run, 'schedules', 'applicants_schedule.csv'), applicants, blocks)
+        print(f"Loaded {len(applicant_assignments)} assignments from {args.from_run}")
+    else:
+        applicant_assignments = run_strict_rounds(applicants, recruiters, blocks, rooms, policy)[0]
+    
+    start = time.time()
+    WhatIfHandler.state = ScheduleState(applicants, recruiters, blocks, rooms, applicant_assignments, policy)
+    print(f"Feasibility indexes built in {time.time() - start:.3f}s")
+    print(f"Current schedule: {json.dumps(WhatIfHandler.state.summary())}")
+    
+    server = ThreadingHTTPServer((args.host, args.port), WhatIfHandler)
+    print(f"Serving what-if queries on http://{args.host}:{args.port} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping server")
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()